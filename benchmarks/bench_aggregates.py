@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+This script measures the statistics of the Places of one City and the
+number of Reviews of one Place read from the aggregates of FileStorage,
+against computing them from every instance, and the cost of keeping the
+aggregates up to date while Places change.
+
+Usage: ./benchmarks/bench_aggregates.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.storage_engine import StorageEngine
+from models.place import Place
+from models.review import Review
+
+
+def load(count):
+    """
+    Fills the storage with count Places in 1000 Cities and count Reviews
+    of them
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    dates = {"created_at": "2024-01-01T00:00:00",
+             "updated_at": "2024-01-01T00:00:00"}
+    for i in range(count):
+        storage.new(Place(id=str(i), city_id=str(rand.randrange(1000)),
+                          price_by_night=rand.randrange(20, 500), **dates))
+        storage.new(Review(id=str(i), place_id=str(rand.randrange(count)),
+                           **dates))
+    return storage
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    storage = load(count)
+    start = perf_counter()
+    storage.aggregate(Place, "city_id", "price_by_night")
+    storage.aggregate(Review, "place_id")
+    print("first read: {:.2f} s".format(perf_counter() - start))
+    print("{:<30}{:>10}{:>12}".format("query", "scan ms", "kept ms"))
+    for name, args in (("price stats of one city",
+                        (Place, "city_id", "7", "price_by_night")),
+                       ("reviews of one place", (Review, "place_id", "7"))):
+        print("{:<30}{:>10.1f}{:>12.4f}".format(
+            name, timed(lambda: StorageEngine.group_stats(storage, *args),
+                        repeats) * 1000,
+            timed(lambda: storage.group_stats(*args), repeats * 100) * 1000))
+    places = list(storage.all(Place).values())
+    rand = random.Random(1)
+
+    def change():
+        """
+        Changes the price of a Place and reads its City's statistics
+        """
+        pl = rand.choice(places)
+        pl.price_by_night = rand.randrange(20, 500)
+        storage.group_stats(Place, "city_id", pl.city_id, "price_by_night")
+    print("{:<30}{:>10}{:>12.4f}".format(
+        "change a price, read stats", "",
+        timed(change, repeats * 100) * 1000))
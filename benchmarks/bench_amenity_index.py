@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+This script measures the search of the Places having a combination of
+amenities answered by the bitmap index of FileStorage, against testing
+the amenity_ids of every Place.
+
+Usage: ./benchmarks/bench_amenity_index.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.query import holds
+from models.engine.query import parse_members
+from models.place import Place
+
+
+def load(count):
+    """
+    Fills the storage with count Places holding each of 20 amenities
+    with a probability going from 5% to 81%
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    amenities = ["amenity{}".format(i) for i in range(20)]
+    for i in range(count):
+        storage.new(Place(id=str(i), created_at="2024-01-01T00:00:00",
+                          updated_at="2024-01-01T00:00:00",
+                          amenity_ids=[amenity for j, amenity
+                                       in enumerate(amenities)
+                                       if rand.random() < 0.05 + j * 0.04]))
+    return storage
+
+
+def scan(storage, tree):
+    """
+    Returns the Places whose amenity_ids fulfill tree
+    """
+    return [pl for pl in storage.iterate(Place)
+            if holds(tree, pl.amenity_ids)]
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    storage = load(count)
+    start = perf_counter()
+    storage.having(Place, "amenity_ids", "amenity0")
+    print("build: {:.2f} s".format(perf_counter() - start))
+    print("{:<34}{:>10}{:>10}{:>10}".format("query", "scan ms", "index ms",
+                                            "results"))
+    for text in ("amenity0 and amenity1 and amenity2",
+                 "amenity15 and amenity19 and not amenity0",
+                 "(amenity3 or amenity4) and not amenity10",
+                 "amenity19"):
+        tree = parse_members(text)
+        results = len(storage.having(Place, "amenity_ids", tree))
+        print("{:<34}{:>10.1f}{:>10.2f}{:>10}".format(
+            text[:33], timed(lambda: scan(storage, tree), repeats) * 1000,
+            timed(lambda: storage.having(Place, "amenity_ids", tree),
+                  repeats) * 1000, results))
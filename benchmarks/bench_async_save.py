@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+This script measures how long a save blocks the caller, with the JSON
+file written synchronously and in the background, and how long it takes
+until every save is written.
+
+Usage: ./benchmarks/bench_async_save.py [number_of_objects] [saves]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def run(background, count, saves):
+    """
+    Returns the average number of seconds a save that changes one object
+    blocks in a storage of count objects, and the total number of
+    seconds until all of them are written
+    """
+    storage = FileStorage()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__async = background
+        FileStorage._FileStorage__objects = {}
+        states = [State() for i in range(count)]
+        storage.save()
+        storage.flush()
+        blocked = 0
+        start = perf_counter()
+        for i in range(saves):
+            states[i % count].name = str(i)
+            begin = perf_counter()
+            storage.save()
+            blocked += perf_counter() - begin
+        storage.flush()
+        return blocked / saves, perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for background in (False, True):
+        blocked, total = run(background, count, saves)
+        print("{:<12} {:8.3f} ms/save blocked, {:8.1f} ms total".format(
+            "background" if background else "synchronous",
+            blocked * 1000, total * 1000))
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+This script measures filters and aggregates over every Place run on the
+columnar table of FileStorage, against running them on the instances
+one at a time. The table uses numpy when it is installed, and stdlib
+arrays otherwise.
+
+Usage: ./benchmarks/bench_columns.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine import columns
+from models.engine.aggregates import Aggregate
+from models.engine.file_storage import FileStorage
+from models.engine.query import matches
+from models.place import Place
+
+CONDITIONS = [("price_by_night", "<", 150), ("max_guest", ">=", 4),
+              ("latitude", ">", 0)]
+
+
+def load(count):
+    """
+    Fills the storage with count Places in 1000 Cities
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    dates = {"created_at": "2024-01-01T00:00:00",
+             "updated_at": "2024-01-01T00:00:00"}
+    for i in range(count):
+        storage.new(Place(id=str(i), city_id=str(rand.randrange(1000)),
+                          price_by_night=rand.randrange(20, 500),
+                          max_guest=rand.randrange(1, 10),
+                          latitude=rand.uniform(-60, 60),
+                          longitude=rand.uniform(-180, 180), **dates))
+    return storage
+
+
+def scan_stats(places):
+    """
+    Returns the price statistics of the Places matching CONDITIONS,
+    looking at them one at a time
+    """
+    prices = [pl.price_by_night for pl in places
+              if matches(pl, CONDITIONS)]
+    return len(prices), min(prices), max(prices), sum(prices) / len(prices)
+
+
+def scan_groups(places):
+    """
+    Returns the price statistics per City of the Places matching
+    CONDITIONS, looking at them one at a time
+    """
+    aggregate = Aggregate("city_id", "price_by_night")
+    for pl in places:
+        if matches(pl, CONDITIONS):
+            aggregate.add(pl.id, pl)
+    return aggregate.groups()
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    storage = load(count)
+    places = list(storage.all(Place).values())
+    print("numpy: {}".format("yes" if columns.numpy else "no"))
+    start = perf_counter()
+    table = storage.columns(Place)
+    print("build the table: {:.2f} s".format(perf_counter() - start))
+    print("{:<30}{:>12}{:>12}".format("query", "objects ms", "columns ms"))
+    for name, scan, run in (
+            ("filter", lambda: [pl for pl in places
+                                if matches(pl, CONDITIONS)],
+             lambda: table.select(CONDITIONS)),
+            ("price stats", lambda: scan_stats(places),
+             lambda: table.stats("price_by_night", CONDITIONS)),
+            ("price stats per city", lambda: scan_groups(places),
+             lambda: table.groups("city_id", "price_by_night",
+                                  CONDITIONS))):
+        print("{:<30}{:>12.1f}{:>12.1f}".format(
+            name, timed(scan, repeats) * 1000, timed(run, repeats) * 1000))
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+This script compares the ways created_at and updated_at can be written
+to and read from the JSON file.
+
+Usage: ./benchmarks/bench_datetime.py [number_of_dates]
+"""
+import os
+import sys
+from datetime import datetime
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.base_model import epoch_micros
+from models.base_model import parse_datetime
+
+
+def rate(function, values):
+    """
+    Returns how many values function handles per second
+    """
+    start = perf_counter()
+    for value in values:
+        function(value)
+    return len(values) / (perf_counter() - start)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    dates = [datetime.now() for i in range(count)]
+    isos = [date.isoformat() for date in dates]
+    micros = [epoch_micros(date) for date in dates]
+    results = (
+        ("write isoformat", rate(datetime.isoformat, dates)),
+        ("write epoch", rate(epoch_micros, dates)),
+        ("read strptime", rate(lambda value: datetime.strptime(
+            value, "%Y-%m-%dT%H:%M:%S.%f"), isos)),
+        ("read iso", rate(parse_datetime, isos)),
+        ("read epoch", rate(parse_datetime, micros)),
+    )
+    for label, per_second in results:
+        print("{:<16}{:>12.0f} dates/s".format(label, per_second))
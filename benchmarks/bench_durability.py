@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+This script measures the cost of each durability level of FileStorage,
+for full saves of the JSON file and for journal appends.
+
+Usage: ./benchmarks/bench_durability.py [number_of_objects] [saves]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+
+def run(durability, journal, count, saves):
+    """
+    Returns the average number of seconds a save that changes one object
+    takes in a storage of count objects
+    """
+    storage = FileStorage()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__journal_path = os.path.join(tmp, "journal")
+        FileStorage._FileStorage__durability = durability
+        FileStorage._FileStorage__journal = journal
+        FileStorage._FileStorage__compact_after = saves + 1
+        FileStorage._FileStorage__objects = {}
+        states = [State() for i in range(count)]
+        storage.save()
+        start = perf_counter()
+        for i in range(saves):
+            states[i % count].name = str(i)
+            storage.save()
+        return (perf_counter() - start) / saves
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    for journal in (False, True):
+        for durability in ("none", "file", "dir"):
+            seconds = run(durability, journal, count, saves)
+            print("{:<10}{:<6}{:>10.3f} ms/save".format(
+                "journal" if journal else "snapshot", durability,
+                seconds * 1000))
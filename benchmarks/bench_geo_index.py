@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+This script measures the search of the Places near a point answered by
+the grid index of FileStorage, against computing the distance to every
+Place.
+
+Usage: ./benchmarks/bench_geo_index.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine import geo
+from models.engine.geo import within
+from models.place import Place
+
+
+def load(count):
+    """
+    Fills the storage with count Places, half of them around 20 cities
+    and half anywhere
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    cities = [(rand.uniform(-60, 60), rand.uniform(-180, 180))
+              for i in range(20)]
+    for i in range(count):
+        if i % 2:
+            lat, lon = rand.choice(cities)
+            lat, lon = lat + rand.gauss(0, 0.2), lon + rand.gauss(0, 0.2)
+        else:
+            lat, lon = rand.uniform(-90, 90), rand.uniform(-180, 180)
+        storage.new(Place(id=str(i), created_at="2024-01-01T00:00:00",
+                          updated_at="2024-01-01T00:00:00",
+                          latitude=lat, longitude=lon))
+    return storage, cities
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    storage, cities = load(count)
+    points = [(pl, pl.latitude, pl.longitude)
+              for pl in storage.all(Place).values()]
+    storage.near(Place, 0, 0, 1)
+    print("numpy: {}".format("yes" if geo.numpy is not None else "no"))
+    print("{:<22}{:>10}{:>10}{:>10}".format("query", "scan ms", "grid ms",
+                                            "results"))
+    lat, lon = cities[0]
+    for name, radius in (("city, 2 km", 2), ("city, 25 km", 25),
+                         ("city, 250 km", 250)):
+        results = len(storage.near(Place, lat, lon, radius))
+        print("{:<22}{:>10.1f}{:>10.2f}{:>10}".format(
+            name, timed(lambda: within(lat, lon, radius, points),
+                        repeats) * 1000,
+            timed(lambda: storage.near(Place, lat, lon, radius),
+                  repeats) * 1000, results))
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+This script measures the memory used per instance by the model classes
+and by their compact classes, for instances built from saved records.
+
+Usage: ./benchmarks/bench_memory.py [number_of_instances]
+"""
+import os
+import sys
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.compact import compact
+from models.place import Place
+from models.review import Review
+from models.user import User
+
+
+def records(cls, count):
+    """
+    Returns count saved records of cls with their declared attributes
+    set
+    """
+    template = cls(id="0").to_dict()
+    if cls is Place:
+        template.update(city_id="c" * 36, user_id="u" * 36, name="Loft",
+                        description="Nice", number_rooms=2, max_guest=4,
+                        price_by_night=100, latitude=37.7, longitude=-122.4)
+    elif cls is Review:
+        template.update(place_id="p" * 36, user_id="u" * 36, text="Great")
+    else:
+        template.update(email="a@b.c", first_name="Betty")
+    result = []
+    for i in range(count):
+        record = dict(template)
+        record["id"] = "{:036d}".format(i)
+        result.append(record)
+    return result
+
+
+def bytes_per_instance(cls, saved):
+    """
+    Returns the number of bytes allocated per instance of cls built
+    from the records in saved
+    """
+    tracemalloc.start()
+    instances = [cls(**record) for record in saved]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return size / len(saved)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for cls in (Place, Review, User):
+        saved = records(cls, count)
+        regular = bytes_per_instance(cls, saved)
+        small = bytes_per_instance(compact(cls), saved)
+        print("{:<8}{:>8.0f} bytes{:>8.0f} bytes compact ({:.0%})".format(
+            cls.__name__, regular, small, small / regular))
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+This script measures reading the Reviews of many Places one Place at a
+time through Place.reviews, against storage.prefetch(places, "reviews"),
+with FileStorage and with SQLiteStorage, and against the scan of every
+Review per Place calling code did before relationships existed.
+
+Usage: ./benchmarks/bench_prefetch.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+import tempfile
+from time import perf_counter
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.sqlite_storage import SQLiteStorage
+from models.place import Place
+from models.review import Review
+
+
+def load(storage, count):
+    """
+    Fills storage with count Places and 5 times as many Reviews
+    """
+    rand = random.Random(0)
+    dates = {"created_at": "2024-01-01T00:00:00",
+             "updated_at": "2024-01-01T00:00:00"}
+    for i in range(count):
+        storage.new(Place(id=str(i), **dates))
+    for i in range(count * 5):
+        storage.new(Review(id=str(i), place_id=str(rand.randrange(count)),
+                           **dates))
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+def one_by_one(places):
+    """
+    Reads the Reviews of every Place through Place.reviews
+    """
+    return {pl.id: pl.reviews for pl in places}
+
+
+def scanning(storage, places):
+    """
+    Reads the Reviews of every Place by scanning every Review
+    """
+    reviews = list(storage.all(Review).values())
+    return {pl.id: [rv for rv in reviews if rv.place_id == pl.id]
+            for pl in places}
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    tmp = tempfile.TemporaryDirectory()
+    FileStorage._FileStorage__objects = {}
+    sqlite = SQLiteStorage(os.path.join(tmp.name, "hbnb.db"))
+    sqlite.reload()
+    print("{:<14}{:>8}{:>16}{:>14}{:>14}".format(
+        "storage", "places", "one by one ms", "prefetch ms", "scan ms"))
+    for name, storage in (("FileStorage", FileStorage()),
+                          ("SQLiteStorage", sqlite)):
+        with patch("models.storage", storage):
+            load(storage, count)
+            for size in (100, count):
+                places = list(storage.all(Place).values())[:size]
+                scan = "-"
+                if size <= 100:
+                    scan = "{:.1f}".format(timed(
+                        lambda: scanning(storage, places), repeats) * 1000)
+                print("{:<14}{:>8}{:>16.1f}{:>14.1f}{:>14}".format(
+                    name, size,
+                    timed(lambda: one_by_one(places), repeats) * 1000,
+                    timed(lambda: storage.prefetch(places, "reviews"),
+                          repeats) * 1000, scan))
+    sqlite.close()
+    tmp.cleanup()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""
+This script measures the price and capacity searches on Places answered
+by the sorted indexes of FileStorage, against a scan of every Place.
+
+Usage: ./benchmarks/bench_range_index.py [number_of_places] [repeats]
+"""
+import os
+import sys
+import random
+from heapq import nsmallest
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.query import matches
+from models.engine.query import parse_query
+from models.place import Place
+
+
+def load(count):
+    """
+    Fills the storage with count Places of random price and capacity
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    for i in range(count):
+        storage.new(Place(id=str(i), created_at="2024-01-01T00:00:00",
+                          updated_at="2024-01-01T00:00:00",
+                          price_by_night=rand.randrange(20, 500),
+                          number_rooms=rand.randrange(1, 8),
+                          max_guest=rand.randrange(1, 12)))
+    return storage
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    start = perf_counter()
+    storage = load(count)
+    print("load {} Places: {:.1f} s".format(count, perf_counter() - start))
+    places = list(storage.all(Place).values())
+    start = perf_counter()
+    storage.select(Place, [("price_by_night", "<", 0)])
+    print("first query, sorting the index: {:.2f} s".format(
+        perf_counter() - start))
+    cases = (
+        ("range", [("price_by_night", ">=", 100),
+                   ("price_by_night", "<", 102)], None),
+        ("range + filter", [("price_by_night", "<", 30),
+                            ("max_guest", ">=", 10)], None),
+        ("top-20", [], "order_by(price_by_night).limit(20)"),
+        ("top-20 + filter", [("max_guest", ">=", 10)],
+         "order_by(-price_by_night).limit(20)"),
+    )
+    print("{:<16}{:>10}{:>12}{:>10}".format("query", "scan ms", "index ms",
+                                            "results"))
+    for name, conditions, chain in cases:
+        if chain is None:
+            def scan():
+                return [pl for pl in places if matches(pl, conditions)]
+
+            def indexed():
+                return storage.select(Place, conditions)
+        else:
+            query = parse_query(Place, "where({}).{}".format(", ".join(
+                "{}{}{}".format(*c) for c in conditions), chain))
+            attr, descending = query.order[0]
+            sign = -1 if descending else 1
+
+            def scan():
+                return nsmallest(query.limit, (
+                    pl for pl in places if matches(pl, conditions)),
+                    key=lambda pl: sign * getattr(pl, attr))
+
+            def indexed():
+                return query.run(storage)
+        results = len(indexed())
+        print("{:<16}{:>10.2f}{:>12.3f}{:>10}".format(
+            name, timed(scan, repeats) * 1000,
+            timed(indexed, repeats) * 1000, results))
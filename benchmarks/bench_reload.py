@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+This script measures how fast FileStorage reloads a JSON file, comparing
+the eval() based class lookup it used to do for every record with the
+lookup in the model registry.
+
+Usage: ./benchmarks/bench_reload.py [number_of_records]
+"""
+import os
+import sys
+import tempfile
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.base_model import BaseModel
+from models.base_model import registry
+from models.user import User
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+
+
+def make_records(count):
+    """
+    Returns count records spread over every model class, as saved in
+    the JSON file
+    """
+    names = sorted(registry)
+    records = []
+    for i in range(count):
+        record = BaseModel(id=str(i)).to_dict()
+        record["__class__"] = names[i % len(names)]
+        records.append(record)
+    return records
+
+
+def build_with_eval(records):
+    """
+    Builds the instances the way reload used to, with eval
+    """
+    for record in records:
+        record = dict(record)
+        name = record.pop("__class__")
+        eval(name)(**record)
+
+
+def build_with_registry(records):
+    """
+    Builds the instances the way reload does, with the registry
+    """
+    for record in records:
+        record = dict(record)
+        registry[record.pop("__class__")](**record)
+
+
+def timed(function, *args):
+    """
+    Returns the number of seconds taken by function(*args)
+    """
+    start = perf_counter()
+    function(*args)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    records = make_records(count)
+    for label, function in (("eval", build_with_eval),
+                            ("registry", build_with_registry)):
+        seconds = timed(function, records)
+        print("{:<16}{:>12.0f} records/s".format(label, count / seconds))
+
+    storage = FileStorage()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__journal_path = os.path.join(tmp, "journal")
+        FileStorage._FileStorage__objects = {}
+        for record in records:
+            record = dict(record)
+            storage.new(registry[record.pop("__class__")](**record))
+        storage.save()
+        del records
+        FileStorage._FileStorage__objects = {}
+        seconds = timed(storage.reload)
+        print("{:<16}{:>12.0f} records/s".format("reload", count / seconds))
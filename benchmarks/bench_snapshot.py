@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+This script compares the JSON file of FileStorage, with ISO and epoch
+dates, with the binary snapshot: the size of the file, the time taken
+by a first save, by a save once everything is serialized, by a reload
+and by a lazy reload, which only reads the records.
+
+Usage: ./benchmarks/bench_snapshot.py [number_of_places]
+"""
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+WORDS = ("quiet sunny loft near the park with a view of the bay and "
+         "a large kitchen close to shops bars and the beach").split()
+
+
+def make_instances(count):
+    """
+    Returns count Places with the States, Cities, Users, Amenities and
+    Reviews they reference
+    """
+    rand = random.Random(0)
+    states = [State(name="State {}".format(i)) for i in range(50)]
+    cities = [City(name="City {}".format(i), state_id=rand.choice(states).id)
+              for i in range(1000)]
+    users = [User(email="user{}@mail.com".format(i), first_name="Betty",
+                  last_name="Holberton", password="pwd")
+             for i in range(count // 10)]
+    amenities = [Amenity(name="Amenity {}".format(i)) for i in range(100)]
+    places = [Place(city_id=rand.choice(cities).id,
+                    user_id=rand.choice(users).id,
+                    name="Place {}".format(i),
+                    description=" ".join(rand.choices(WORDS, k=12)),
+                    number_rooms=rand.randint(1, 6),
+                    number_bathrooms=rand.randint(1, 3),
+                    max_guest=rand.randint(1, 10),
+                    price_by_night=rand.randint(20, 500),
+                    latitude=rand.uniform(-60, 60),
+                    longitude=rand.uniform(-180, 180),
+                    amenity_ids=[amenity.id for amenity in
+                                 rand.sample(amenities, 5)])
+              for i in range(count)]
+    reviews = [Review(place_id=rand.choice(places).id,
+                      user_id=rand.choice(users).id,
+                      text=" ".join(rand.choices(WORDS, k=20)))
+               for i in range(count)]
+    return states + cities + users + amenities + places + reviews
+
+
+def timed(function):
+    """
+    Returns the number of seconds taken by function()
+    """
+    start = perf_counter()
+    function()
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    instances = make_instances(count)
+    storage = FileStorage()
+    print("{} instances".format(len(instances)))
+    print("{:<18}{:>8}{:>10}{:>10}{:>10}{:>10}".format(
+        "format", "MB", "save s", "resave s", "reload s", "lazy s"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, name, codec in (("json (iso dates)", "file.json", "iso"),
+                                   ("json (epoch)", "file.json", "epoch"),
+                                   ("binary", "file.hbnb", "iso")):
+            path = os.path.join(tmp, name)
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__journal_path = path + ".journal"
+            FileStorage._FileStorage__text_path = path + ".text"
+            FileStorage._FileStorage__datetime_codec = codec
+            FileStorage._FileStorage__objects = {}
+            for obj in instances:
+                storage.new(obj)
+            save = timed(storage.save)
+            resave = timed(storage.save)
+            size = os.path.getsize(path) / 2 ** 20
+            FileStorage._FileStorage__objects = {}
+            reload = timed(storage.reload)
+            assert storage.count() == len(instances)
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__lazy = True
+            lazy = timed(storage.reload)
+            FileStorage._FileStorage__lazy = False
+            assert storage.count() == len(instances)
+            print("{:<18}{:>8.1f}{:>10.2f}{:>10.2f}{:>10.2f}{:>10.2f}".format(
+                label, size, save, resave, reload, lazy))
+            os.remove(path)
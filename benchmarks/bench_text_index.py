@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+This script measures the text search answered by the inverted index of
+FileStorage, against looking for the words in the text of every Review,
+and the time taken to build the index from scratch or from a saved one.
+
+Usage: ./benchmarks/bench_text_index.py [number_of_reviews] [repeats]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from models.engine.file_storage import FileStorage
+from models.engine.indexes import TextIndex
+from models.review import Review
+
+
+def load(count):
+    """
+    Fills the storage with count Reviews of 30 words each, drawn from a
+    vocabulary of 20000 words, the first ones being the most frequent
+    """
+    FileStorage._FileStorage__objects = {}
+    storage = FileStorage()
+    rand = random.Random(0)
+    words = ["word{}".format(i) for i in range(20000)]
+    weights = [1 / (i + 1) for i in range(len(words))]
+    for i in range(count):
+        text = " ".join(rand.choices(words, weights, k=30))
+        storage.new(Review(id=str(i), created_at="2024-01-01T00:00:00",
+                           updated_at="2024-01-01T00:00:00", text=text))
+    return storage
+
+
+def scan(storage, text):
+    """
+    Returns the ids of the Reviews using every word of text
+    """
+    words = text.lower().split()
+    return [rv.id for rv in storage.all(Review).values()
+            if all(word in rv.text.lower().split() for word in words)]
+
+
+def timed(function, repeats):
+    """
+    Returns the average number of seconds function takes
+    """
+    start = perf_counter()
+    for i in range(repeats):
+        function()
+    return (perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    storage = load(count)
+    reviews = storage.all(Review)
+    start = perf_counter()
+    storage.search(Review, "word0")
+    built = perf_counter() - start
+    state = FileStorage._FileStorage__indexes["Review"]["text"].state()
+    index = TextIndex("text")
+    start = perf_counter()
+    index.restore(state)
+    for key, rv in reviews.items():
+        index.add(key, rv)
+    index.search("word0")
+    restored = perf_counter() - start
+    print("build: {:.2f} s, from a saved index: {:.2f} s".format(
+        built, restored))
+    print("{:<22}{:>10}{:>10}{:>10}".format("query", "scan ms", "index ms",
+                                            "results"))
+    for name, text, limit in (("rare word", "word15000", None),
+                              ("two words", "word40 word41", None),
+                              ("two words, top 20", "word40 word41", 20),
+                              ("common word", "word3", None),
+                              ("common word, top 20", "word3", 20)):
+        results = len(storage.search(Review, text, limit))
+        print("{:<22}{:>10.1f}{:>10.2f}{:>10}".format(
+            name, timed(lambda: scan(storage, text), repeats) * 1000,
+            timed(lambda: storage.search(Review, text, limit),
+                  repeats) * 1000, results))
@@ -5,8 +5,25 @@ for AirBnB project.
 """
 import re
 import cmd
+import csv
+import sys
+import uuid
+from ast import literal_eval
+from datetime import datetime
+from itertools import islice
+from json import dumps
+from json import loads
+from os.path import isfile
+from time import perf_counter
 from models.base_model import BaseModel
+from models.base_model import registry
+from models.compact import declared_attributes
+from models.engine.query import parse_members
+from models.engine.query import parse_query
+from models.engine.query import parse_value
+from models.engine.query import Query
 from models import storage
+from models.relationships import Relationship
 from models.user import User
 from models.amenity import Amenity
 from models.city import City
@@ -23,6 +40,163 @@ def build_args(line):
     return line.split()
 
 
+def parse_literal(string):
+    """
+    This function returns the Python literal written in string, or None
+    if string isn't a literal.
+    """
+    try:
+        return literal_eval(string)
+    except (ValueError, SyntaxError):
+        return None
+
+
+def cast_value(cls, name, value):
+    """
+    This function returns value converted to the type of the attribute
+    name of cls when it's declared as a str, int or float, or decoded
+    from JSON when it's declared as a list or dict and value is a string.
+    Raises ValueError if value can't be converted.
+    """
+    declared = declared_attributes(cls)
+    kind = type(declared.get(name))
+    if name in declared and kind in {str, int, float}:
+        return kind(value)
+    if name in declared and kind in {list, dict} and type(value) is str:
+        value = loads(value)
+        if type(value) is not kind:
+            raise ValueError("Not a {}: {}".format(kind.__name__, value))
+    return value
+
+
+def is_relationship(cls, name):
+    """
+    This function returns True if name is a relationship of cls, like
+    the cities of State, which is read from the storage and can't be set.
+    """
+    return type(name) is str and isinstance(getattr(cls, name, None),
+                                            Relationship)
+
+
+def read_rows(path):
+    """
+    This function yields the line number and the dictionary of each row
+    of a JSON Lines file, or of a CSV file when path ends with .csv. The
+    dictionary is None when the row can't be read.
+    """
+    with open(path, newline="", encoding="utf8") as fs:
+        if path.endswith(".csv"):
+            reader = csv.DictReader(fs)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items()
+                                        if k is not None and v != ""}
+            return
+        for number, text in enumerate(fs, 1):
+            if not text.strip():
+                continue
+            try:
+                row = loads(text)
+            except ValueError:
+                row = None
+            yield number, row if type(row) is dict else None
+
+
+def build_instance(cls, row):
+    """
+    This function returns a new instance of cls with the attributes
+    given in row, or None if one of them has a wrong value. The instance
+    isn't added to the storage.
+    """
+    now = datetime.now().isoformat()
+    attrs = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now}
+    try:
+        for key, value in row.items():
+            if key != "__class__":
+                attrs[key] = cast_value(cls, key, value)
+        attrs["id"] = str(attrs["id"])
+        return cls(**attrs)
+    except (ValueError, TypeError):
+        return None
+
+
+def write_rows(fs, objects, fmt, cls=None):
+    """
+    This function writes the dictionary of each instance of objects to
+    the text file fs, as JSON Lines or as CSV with the columns of cls,
+    whose list and dict cells are JSON, and returns the number of
+    instances written.
+    """
+    count = 0
+    if fmt == "csv":
+        fields = ["id", "created_at", "updated_at"]
+        fields += [name for name in declared_attributes(cls)
+                   if name not in fields]
+        writer = csv.DictWriter(fs, fields, extrasaction="ignore")
+        writer.writeheader()
+        for obj in objects:
+            writer.writerow({key: dumps(value)
+                             if type(value) in (list, dict) else value
+                             for key, value in obj.to_dict().items()})
+            count += 1
+    else:
+        for obj in objects:
+            fs.write(dumps(obj.to_dict()) + "\n")
+            count += 1
+    return count
+
+
+def paginate(objects, limit=None, offset=0):
+    """
+    This function returns an iterator over the instances of objects,
+    skipping offset of them and stopping after limit of them.
+    """
+    stop = None if limit is None else offset + limit
+    return islice(objects, offset, stop)
+
+
+def find_key(name, id):
+    """
+    This function returns the storage key of the instance id of the
+    class name, or of any class if name is None, or None if there's no
+    such instance
+    """
+    for cls in [name] if name else HBNBCommand.classes:
+        if storage.get(cls, id) is not None:
+            return "{}.{}".format(cls, id)
+    return None
+
+
+def print_list(items):
+    """
+    This function prints the list of items as print(list(items)) would,
+    writing each item as soon as it's produced.
+    """
+    sep = "["
+    for item in items:
+        sys.stdout.write(sep + repr(item))
+        sep = ", "
+    print("[]" if sep == "[" else "]")
+
+
+def resolve_amenities(tree):
+    """
+    This function returns the expression tree with the Amenity names it
+    holds replaced by the ids of the Amenities having them, keeping the
+    values that are already Amenity ids.
+    """
+    if type(tree) is tuple:
+        return (tree[0],) + tuple(resolve_amenities(arg) for arg in tree[1:])
+    if storage.get(Amenity, tree) is not None:
+        return tree
+    ids = [amenity.id for amenity in storage.find(Amenity, name=tree)]
+    if not ids:
+        return tree
+    found = ids[0]
+    for id in ids[1:]:
+        found = ("or", found, id)
+    return found
+
+
 def make_str_without_quotes(string):
     """
     This function reconstructes the str without quote
@@ -40,10 +214,7 @@ class HBNBCommand(cmd.Cmd):
     """
     prompt = "(hbnb) "
 
-    classes = [
-            'BaseModel', 'User', 'State', 'City',
-            'Amenity', 'Place', 'Review'
-            ]
+    classes = registry
 
     def emptyline(self):
         """
@@ -55,6 +226,8 @@ class HBNBCommand(cmd.Cmd):
         """
         Quits the program
         """
+        storage.commit()
+        storage.flush()
         return True
 
     def do_EOF(self, line):
@@ -62,8 +235,23 @@ class HBNBCommand(cmd.Cmd):
         Quits the program with EOF
         """
         print("")
+        storage.commit()
+        storage.flush()
         return True
 
+    def do_begin(self, line):
+        """
+        Starts a batch: the changes are saved together on commit
+        (or every few changes, for long batches)
+        """
+        storage.begin()
+
+    def do_commit(self, line):
+        """
+        Ends a batch and saves its changes
+        """
+        storage.commit()
+
     def do_create(self, line):
         """
         Creates a new instance of BaseModel, saves it (to the JSON file)
@@ -76,7 +264,7 @@ class HBNBCommand(cmd.Cmd):
         elif args[0] not in HBNBCommand.classes:
             print("** class doesn't exist **")
         else:
-            print(eval(args[0])().id)
+            print(HBNBCommand.classes[args[0]]().id)
             storage.save()
 
     def do_show(self, line):
@@ -92,10 +280,10 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
         elif len(args) == 1:
             print("** instance id missing **")
-        elif f"{args[0]}.{args[1]}" not in storage.all():
+        elif storage.get(args[0], args[1]) is None:
             print("** no instance found **")
         else:
-            print(storage.all()[f"{args[0]}.{args[1]}"])
+            print(storage.get(args[0], args[1]))
 
     def do_destroy(self, line):
         """
@@ -110,29 +298,78 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
         elif len(args) == 1:
             print("** instance id missing **")
-        elif f"{args[0]}.{args[1]}" not in storage.all():
+        elif storage.get(args[0], args[1]) is None:
             print("** no instance found **")
         else:
-            del storage.all()[f"{args[0]}.{args[1]}"]
+            storage.delete(storage.get(args[0], args[1]))
             storage.save()
 
     def do_all(self, line):
         """
         Prints all string representation of all instances based
-        or not on the class name.
+        or not on the class name. A page is printed with limit=<n>,
+        offset=<n> and after=<id of the last instance printed>.
+        With a lazy reload, an instance first read between two pages,
+        by show for example, moves behind the others.
         """
         args = build_args(line)
+        options = {}
+        for arg in [arg for arg in args if "=" in arg]:
+            args.remove(arg)
+            key, value = arg.split("=", 1)
+            options[key] = make_str_without_quotes(value)
 
         if len(args) > 0 and args[0] not in HBNBCommand.classes:
             print("** class doesn't exist **")
-        else:
-            obj_list = []
-            for o in storage.all().values():
-                if len(args) > 0 and args[0] == type(o).__name__:
-                    obj_list.append(o.__str__())
-                elif len(args) == 0:
-                    obj_list.append(o.__str__())
-            print(obj_list)
+            return
+        name = args[0] if args else None
+        after = options.pop("after", None)
+        if after is not None:
+            after = find_key(name, after)
+            if after is None:
+                print("** no instance found **")
+                return
+        try:
+            objects = paginate(
+                    storage.iterate(name, after=after),
+                    limit=(int(options.pop("limit"))
+                           if "limit" in options else None),
+                    offset=int(options.pop("offset", 0)))
+            if options:
+                raise ValueError(options)
+        except ValueError:
+            print("** invalid argument **")
+            return
+        print_list(o.__str__() for o in objects)
+
+    def do_where(self, line):
+        """
+        Prints the instances of a class matching a query:
+        where <class name> <attribute><operator><value>, ...
+        or <class name>.where(<conditions>)[.order_by(<attribute>, ...)]
+        [.limit(<n>)][.offset(<n>)][.select(<attribute>, ...)]
+        where -<attribute> sorts in descending order
+        """
+        name, _, text = line.strip().partition(" ")
+        text = text.strip()
+
+        if not name:
+            print("** class name missing **")
+            return
+        if name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if not text.startswith("("):
+            text = "(" + text + ")"
+        try:
+            query = parse_query(HBNBCommand.classes[name], "where" + text)
+            found = query.run(storage)
+        except (ValueError, TypeError):
+            print("** invalid query **")
+            return
+        if query.fields is None:
+            found = (o.__str__() for o in found)
+        print_list(found)
 
     def do_update(self, line):
         """
@@ -140,7 +377,6 @@ class HBNBCommand(cmd.Cmd):
         updating attribute (save the change into the JSON file).
         """
         args = build_args(line)
-        obj_dict = storage.all()
 
         if len(args) == 0:
             print("** class name missing **")
@@ -151,47 +387,284 @@ class HBNBCommand(cmd.Cmd):
         if len(args) == 1:
             print("** instance id missing **")
             return False
-        if "{}.{}".format(args[0], args[1]) not in obj_dict.keys():
+        obj = storage.get(args[0], args[1])
+        if obj is None:
             print("** no instance found **")
             return False
         if len(args) == 2:
             print("** attribute name missing **")
             return False
-        if len(args) == 3:
-            try:
-                type(eval(args[2])) != dict
-            except NameError:
-                print("** value missing **")
-                return False
+        if len(args) == 3 and type(parse_literal(args[2])) != dict:
+            print("** value missing **")
+            return False
 
+        cls = HBNBCommand.classes[args[0]]
+        names = parse_literal(args[2])
+        if type(names) is not dict:
+            names = [args[2]]
+        if any(is_relationship(cls, name) for name in names):
+            print("** attribute can't be set **")
+            return False
+        declared = declared_attributes(cls)
         if len(args) == 4:
-            obj = obj_dict["{}.{}".format(args[0], args[1])]
-            if args[2] in obj.__class__.__dict__.keys():
-                valtype = type(obj.__class__.__dict__[args[2]])
-                obj.__dict__[args[2]] = valtype(args[3])
+            if args[2] in declared:
+                valtype = type(declared[args[2]])
+                setattr(obj, args[2], valtype(args[3]))
             else:
-                obj.__dict__[args[2]] = args[3]
-        elif type(eval(args[2])) == dict:
-            obj = obj_dict["{}.{}".format(args[0], args[1])]
-            for k, v in eval(args[2]).items():
-                if (k in obj.__class__.__dict__.keys() and
-                        type(obj.__class__.__dict__[k]) in {str, int, float}):
-                    valtype = type(obj.__class__.__dict__[k])
-                    obj.__dict__[k] = valtype(v)
-                else:
-                    obj.__dict__[k] = v
+                setattr(obj, args[2], args[3])
+        elif type(parse_literal(args[2])) == dict:
+            try:
+                values = {k: cast_value(cls, k, v)
+                          for k, v in parse_literal(args[2]).items()}
+            except ValueError:
+                print("** invalid argument **")
+                return False
+            for k, v in values.items():
+                setattr(obj, k, v)
         storage.save()
 
+    def do_import(self, line):
+        """
+        Creates instances of a class from the rows of a JSON Lines file,
+        or of a CSV file when its name ends with .csv, and saves them
+        all at once
+        """
+        args = build_args(line)
+
+        if len(args) == 0:
+            print("** class name missing **")
+        elif args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+        elif len(args) == 1:
+            print("** file name missing **")
+        elif not isfile(args[1]):
+            print("** file doesn't exist **")
+        else:
+            cls = HBNBCommand.classes[args[0]]
+            start = perf_counter()
+            count = 0
+            for number, row in read_rows(args[1]):
+                obj = None if row is None else build_instance(cls, row)
+                if obj is None:
+                    print("** invalid row {} **".format(number))
+                    continue
+                storage.new(obj)
+                count += 1
+            storage.save()
+            seconds = perf_counter() - start
+            print("{} {} imported in {:.2f}s ({:.0f} rows/s)".format(
+                count, args[0], seconds, count / seconds if seconds else 0))
+
+    def do_export(self, line):
+        """
+        Writes the instances of a class, or all instances, to a file or
+        to the standard output when no file (or -) is given, one at a
+        time, as JSON Lines or as CSV for a class:
+        export [<class name>] [--format jsonl|csv] [<file>]
+        Without a class name, the file has to contain a . or a / so that
+        it isn't taken for a misspelled class.
+        """
+        args = build_args(line)
+        fmt = "jsonl"
+        if "--format" in args:
+            i = args.index("--format")
+            fmt = args[i + 1] if i + 1 < len(args) else ""
+            del args[i:i + 2]
+        name = None
+        if args and args[0] in HBNBCommand.classes:
+            name = args.pop(0)
+
+        if fmt not in ("jsonl", "csv"):
+            print("** format doesn't exist **")
+        elif len(args) > 1 or (name is None and args and
+                               args[0] != "-" and "." not in args[0] and
+                               "/" not in args[0]):
+            print("** class doesn't exist **")
+        elif fmt == "csv" and name is None:
+            print("** class name missing **")
+        elif not args or args[0] == "-":
+            write_rows(sys.stdout, storage.iterate(name), fmt,
+                       HBNBCommand.classes.get(name))
+        else:
+            with open(args[0], "w", newline="", encoding="utf8") as fs:
+                count = write_rows(fs, storage.iterate(name), fmt,
+                                   HBNBCommand.classes.get(name))
+            print("{} exported".format(count))
+
+    def do_near(self, line):
+        """
+        Prints the instances of a class within a radius in km of a point,
+        nearest first: near <class name> <latitude> <longitude> <radius>
+        or <class name>.near(<latitude>, <longitude>, <radius>)
+        """
+        args = build_args(line.replace(",", " "))
+
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) != 4:
+            print("** invalid argument **")
+            return
+        try:
+            latitude, longitude, radius = (float(arg) for arg in args[1:])
+        except ValueError:
+            print("** invalid argument **")
+            return
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and
+                radius >= 0):
+            print("** invalid argument **")
+            return
+        try:
+            found = storage.near(args[0], latitude, longitude, radius)
+        except ValueError:
+            print("** class has no coordinates **")
+            return
+        print_list(obj.__str__() for obj, distance in found)
+
+    def do_search(self, line):
+        """
+        Prints the ids of the instances of a class whose text uses the
+        given words, best match first: search <class name> <words> or
+        <class name>.search("<words>")
+        """
+        args = build_args(line)
+
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if len(args) == 1:
+            print("** words missing **")
+            return
+        try:
+            found = storage.search(args[0], " ".join(args[1:]))
+        except ValueError:
+            print("** class has no text **")
+            return
+        print_list(obj.id for obj, score in found)
+
+    def do_having(self, line):
+        """
+        Prints the instances of a class whose list attribute holds values
+        combined with and, or, not and parentheses, Amenities being
+        given by id or name for Place: having <class name> <expression>
+        or <class name>.having("<expression>")
+        """
+        args = line.split(maxsplit=1)
+
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if args[0] not in storage.member_keys:
+            print("** class has no list attribute **")
+            return
+        if len(args) == 1:
+            print("** expression missing **")
+            return
+        try:
+            tree = parse_members(args[1])
+        except ValueError:
+            print("** invalid expression **")
+            return
+        attr = storage.member_keys[args[0]][0]
+        if attr == "amenity_ids":
+            tree = resolve_amenities(tree)
+        found = storage.having(args[0], attr, tree)
+        print_list(obj.__str__() for obj in found)
+
+    def do_aggregate(self, line):
+        """
+        Prints the number of instances of a class per value of the
+        attribute by=, with the min, max and avg of the attribute of=
+        if given, for the group whose value is for= only if given:
+        aggregate <class name> by=<attribute> [of=<attribute>]
+        [for=<value>] or <class name>.aggregate(by=<attribute>, ...)
+        where the value is read as a literal, like 4 or "4"
+        """
+        args = build_args(line)
+        options = {}
+        for arg in [arg for arg in args if "=" in arg]:
+            args.remove(arg)
+            key, value = arg.split("=", 1)
+            if key == "for":
+                options[key] = parse_value(value)
+            else:
+                options[key] = make_str_without_quotes(value)
+
+        if len(args) == 0:
+            print("** class name missing **")
+            return
+        if args[0] not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if (len(args) > 1 or "by" not in options or
+                not set(options) <= {"by", "of", "for"}):
+            print("** invalid argument **")
+            return
+        if "for" in options:
+            print(storage.group_stats(args[0], options["by"],
+                                      options["for"], options.get("of")))
+        else:
+            print(storage.aggregate(args[0], options["by"],
+                                    options.get("of")))
+
+    def do_stats(self, line):
+        """
+        Prints the number of instances of a class matching conditions,
+        with the min, max and avg of an attribute, per value of the
+        attribute by= if given, computed on the columns of the class:
+        stats <class name> <attribute> [by=<attribute>] [<conditions>]
+        or <class name>.stats(<attribute>, [by=<attribute>, ]...)
+        Both attributes have to be declared by the class.
+        """
+        name, _, text = line.strip().partition(" ")
+        attr, _, text = text.strip().partition(" ")
+        attr = attr.rstrip(",")
+        text = text.strip()
+        group = re.match(r"by=(\w+)\s*,?", text)
+        if group is not None:
+            text = text[group.end():]
+
+        if not name:
+            print("** class name missing **")
+            return
+        if name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+        if not attr:
+            print("** attribute name missing **")
+            return
+        declared = dict(declared_attributes(HBNBCommand.classes[name]),
+                        id="")
+        if attr not in declared or (group is not None and
+                                    group.group(1) not in declared):
+            print("** attribute doesn't exist **")
+            return
+        query = Query(HBNBCommand.classes[name])
+        try:
+            query.where(text)
+        except ValueError:
+            print("** invalid query **")
+            return
+        table = storage.columns(name)
+        if group is None:
+            print(table.stats(attr, query.conditions))
+        else:
+            print(table.groups(group.group(1), attr, query.conditions))
+
     def do_instance_counter(self, line):
         """
         Counts the number of instances of a class
         """
-        number_of_instances = 0
-        for instance in storage.all().values():
-            if build_args(line)[0] == type(instance).__name__:
-                number_of_instances += 1
-
-        print(number_of_instances)
+        print(storage.count(build_args(line)[0]))
 
     def default(self, line):
         """
@@ -204,6 +677,12 @@ class HBNBCommand(cmd.Cmd):
                 "show": self.do_show,
                 "destroy": self.do_destroy,
                 "update": self.do_update,
+                "where": self.do_where,
+                "near": self.do_near,
+                "search": self.do_search,
+                "having": self.do_having,
+                "aggregate": self.do_aggregate,
+                "stats": self.do_stats,
                 }
 
         pattern = re.compile(r"^(\w+)\.(\w+)\((.*)\)")
@@ -214,7 +693,24 @@ class HBNBCommand(cmd.Cmd):
             super().default(line)
             return
 
-        if matches[0][1] == "all" or matches[0][1] == "count":
+        if matches[0][1] == "where":
+            self.do_where(matches[0][0] + " " +
+                          line[len(matches[0][0] + ".where"):])
+        elif matches[0][1] in ("all", "aggregate"):
+            options = [arg.strip() for arg in matches[0][2].split(",")]
+            cmd_dict[matches[0][1]](" ".join([matches[0][0]] + options))
+        elif matches[0][1] in ("near", "stats"):
+            cmd_dict[matches[0][1]](matches[0][0] + " " + matches[0][2])
+        elif matches[0][1] == "search":
+            cmd_dict["search"](matches[0][0] + " " +
+                               make_str_without_quotes(matches[0][2]))
+        elif matches[0][1] == "having":
+            expression = matches[0][2].strip()
+            if (len(expression) > 1 and expression[0] in "'\"" and
+                    expression[-1] == expression[0]):
+                expression = expression[1:-1]
+            cmd_dict["having"](matches[0][0] + " " + expression)
+        elif matches[0][1] == "count":
             cmd_dict[matches[0][1]](matches[0][0])
         elif matches[0][1] == "destroy" or matches[0][1] == "show":
             obj_id = matches[0][2][1:-1]
@@ -230,7 +726,7 @@ class HBNBCommand(cmd.Cmd):
                         matches[0][0], sub_match[0], key, val)
                 cmd_dict[matches[0][1]](param)
             else:
-                dict_repr = eval(sub_match[1])
+                dict_repr = parse_literal(sub_match[1]) or {}
                 for k, v in dict_repr.items():
                     param = "{} {} {} {}".format(
                             matches[0][0], sub_match[0], k, v)
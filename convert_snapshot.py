@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+"""
+This script converts a snapshot of FileStorage between the JSON and
+binary formats, each chosen by the extension of its file:
+
+    ./convert_snapshot.py <source> <destination>
+
+Importing the models package reloads its storage, so the storage is
+pointed at an empty directory first: the files converted are only read
+once, and the settings of the storage, like HBNB_DURABILITY, don't
+matter.
+"""
+import os
+import sys
+import tempfile
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <source> <destination>".format(sys.argv[0]),
+              file=sys.stderr)
+        sys.exit(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.pop("HBNB_TYPE_STORAGE", None)
+        os.environ["HBNB_FILE_PATH"] = os.path.join(tmp, "file.json")
+        os.environ["HBNB_DURABILITY"] = "none"
+        from models.engine.snapshot import convert
+        print("{} records converted".format(convert(*sys.argv[1:])))
@@ -1,16 +1,54 @@
 #!/usr/bin/python3
 """
 This module contains a BaseModel class for the AirBnB project.
+
+Every model class is recorded by name in the registry dictionary as
+soon as it is defined, which is how the storage and the console find
+a class from its name.
+
+Dates are stored as ISO 8601 strings, or as integer microseconds since
+the epoch when the storage is configured to do so. Both are read back.
 """
 import uuid
 from datetime import datetime
+from datetime import timedelta
 import models
 
+registry = {}
+EPOCH = datetime(1970, 1, 1)
+
+
+def parse_datetime(value):
+    """
+    This function returns the datetime stored as value, which is either
+    an ISO 8601 string or a number of microseconds since the epoch
+    """
+    if type(value) is int:
+        return EPOCH + timedelta(microseconds=value)
+    return datetime.fromisoformat(value)
+
+
+def epoch_micros(date):
+    """
+    This function returns the number of microseconds between the epoch
+    and date
+    """
+    return (date - EPOCH) // timedelta(microseconds=1)
+
 
 class BaseModel:
     """
     This class defines all common attributes/methods for other classes
     """
+    def __init_subclass__(cls, register=True, **kwargs):
+        """
+        This method adds every subclass to the registry, unless
+        register is False
+        """
+        super().__init_subclass__(**kwargs)
+        if register:
+            registry[cls.__name__] = cls
+
     def __init__(self, *args, **kwargs):
         """
         This method instantiates instance attributes.
@@ -24,13 +62,21 @@ class BaseModel:
                 if key == "__class__":
                     continue
                 elif key == 'created_at' or key == 'updated_at':
-                    self.__dict__[key] = datetime.strptime(
-                            value, '%Y-%m-%dT%H:%M:%S.%f')
+                    self.__dict__[key] = parse_datetime(value)
                 else:
                     self.__dict__[key] = value
         else:
             models.storage.new(self)
 
+    def __setattr__(self, name, value):
+        """
+        This method sets an attribute and lets the storage know that the
+        instance has changed. Changes made in place (e.g. appending to a
+        list attribute) are not seen, call save() after them.
+        """
+        models.storage.touch(self, name, value)
+        super().__setattr__(name, value)
+
     def __str__(self):
         """
         This method returns the string representation of the BaseModel object.
@@ -44,6 +90,7 @@ class BaseModel:
         current datetime
         """
         self.updated_at = datetime.now()
+        models.storage.touch(self)
         models.storage.save()
 
     def to_dict(self):
@@ -57,3 +104,6 @@ class BaseModel:
         a_dict['updated_at'] = a_dict['updated_at'].isoformat()
 
         return a_dict
+
+
+registry[BaseModel.__name__] = BaseModel
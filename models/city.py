@@ -4,6 +4,8 @@ This module defines class called City that inherits
 from the BaseModel class
 """
 from models.base_model import BaseModel
+from models.relationships import BelongsTo
+from models.relationships import HasMany
 
 
 class City(BaseModel):
@@ -13,4 +15,6 @@ class City(BaseModel):
     """
     state_id = ""
     name = ""
+    state = BelongsTo("State", "state_id")
+    places = HasMany("Place", "city_id")
 
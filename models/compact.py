@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""
+This module contains a compact representation of the model classes,
+for storages holding a large number of instances.
+
+compact(Place) returns a class named Place, also reachable as
+Place.Compact, whose instances keep the declared attributes of Place
+(and id, created_at, updated_at) in slots instead of a per-instance
+dictionary. Unset attributes fall back to the class defaults, and
+attributes that aren't declared, like the ones the console's update can
+add, go to an overflow dictionary created on demand. The instances
+behave like the model's (same keys, to_dict(), __str__(), save()) but
+aren't instances of the model class itself.
+"""
+import uuid
+from datetime import datetime
+import models
+from models.base_model import BaseModel
+from models.base_model import parse_datetime
+
+_compact_classes = {}
+
+
+def declared_attributes(cls):
+    """
+    This function returns the names of the attributes declared by the
+    model class cls, with their default values
+    """
+    defaults = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if (not name.startswith("_") and not callable(value) and
+                    not hasattr(value, "__get__")):
+                defaults[name] = value
+    return defaults
+
+
+class CompactModel:
+    """
+    This class defines the behaviour shared by all compact classes
+    """
+    __slots__ = ("_extra",)
+    _fields = ()
+    _fieldset = frozenset()
+    _defaults = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        This method instantiates instance attributes.
+        """
+        object.__setattr__(self, "_extra", None)
+        if not kwargs:
+            self.id = str(uuid.uuid4())
+            self.created_at = datetime.today()
+            self.updated_at = datetime.today()
+            models.storage.new(self)
+            return
+        for key, value in kwargs.items():
+            if key == "__class__":
+                continue
+            if key == 'created_at' or key == 'updated_at':
+                value = parse_datetime(value)
+            self.__store(key, value)
+
+    def __store(self, name, value):
+        """
+        This method sets an attribute without telling the storage
+        """
+        if name in self._fieldset or hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        elif self._extra is None:
+            object.__setattr__(self, "_extra", {name: value})
+        else:
+            self._extra[name] = value
+
+    def __setattr__(self, name, value):
+        """
+        This method sets an attribute and lets the storage know that the
+        instance has changed.
+        """
+        models.storage.touch(self, name, value)
+        self.__store(name, value)
+
+    def __getattr__(self, name):
+        """
+        This method returns the default or the overflow value of an
+        attribute that isn't set in a slot
+        """
+        if name in self._defaults:
+            return self._defaults[name]
+        extra = object.__getattribute__(self, "_extra")
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError("'{}' object has no attribute '{}'".format(
+            type(self).__name__, name))
+
+    def __delattr__(self, name):
+        """
+        This method deletes an attribute from its slot or the overflow
+        dictionary
+        """
+        if self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            object.__delattr__(self, name)
+
+    @property
+    def __dict__(self):
+        """
+        This property returns a new dictionary of the attributes set on
+        the instance, like the __dict__ of the model's instances
+        """
+        attrs = {}
+        for name in self._fields:
+            try:
+                attrs[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        if self._extra:
+            attrs.update(self._extra)
+        return attrs
+
+    def __getstate__(self):
+        """
+        This method returns the attributes set on the instance, which
+        pickle saves
+        """
+        return self.__dict__
+
+    def __setstate__(self, state):
+        """
+        This method sets the attributes pickle saved, without telling
+        the storage
+        """
+        object.__setattr__(self, "_extra", None)
+        for name, value in state.items():
+            self.__store(name, value)
+
+    __str__ = BaseModel.__str__
+    save = BaseModel.save
+    to_dict = BaseModel.to_dict
+
+
+def compact(cls):
+    """
+    This function returns the compact class of the model class cls
+    """
+    if cls in _compact_classes:
+        return _compact_classes[cls]
+    defaults = declared_attributes(cls)
+    fields = ("id", "created_at", "updated_at")
+    fields += tuple(name for name in defaults if name not in fields)
+    namespace = {
+            "__slots__": fields,
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__ + ".Compact",
+            "__doc__": cls.__doc__,
+            "_fields": fields,
+            "_fieldset": frozenset(fields),
+            "_defaults": defaults,
+            }
+    for klass in cls.__mro__:
+        if klass in (BaseModel, object):
+            continue
+        for name, value in vars(klass).items():
+            if (name not in namespace and not name.startswith("__") and
+                    name not in defaults):
+                namespace[name] = value
+    # the name stays the model's, which the storage keys use, and the
+    # class is reachable as cls.Compact for pickle
+    _compact_classes[cls] = type(cls.__name__, (CompactModel,), namespace)
+    cls.Compact = _compact_classes[cls]
+    return _compact_classes[cls]
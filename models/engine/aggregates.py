@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""
+This module contains the aggregates kept up to date by the storage
+engines of the AirBnB project, like the number of Reviews of each Place
+or the number of Places of each City with the minimum, maximum and
+average of their price_by_night.
+
+An Aggregate groups the instances of one class by the value of a group
+attribute. For each group it keeps the number of instances and, when it
+has a value attribute, the sum and the multiset of the numeric values,
+so the statistics of a group are read without looking at its instances.
+"""
+from models.engine.indexes import is_number
+
+
+class Aggregate:
+    """
+    This class keeps statistics of the instances of one class grouped by
+    the value of one attribute. As the new value of an attribute is only
+    known once it's set, changed instances are counted again when the
+    aggregate is read.
+    """
+
+    def __init__(self, group, attr=None):
+        """
+        This method instantiates an empty aggregate of the values of attr
+        grouped by the attribute group, or counting the instances only
+        when attr is None
+        """
+        self.group = group
+        self.attr = attr
+        self.attrs = (group,) if attr is None else (group, attr)
+        self.__groups = {}
+        self.__members = {}
+        self.__stale = {}
+
+    def add(self, key, obj):
+        """
+        Counts obj under key, once the aggregate is read
+        """
+        self.__stale[key] = obj
+
+    def update(self, key, obj, value=None):
+        """
+        Counts obj under key again, once the aggregate is read
+        """
+        self.__stale[key] = obj
+
+    def remove(self, key):
+        """
+        Stops counting the instance counted under key
+        """
+        self.__stale.pop(key, None)
+        self.__leave(key)
+
+    def get(self, group):
+        """
+        Returns the statistics of the instances whose group attribute is
+        group: their count, and the min, max and avg of their numeric
+        values when the aggregate has a value attribute
+        """
+        self.__refresh()
+        return self.__stats(self.__groups.get(group))
+
+    def groups(self):
+        """
+        Returns a dictionary of the statistics of every group
+        """
+        self.__refresh()
+        return {group: self.__stats(stats)
+                for group, stats in self.__groups.items()}
+
+    def __stats(self, stats):
+        """
+        Returns the statistics dictionary of the internal record stats
+        """
+        if stats is None:
+            stats = [0, 0, 0, {}, None, None]
+        found = {"count": stats[0]}
+        if self.attr is not None:
+            found["min"] = stats[4]
+            found["max"] = stats[5]
+            found["avg"] = stats[1] / stats[2] if stats[2] else None
+        return found
+
+    def __refresh(self):
+        """
+        Counts again the instances that changed
+        """
+        for key, obj in self.__stale.items():
+            self.__leave(key)
+            self.__join(key, obj)
+        self.__stale.clear()
+
+    def __join(self, key, obj):
+        """
+        Counts obj under key
+        """
+        group = getattr(obj, self.group, None)
+        try:
+            hash(group)
+        except TypeError:
+            group = None
+        value = None
+        if self.attr is not None:
+            value = getattr(obj, self.attr, None)
+            if not is_number(value):
+                value = None
+        self.__members[key] = (group, value)
+        # [count, sum, count of numbers, {number: count}, min, max]
+        stats = self.__groups.get(group)
+        if stats is None:
+            stats = self.__groups[group] = [0, 0, 0, {}, None, None]
+        stats[0] += 1
+        if value is None:
+            return
+        stats[1] += value
+        stats[2] += 1
+        stats[3][value] = stats[3].get(value, 0) + 1
+        if stats[4] is None or value < stats[4]:
+            stats[4] = value
+        if stats[5] is None or value > stats[5]:
+            stats[5] = value
+
+    def __leave(self, key):
+        """
+        Stops counting the instance counted under key
+        """
+        member = self.__members.pop(key, None)
+        if member is None:
+            return
+        group, value = member
+        stats = self.__groups[group]
+        stats[0] -= 1
+        if not stats[0]:
+            del self.__groups[group]
+            return
+        if value is None:
+            return
+        stats[1] -= value
+        stats[2] -= 1
+        if not stats[2]:
+            stats[1] = 0
+        values = stats[3]
+        values[value] -= 1
+        if values[value]:
+            return
+        del values[value]
+        if value == stats[4]:
+            stats[4] = min(values, default=None)
+        if value == stats[5]:
+            stats[5] = max(values, default=None)
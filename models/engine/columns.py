@@ -0,0 +1,305 @@
+#!/usr/bin/python3
+"""
+This module contains the columnar tables of the storage engines, which
+hold the declared attributes of every instance of one class as columns,
+so that filters and aggregates over the whole class don't look at the
+instances one at a time.
+
+Numeric attributes, like the price_by_night or latitude of Place, are
+packed in arrays of numbers, and text attributes, like the city_id of
+Place, in arrays of codes into a table of their distinct strings. When
+numpy is installed the columns are numpy arrays and conditions and
+statistics are computed on whole arrays at once; otherwise they are
+stdlib arrays scanned by builtins written in C (map, compress, min...).
+
+The rows of a table are the instances themselves, so the instances a
+filter returns are the ones of the storage, with their usual methods.
+Values that don't fit their column, like a price_by_night set to a
+string, are left out of it and checked on their instance.
+"""
+from array import array
+from itertools import compress
+from itertools import repeat
+from operator import eq
+from models.compact import declared_attributes
+from models.engine.aggregates import Aggregate
+from models.engine.indexes import is_number
+from models.engine.query import compare
+from models.engine.query import OPERATORS
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_int64 = (-2 ** 63, 2 ** 63 - 1)
+
+
+class Numbers:
+    """
+    This class holds the numeric values of one attribute for every row
+    """
+
+    def __init__(self, values):
+        """
+        This method instantiates the column of the list values, leaving
+        out the values that aren't numbers
+        """
+        valid = [is_number(value) and
+                 (type(value) is float or
+                  _int64[0] <= value <= _int64[1]) for value in values]
+        self.others = [i for i, ok in enumerate(valid) if not ok]
+        numbers = [value if ok else 0 for value, ok in zip(values, valid)]
+        self.integral = float not in set(map(type, compress(values,
+                                                            valid)))
+        kind = "q" if self.integral else "d"
+        if numpy is not None:
+            self.values = numpy.array(numbers, dtype=kind)
+            self.valid = numpy.array(valid, dtype=bool)
+        else:
+            self.values = array(kind, numbers)
+            self.valid = bytearray(valid)
+
+    def test(self, op, value):
+        """
+        Returns the mask of the rows whose value fulfills the condition
+        op value, or None if it can't be tested on the column
+        """
+        if not is_number(value):
+            return None
+        if numpy is not None:
+            return OPERATORS[op](self.values, value) & self.valid
+        return _and(bytearray(map(OPERATORS[op], self.values,
+                                  repeat(value))), self.valid)
+
+
+class Strings:
+    """
+    This class holds the string values of one attribute for every row,
+    as codes into the table of the distinct strings
+    """
+
+    def __init__(self, values):
+        """
+        This method instantiates the column of the list values, leaving
+        out the values that aren't strings
+        """
+        self.lookup = {}
+        codes = [self.lookup.setdefault(value, len(self.lookup))
+                 if type(value) is str else -1 for value in values]
+        self.strings = list(self.lookup)
+        self.others = [i for i, code in enumerate(codes) if code < 0]
+        if numpy is not None:
+            self.codes = numpy.array(codes, dtype="q")
+        else:
+            self.codes = array("q", codes)
+
+    def test(self, op, value):
+        """
+        Returns the mask of the rows whose value fulfills the condition
+        op value, or None if it can't be tested on the column
+        """
+        if type(value) is not str:
+            return None
+        if op == "==":
+            code = self.lookup.get(value, -2)
+            if numpy is not None:
+                return self.codes == code
+            return bytearray(map(eq, self.codes, repeat(code)))
+        # the last hit is the one of the code -1 of the other values
+        hits = [OPERATORS[op](string, value) for string in self.strings]
+        hits.append(False)
+        if numpy is not None:
+            return numpy.array(hits)[self.codes]
+        return bytearray(map(bytes(hits).__getitem__, self.codes))
+
+
+class Table:
+    """
+    This class holds the declared numeric and string attributes of the
+    instances of one class as columns
+    """
+
+    def __init__(self, cls, objects):
+        """
+        This method instantiates the table of the instances objects of
+        the model class cls
+        """
+        self.objects = list(objects)
+        self.columns = {}
+        attrs = {"id": ""}
+        if cls is not None:
+            attrs.update(declared_attributes(cls))
+        for attr, default in attrs.items():
+            if type(default) in (int, float):
+                column = Numbers
+            elif type(default) is str:
+                column = Strings
+            else:
+                continue
+            self.columns[attr] = column([getattr(obj, attr, None)
+                                         for obj in self.objects])
+
+    def __len__(self):
+        """
+        Returns the number of rows of the table
+        """
+        return len(self.objects)
+
+    def __getitem__(self, row):
+        """
+        Returns the instance of the row
+        """
+        return self.objects[row]
+
+    def select(self, conditions):
+        """
+        Returns the list of instances fulfilling every (attribute,
+        operator, value) condition
+        """
+        objects = self.objects
+        return [objects[row] for row in _rows(self.__mask(conditions))]
+
+    def count(self, conditions=()):
+        """
+        Returns the number of instances fulfilling every condition
+        """
+        return _count(self.__mask(conditions))
+
+    def stats(self, attr, conditions=()):
+        """
+        Returns the statistics of the instances fulfilling every
+        condition: their count, and the min, max and avg of their
+        numeric values of attr
+        """
+        mask = self.__mask(conditions)
+        size, total, bounds = 0, 0, []
+        column = self.columns.get(attr)
+        if type(column) is Numbers:
+            selected = _and(mask, column.valid)
+            if numpy is not None:
+                numbers = column.values[selected]
+                if numbers.size:
+                    bounds = [numbers.min().item(), numbers.max().item()]
+                size, total = int(numbers.size), numbers.sum().item()
+            else:
+                numbers = list(compress(column.values, selected))
+                bounds = [min(numbers), max(numbers)] if numbers else []
+                size, total = len(numbers), sum(numbers)
+            rows = [row for row in column.others if mask[row]]
+        else:
+            rows = _rows(mask)
+        for row in rows:
+            value = getattr(self.objects[row], attr, None)
+            if is_number(value):
+                size += 1
+                total += value
+                bounds.append(value)
+        return {"count": _count(mask), "min": min(bounds, default=None),
+                "max": max(bounds, default=None),
+                "avg": total / size if size else None}
+
+    def groups(self, group, attr=None, conditions=()):
+        """
+        Returns a dictionary of the statistics of the instances
+        fulfilling every condition, grouped by their attribute group,
+        as Aggregate.groups() does
+        """
+        mask = self.__mask(conditions)
+        keys = self.columns.get(group)
+        values = self.columns.get(attr)
+        if (numpy is None or type(keys) is not Strings or
+                (attr is not None and type(values) is not Numbers) or
+                any(mask[row] for row in keys.others) or
+                (attr is not None and any(mask[row]
+                                          for row in values.others))):
+            aggregate = Aggregate(group, attr)
+            for row in _rows(mask):
+                aggregate.add(row, self.objects[row])
+            found = aggregate.groups()
+            if attr is None:
+                found = {key: {"count": stats["count"]}
+                         for key, stats in found.items()}
+            return found
+        size = len(keys.strings)
+        codes = keys.codes[mask]
+        counts = numpy.bincount(codes, minlength=size)
+        if attr is None:
+            return {keys.strings[code]: {"count": int(counts[code])}
+                    for code in numpy.flatnonzero(counts).tolist()}
+        selected = mask & values.valid
+        codes = keys.codes[selected]
+        numbers = values.values[selected]
+        sizes = numpy.bincount(codes, minlength=size)
+        sums = numpy.bincount(codes, weights=numbers, minlength=size)
+        bounds = _int64 if values.integral else (-numpy.inf, numpy.inf)
+        low = numpy.full(size, bounds[1], dtype=numbers.dtype)
+        high = numpy.full(size, bounds[0], dtype=numbers.dtype)
+        numpy.minimum.at(low, codes, numbers)
+        numpy.maximum.at(high, codes, numbers)
+        counts, sizes = counts.tolist(), sizes.tolist()
+        sums, low, high = sums.tolist(), low.tolist(), high.tolist()
+        found = {}
+        for code, string in enumerate(keys.strings):
+            if not counts[code]:
+                continue
+            stats = {"count": counts[code], "min": None, "max": None,
+                     "avg": None}
+            if sizes[code]:
+                stats["min"] = low[code]
+                stats["max"] = high[code]
+                stats["avg"] = sums[code] / sizes[code]
+            found[string] = stats
+        return found
+
+    def __mask(self, conditions):
+        """
+        Returns the mask of the rows fulfilling every (attribute,
+        operator, value) condition
+        """
+        size = len(self.objects)
+        if numpy is not None:
+            mask = numpy.ones(size, dtype=bool)
+        else:
+            mask = bytearray(b"\x01") * size
+        for attr, op, value in conditions:
+            column = self.columns.get(attr)
+            tested = None if column is None else column.test(op, value)
+            if tested is None:
+                rows = _rows(mask)
+            else:
+                rows = [row for row in column.others if mask[row]]
+                mask = _and(mask, tested)
+            for row in rows:
+                mask[row] = compare(getattr(self.objects[row], attr, None),
+                                    op, value)
+        return mask
+
+
+def _and(left, right):
+    """
+    Returns the mask of the rows set in both masks left and right
+    """
+    if numpy is not None:
+        return left & right
+    size = len(left)
+    return bytearray((int.from_bytes(left, "little") &
+                      int.from_bytes(right, "little")).to_bytes(size,
+                                                                "little"))
+
+
+def _count(mask):
+    """
+    Returns the number of rows set in mask
+    """
+    if numpy is not None:
+        return int(mask.sum())
+    return mask.count(1)
+
+
+def _rows(mask):
+    """
+    Returns the list of the rows set in mask
+    """
+    if numpy is not None:
+        return numpy.flatnonzero(mask).tolist()
+    return list(compress(range(len(mask)), mask))
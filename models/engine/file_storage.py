@@ -1,12 +1,108 @@
 #!/usr/bin/python3
 """
 This module implements the storage funcitonality of the AirBnB project.
+
+By default every save rewrites the whole JSON file. When journaling is
+enabled (HBNB_JOURNAL=1) a save only appends the objects created, updated
+or deleted since the previous save to an append-only journal, and the
+full JSON file (the snapshot) is rewritten only when the journal grows
+past a threshold. Reloading reads the snapshot and replays the journal
+on top of it.
+
+Instances report attribute writes through touch(), so the storage knows
+which keys are dirty. The JSON text of every object is cached and only
+the dirty ones are serialized again on save. The cache only holds the
+text of objects inside __objects, so a save writes it as is.
+
+Objects are also indexed by class name, so listing or counting the
+instances of one class doesn't scan the whole storage, and by the
+foreign keys declared in StorageEngine.foreign_keys, so find(),
+find_in() and select() only look at the matching instances. The numeric
+attributes of StorageEngine.range_keys have sorted indexes, which answer
+range conditions and read instances in order for the top-k queries. The
+coordinates of StorageEngine.spatial_keys have a grid index, which
+near() uses to only compute the distances to nearby instances. The words
+of the attributes of StorageEngine.text_keys have an inverted index,
+which search() uses to rank the instances matching words. Once it has
+been searched, the index is saved beside the JSON file, and a reload
+reuses the words of the instances whose text hasn't changed. The list
+attributes of StorageEngine.member_keys, like the amenity_ids of Place,
+have bitmap indexes, which having() combines to find the instances
+holding a combination of values.
+
+The aggregates of StorageEngine.aggregate_keys, like the number of
+Places of each City with the min, max and avg of their price_by_night,
+are kept up to date as instances are added, changed and deleted, so
+aggregate() and group_stats() don't look at the instances.
+
+The columnar Table returned by columns() is kept until an instance of
+its class is added, changed or deleted, so the filters and aggregates
+run on it don't build the columns again.
+
+The JSON file is read incrementally, one object at a time, so reloading
+doesn't need to hold the whole parsed file in memory. With lazy reload
+enabled (HBNB_LAZY_RELOAD=1) the records are only kept as dictionaries
+and the instances are built on first access: get() builds a single one,
+all(cls) and find(cls) the ones of a class, and all() every one, while
+iterate() builds them one at a time without keeping them.
+
+Dates are saved as ISO 8601 strings, or as integer microseconds since
+the epoch with HBNB_DATETIME_CODEC=epoch, which makes the file shorter.
+Files saved with either codec can be reloaded.
+
+The file is file.json by default, or the one given by HBNB_FILE_PATH.
+When its name ends with .hbnb it is saved in the binary snapshot format
+of models.engine.snapshot instead of JSON, which is smaller and faster
+to reload. The records of the objects are cached like their JSON text.
+The journal and the text indexes stay JSON.
+
+With HBNB_COMPACT_MODELS=1, reloaded instances are built from the
+compact classes of models.compact, which use far less memory per
+instance than the model classes.
+
+The JSON file is written to a temporary file renamed over it, so a
+crash never leaves it truncated. HBNB_DURABILITY chooses what is
+flushed to the disk before a save returns: nothing ("none", the
+default), the written file ("file"), or the file and its directory
+entry ("dir"); it is checked by reload().
+
+With HBNB_ASYNC_SAVE=1, save() only serializes the changed objects and
+hands the writing of the file to a background thread, which coalesces
+the saves piling up while it writes. flush() waits until everything
+saved is written.
 """
-from json import dump
-from json import load
+from json import dumps
+from json import loads
+from itertools import dropwhile
+from itertools import islice
+from os import close
+from os import fsync
+from os import getenv
+from os import O_RDONLY
+from os import open as os_open
+from os import remove
+from os import replace
+from os.path import dirname
 from os.path import exists
-import sys
-from models.base_model import BaseModel
+from threading import Condition
+from threading import Thread
+from models.engine.aggregates import Aggregate
+from models.engine.columns import Table
+from models.engine.indexes import BitmapIndex
+from models.engine.indexes import GridIndex
+from models.engine.indexes import HashIndex
+from models.engine.indexes import SortedIndex
+from models.engine.indexes import TextIndex
+from models.engine.storage_engine import StorageEngine
+from models.engine.json_stream import iter_items
+from models.engine.snapshot import DATES
+from models.engine.snapshot import is_binary
+from models.engine.snapshot import read_snapshot
+from models.engine.snapshot import write_snapshot
+from models.engine.query import matches
+from models.compact import compact
+from models.base_model import epoch_micros
+from models.base_model import registry
 from models.user import User
 from models.amenity import Amenity
 from models.city import City
@@ -15,48 +111,787 @@ from models.review import Review
 from models.state import State
 
 
-class FileStorage:
+class FileStorage(StorageEngine):
     """
     This class serializes instances to a JSON file and
     deserializes JSON file to instances
     """
 
-    __file_path = "file.json"
+    __file_path = getenv("HBNB_FILE_PATH", "file.json")
+    __journal_path = __file_path + ".journal"
+    __text_path = __file_path + ".text"
+    __journal = getenv("HBNB_JOURNAL", "0") == "1"
+    __compact_after = int(getenv("HBNB_JOURNAL_COMPACT", "1000"))
+    __lazy = getenv("HBNB_LAZY_RELOAD", "0") == "1"
+    __datetime_codec = getenv("HBNB_DATETIME_CODEC", "iso")
+    __compact = getenv("HBNB_COMPACT_MODELS", "0") == "1"
+    __durability = getenv("HBNB_DURABILITY", "none")
+    __async = getenv("HBNB_ASYNC_SAVE", "0") == "1"
+    __journal_size = 0
     __objects = {}
+    __raw = {}
+    __pending = {}
+    __fragments = {}
+    __dicts = {}
+    __classes = {}
+    __indexes = {}
+    __aggregates = {}
+    __tables = {}
+    __indexed = None
+    __text_versions = {}
+    __jobs = []
+    __writer = None
+    __written = Condition()
+    __error = None
+
+    def all(self, cls=None):
+        """
+        Returns the dictionary __objects, or a dictionary of the
+        instances of cls (a class or a class name) only
+        """
+        self.__sync()
+        if cls is None:
+            self.__materialize()
+            return FileStorage.__objects
+        name = self.__name(cls)
+        self.__materialize(name)
+        return dict(FileStorage.__classes.get(name, {}))
+
+    def iterate(self, cls=None, after=None):
+        """
+        Yields the instances of cls, or all instances, one at a time,
+        starting after the one stored under the key after if given.
+        Those still kept as records are built but not kept, except when
+        after is given: as built instances go behind the others, they
+        are all built so that the order stays the same from then on.
+        The storage must not change while they are yielded.
+        Raises KeyError if there's no instance under after.
+        """
+        self.__sync()
+        name = None if cls is None else self.__name(cls)
+        if after is not None:
+            self.__materialize(name)
+        if cls is None:
+            objects = FileStorage.__objects
+            raws = list(FileStorage.__raw.values())
+        else:
+            objects = FileStorage.__classes.get(name, {})
+            raws = [FileStorage.__raw.get(name, {})]
+        if after is None:
+            yield from objects.values()
+        elif after not in objects:
+            raise KeyError(after)
+        else:
+            # the keys before after are still walked, but in C, without
+            # copying the dictionary or looking at their instances
+            keys = dropwhile(after.__ne__, objects)
+            next(keys)
+            for key in keys:
+                yield objects[key]
+        for records in raws:
+            for record in records.values():
+                yield self.__build(dict(record))
 
-    def all(self):
+    def count(self, cls=None):
         """
-        Returns the dictionary __objects
+        Returns the number of instances of cls, or of all instances
         """
-        return FileStorage.__objects
+        self.__sync()
+        if cls is None:
+            return len(FileStorage.__objects) + sum(
+                    len(records) for records in FileStorage.__raw.values())
+        name = self.__name(cls)
+        return (len(FileStorage.__classes.get(name, {})) +
+                len(FileStorage.__raw.get(name, {})))
+
+    def get(self, cls, id):
+        """
+        Returns the instance of cls with the given id, or None
+        """
+        self.__sync()
+        name = self.__name(cls)
+        key = name + "." + str(id)
+        obj = FileStorage.__objects.get(key)
+        if obj is None and key in FileStorage.__raw.get(name, {}):
+            obj = self.__build(FileStorage.__raw[name].pop(key))
+            self.__add(key, obj)
+        return obj
 
     def new(self, obj):
         """
         Sets in __objects the obj with key
         """
+        self.__sync()
         name = type(obj).__name__
         key = name + "." + obj.id
-        FileStorage.__objects[key] = obj
+        FileStorage.__raw.get(name, {}).pop(key, None)
+        self.__add(key, obj)
+        FileStorage.__pending[key] = obj
+
+    def touch(self, obj, name=None, value=None):
+        """
+        Marks obj as changed if it's inside __objects. When name is
+        given, the attribute name of obj is about to be set to value.
+        """
+        key = type(obj).__name__ + "." + str(getattr(obj, "id", None))
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        FileStorage.__pending[key] = obj
+        FileStorage.__tables.pop(type(obj).__name__, None)
+        indexes = FileStorage.__indexes.get(type(obj).__name__, {})
+        if name is None:
+            for index in indexes.values():
+                index.add(key, obj)
+        elif name in indexes:
+            indexes[name].update(key, obj, value)
+        for aggregate in FileStorage.__aggregates.get(type(obj).__name__, ()):
+            if name is None or name in aggregate.attrs:
+                aggregate.update(key, obj, value)
+
+    def find(self, cls, **kwargs):
+        """
+        Returns the list of instances of cls whose attributes have the
+        values given in kwargs
+        """
+        return self.select(cls, [(attr, "==", value)
+                                 for attr, value in kwargs.items()])
+
+    def find_in(self, cls, attr, values):
+        """
+        Returns a dictionary mapping each of values to the list of
+        instances of cls whose attribute attr holds it, leaving out the
+        values no instance holds, looking each value up in the id or
+        foreign key index of attr
+        """
+        self.__sync()
+        name = self.__name(cls)
+        index = FileStorage.__indexes.get(name, {}).get(attr)
+        if attr != "id" and type(index) is not HashIndex:
+            return super().find_in(cls, attr, values)
+        if attr != "id":
+            self.__materialize(name)
+        found = {}
+        for value in values:
+            if attr == "id":
+                obj = self.get(name, value)
+                instances = [] if obj is None else [obj]
+            else:
+                instances = list(index.get(value).values())
+            if instances:
+                found[value] = instances
+        return found
+
+    def select(self, cls, conditions, order=None, limit=None):
+        """
+        Returns the list of instances of cls fulfilling every (attribute,
+        operator, value) condition, only looking at the keys of the index
+        that narrows the conditions down to the fewest instances. When an
+        (attribute, descending) order and a limit are given and the
+        attribute has a sorted index, the instances may instead be read
+        in order from it until limit of them match.
+        """
+        self.__sync()
+        name = self.__name(cls)
+        self.__materialize(name)
+        indexes = FileStorage.__indexes.get(name, {})
+        everything = FileStorage.__classes.get(name, {})
+        keys, best = None, len(everything)
+        for index in indexes.values():
+            scanned = index.scan(conditions)
+            if scanned is not None and scanned[0] < best:
+                best, keys = scanned
+        if order is not None and limit is not None:
+            index = indexes.get(order[0])
+            scanned = None
+            if type(index) is SortedIndex:
+                scanned = index.scan(conditions, order[1])
+            # reading in order stops after about limit * len(everything)
+            # / best instances when the conditions are independent
+            if scanned is not None and (scanned[0] <= best or
+                                        limit * len(everything) <= best ** 2):
+                ordered = (everything[key] for key in scanned[1])
+                return list(islice((obj for obj in ordered
+                                    if matches(obj, conditions)), limit))
+        if keys is None:
+            found = everything.values()
+        else:
+            found = (everything[key] for key in keys)
+        return [obj for obj in found if matches(obj, conditions)]
+
+    def near(self, cls, latitude, longitude, radius):
+        """
+        Returns the list of (instance, distance) pairs of the instances
+        of cls within radius km of the point (latitude, longitude),
+        nearest first, looking at the nearby cells of its grid index
+        """
+        self.__sync()
+        name = self.__name(cls)
+        if name not in FileStorage.spatial_keys:
+            return super().near(cls, latitude, longitude, radius)
+        self.__materialize(name)
+        index = FileStorage.__indexes[name][FileStorage.spatial_keys[name][0]]
+        return index.near(latitude, longitude, radius)
+
+    def search(self, cls, text, limit=None):
+        """
+        Returns the list of (instance, score) pairs of the instances of
+        cls whose text attributes use words of text, best first, cut to
+        limit pairs if given, looking them up in its inverted index
+        """
+        self.__sync()
+        name = self.__name(cls)
+        if name not in FileStorage.text_keys:
+            return super().search(cls, text, limit)
+        self.__materialize(name)
+        index = FileStorage.__indexes[name][FileStorage.text_keys[name][0]]
+        everything = FileStorage.__classes.get(name, {})
+        return [(everything[key], score)
+                for key, score in index.search(text, limit)]
+
+    def having(self, cls, attr, tree):
+        """
+        Returns the list of instances of cls whose list attribute attr
+        holds values fulfilling the expression tree returned by
+        models.engine.query.parse_members, combining the bitmaps of its
+        index
+        """
+        self.__sync()
+        name = self.__name(cls)
+        index = FileStorage.__indexes.get(name, {}).get(attr)
+        if type(index) is not BitmapIndex:
+            return super().having(cls, attr, tree)
+        self.__materialize(name)
+        return index.having(tree, objects=True)
+
+    def aggregate(self, cls, group, attr=None):
+        """
+        Returns a dictionary of the statistics of the instances of cls
+        grouped by their attribute group: for each value of group, the
+        number of instances and, when attr is given, the min, max and
+        avg of their numeric values of attr
+        """
+        aggregate = self.__find_aggregate(cls, group, attr)
+        if aggregate is None:
+            return super().aggregate(cls, group, attr)
+        if attr is None:
+            return {value: {"count": stats["count"]}
+                    for value, stats in aggregate.groups().items()}
+        return aggregate.groups()
+
+    def group_stats(self, cls, group, value, attr=None):
+        """
+        Returns the statistics of the instances of cls whose attribute
+        group is value, as aggregate() does for each group, reading them
+        from the aggregate kept up to date
+        """
+        aggregate = self.__find_aggregate(cls, group, attr)
+        if aggregate is None:
+            return super().group_stats(cls, group, value, attr)
+        if attr is None:
+            return {"count": aggregate.get(value)["count"]}
+        return aggregate.get(value)
+
+    def __find_aggregate(self, cls, group, attr):
+        """
+        Returns the aggregate of cls grouped by group with the values of
+        attr, any aggregate grouped by group if attr is None, or None
+        """
+        self.__sync()
+        name = self.__name(cls)
+        for aggregate in FileStorage.__aggregates.get(name, ()):
+            if aggregate.group == group and attr in (None, aggregate.attr):
+                self.__materialize(name)
+                return aggregate
+        return None
+
+    def columns(self, cls):
+        """
+        Returns a Table holding the declared attributes of the instances
+        of cls as columns, its rows being the instances, built again
+        only when an instance of cls changed since the last one
+        """
+        self.__sync()
+        name = self.__name(cls)
+        self.__materialize(name)
+        table = FileStorage.__tables.get(name)
+        if table is None:
+            table = Table(registry.get(name),
+                          FileStorage.__classes.get(name, {}).values())
+            FileStorage.__tables[name] = table
+        return table
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from __objects if it's inside
+        """
+        if obj is None:
+            return
+        self.__sync()
+        key = type(obj).__name__ + "." + obj.id
+        if key in FileStorage.__objects:
+            self.__discard(key)
+            FileStorage.__pending[key] = None
 
     def save(self):
         """
-        Serializes __objects to the JSON file
+        Serializes __objects to the JSON file, or appends the pending
+        changes to the journal when journaling is enabled
+        """
+        if self.defer_save():
+            return
+        if (not FileStorage.__journal or
+                not exists(FileStorage.__file_path) or
+                FileStorage.__journal_size + len(FileStorage.__pending) >
+                FileStorage.__compact_after):
+            self.compact()
+        else:
+            self.__append()
+
+    def compact(self):
+        """
+        Rewrites the JSON file from __objects and discards the journal
+        """
+        self.__sync()
+        if is_binary(FileStorage.__file_path):
+            # the entries only go to a journal, and none is written when
+            # journaling is disabled
+            entries = []
+            if FileStorage.__journal or exists(FileStorage.__journal_path):
+                entries = self.__entries()
+            items = self.__records()
+        else:
+            entries = self.__entries()
+            items = self.__texts()
+        self.__submit(entries, items, self.__text_state())
+        FileStorage.__journal_size = 0
+        FileStorage.__pending.clear()
+
+    def __texts(self):
+        """
+        Returns the (key, JSON text) pairs of the instances and records
+        of the storage, for the JSON file
+        """
+        # __entries() serialized the pending instances again already
+        fragments = FileStorage.__fragments
+        items = []
+        for key, obj in FileStorage.__objects.items():
+            cached = fragments.get(key)
+            if cached is None or cached[0] is not obj:
+                items.append((key, self.__serialize(key, obj)))
+            else:
+                items.append((key, cached[1]))
+        for records in FileStorage.__raw.values():
+            items.extend((key, dumps(record))
+                         for key, record in records.items())
+        return items
+
+    def __records(self):
+        """
+        Returns the (key, record) pairs of the instances and records of
+        the storage, for the binary snapshot, reusing the cached record
+        of the instances that haven't changed since the last one
+        """
+        items = []
+        dicts = FileStorage.__dicts
+        for key, obj in FileStorage.__objects.items():
+            cached = dicts.get(key)
+            if (cached is None or cached[0] is not obj or
+                    key in FileStorage.__pending):
+                record = obj.to_dict()
+                for attr in DATES:
+                    record[attr] = epoch_micros(getattr(obj, attr))
+                cached = dicts[key] = (obj, record)
+            items.append((key, cached[1]))
+        for records in FileStorage.__raw.values():
+            items.extend((key, dict(record))
+                         for key, record in records.items())
+        return items
+
+    def flush(self):
+        """
+        Waits until the saves written in the background are done, and
+        raises the error of the first one that failed
+        """
+        with FileStorage.__written:
+            while FileStorage.__writer is not None:
+                FileStorage.__written.wait()
+            error = FileStorage.__error
+            FileStorage.__error = None
+        if error is not None:
+            raise error
+
+    def __append(self):
+        """
+        Appends the pending changes to the journal
+        """
+        entries = self.__entries()
+        self.__submit(entries)
+        FileStorage.__journal_size += len(entries)
+        FileStorage.__pending.clear()
+
+    def __text_state(self):
+        """
+        Returns the JSON text of the states of the text indexes that have
+        been searched, or None if none changed since the last one saved
+        """
+        versions, states = {}, {}
+        for name, attrs in FileStorage.text_keys.items():
+            index = FileStorage.__indexes.get(name, {}).get(attrs[0])
+            if index is not None and index.built:
+                versions[name] = index.version
+                states[name] = index.state()
+        if not states or versions == FileStorage.__text_versions:
+            return None
+        FileStorage.__text_versions = versions
+        return dumps(states)
+
+    def __entries(self):
+        """
+        Returns the pending changes as (key, JSON text) pairs, the text
+        being null for a deleted instance
+        """
+        return [(key, "null" if obj is None else self.__serialize(key, obj))
+                for key, obj in FileStorage.__pending.items()]
+
+    def __submit(self, entries, items=None, text=None):
+        """
+        Writes the journal entries, and the JSON file made of items and
+        the text indexes if given, now or in the background when saving
+        asynchronously
+        """
+        if not FileStorage.__async:
+            self.__write(entries, items, text)
+            return
+        with FileStorage.__written:
+            FileStorage.__jobs.append((entries, items, text))
+            if FileStorage.__writer is None:
+                FileStorage.__writer = Thread(target=self.__run,
+                                              name="FileStorage writer")
+                FileStorage.__writer.start()
+
+    def __run(self):
+        """
+        Writes the submitted saves until there's none left
         """
-        dict_object = {
-                obj: FileStorage.__objects[obj].
-                to_dict() for obj in FileStorage.__objects.keys()
-                }
-        with open(FileStorage.__file_path, "w", encoding="utf8") as fs:
-            dump(dict_object, fs)
+        while True:
+            with FileStorage.__written:
+                jobs = FileStorage.__jobs
+                FileStorage.__jobs = []
+                if not jobs:
+                    FileStorage.__writer = None
+                    FileStorage.__written.notify_all()
+                    return
+            for entries, items, text in self.__coalesce(jobs):
+                try:
+                    self.__write(entries, items, text)
+                except Exception as error:
+                    if FileStorage.__error is None:
+                        FileStorage.__error = error
+
+    @staticmethod
+    def __coalesce(jobs):
+        """
+        Returns the saves to write in place of jobs: only the last JSON
+        file and text indexes are written, with the journal entries of
+        all the saves before it, followed by the journal entries of the
+        saves after it
+        """
+        last = max((i for i, job in enumerate(jobs) if job[1] is not None),
+                   default=-1)
+        merged = []
+        if last >= 0:
+            text = next((job[2] for job in reversed(jobs[:last + 1])
+                         if job[2] is not None), None)
+            merged.append(([entry for job in jobs[:last + 1]
+                            for entry in job[0]], jobs[last][1], text))
+        if last + 1 < len(jobs):
+            merged.append(([entry for job in jobs[last + 1:]
+                            for entry in job[0]], None, None))
+        return merged
+
+    def __write(self, entries, items=None, text=None):
+        """
+        Appends entries to the journal, or writes items to the JSON file
+        or binary snapshot, discards the journal and writes text to the
+        text index file
+        """
+        if items is None:
+            self.__write_journal(entries)
+            return
+        # the journal gets every change written to the new JSON file, so
+        # replaying it after a crash that left it behind is harmless
+        if exists(FileStorage.__journal_path):
+            self.__write_journal(entries)
+        tmp_path = FileStorage.__file_path + ".tmp"
+        try:
+            if is_binary(FileStorage.__file_path):
+                with open(tmp_path, "wb") as fs:
+                    write_snapshot(fs, items)
+                    self.__flush(fs)
+            else:
+                with open(tmp_path, "w", encoding="utf8") as fs:
+                    sep = "{"
+                    for key, fragment in items:
+                        fs.write(sep + dumps(key) + ": " + fragment)
+                        sep = ", "
+                    fs.write("{}" if sep == "{" else "}")
+                    self.__flush(fs)
+        except BaseException:
+            if exists(tmp_path):
+                remove(tmp_path)
+            raise
+        replace(tmp_path, FileStorage.__file_path)
+        self.__flush_dir(FileStorage.__file_path)
+        if exists(FileStorage.__journal_path):
+            remove(FileStorage.__journal_path)
+        if text is not None:
+            with open(FileStorage.__text_path + ".tmp", "w",
+                      encoding="utf8") as fs:
+                fs.write(text)
+                self.__flush(fs)
+            replace(FileStorage.__text_path + ".tmp", FileStorage.__text_path)
+
+    def __write_journal(self, entries):
+        """
+        Appends entries to the journal
+        """
+        created = not exists(FileStorage.__journal_path)
+        with open(FileStorage.__journal_path, "a", encoding="utf8") as fs:
+            for key, text in entries:
+                fs.write('{"key": ' + dumps(key) + ', "obj": ' + text + '}\n')
+            self.__flush(fs)
+        if created:
+            self.__flush_dir(FileStorage.__journal_path)
+
+    @staticmethod
+    def __flush(fs):
+        """
+        Flushes the file fs to the disk when durability asks for it
+        """
+        if FileStorage.__durability != "none":
+            fs.flush()
+            fsync(fs.fileno())
+
+    @staticmethod
+    def __flush_dir(path):
+        """
+        Flushes the directory holding path to the disk when durability
+        asks for it, making a file creation or rename durable
+        """
+        if FileStorage.__durability != "dir":
+            return
+        fd = os_open(dirname(path) or ".", O_RDONLY)
+        try:
+            fsync(fd)
+        finally:
+            close(fd)
 
     def reload(self):
         """
-        Deserializes the JSON file to __objects
+        Deserializes the JSON file or binary snapshot to __objects.
+        Raises ValueError if the durability is unknown.
+        """
+        if FileStorage.__durability not in ("none", "file", "dir"):
+            raise ValueError("Unknown durability: {}".format(
+                FileStorage.__durability))
+        self.flush()
+        self.__sync()
+        self.__restore()
+        if exists(FileStorage.__file_path) and is_binary(
+                FileStorage.__file_path):
+            with open(FileStorage.__file_path, "rb") as fs:
+                for key, record in read_snapshot(fs):
+                    self.__load(key, record)
+        elif exists(FileStorage.__file_path):
+            with open(FileStorage.__file_path, encoding="utf8") as fs:
+                for key, record in iter_items(fs):
+                    self.__load(key, record)
+        if exists(FileStorage.__journal_path):
+            self.__replay()
+        FileStorage.__pending.clear()
+
+    def __restore(self):
+        """
+        Hands the states saved in the text index file to the text indexes
+        """
+        if not exists(FileStorage.__text_path):
+            return
+        try:
+            with open(FileStorage.__text_path, encoding="utf8") as fs:
+                states = loads(fs.read())
+        except ValueError:
+            return
+        for name, state in states.items():
+            if name in FileStorage.text_keys:
+                attr = FileStorage.text_keys[name][0]
+                FileStorage.__indexes[name][attr].restore(state)
+
+    def __replay(self):
+        """
+        Applies the records of the journal on top of __objects
+        """
+        FileStorage.__journal_size = 0
+        with open(FileStorage.__journal_path, encoding="utf8") as fs:
+            for line in fs:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    break
+                FileStorage.__journal_size += 1
+                if record["obj"] is None:
+                    self.__discard(record["key"])
+                else:
+                    self.__load(record["key"], record["obj"])
+
+    def __load(self, key, record):
+        """
+        Puts the record of an instance read from the JSON file or the
+        journal in the storage, as is when reloading lazily
+        """
+        if not FileStorage.__lazy:
+            self.__add(key, self.__build(record))
+            return
+        self.__discard(key)
+        name = record["__class__"]
+        FileStorage.__raw.setdefault(name, {})[key] = record
+
+    def __materialize(self, name=None):
+        """
+        Builds the instances of class name, or of all classes, that are
+        still kept as records
+        """
+        if not FileStorage.__raw:
+            return
+        names = list(FileStorage.__raw) if name is None else [name]
+        for name in names:
+            for key, record in FileStorage.__raw.pop(name, {}).items():
+                self.__add(key, self.__build(record))
+
+    @staticmethod
+    def __build(record):
+        """
+        Returns the instance described by a record of the JSON file
+        """
+        cls = registry[record.pop("__class__")]
+        if FileStorage.__compact:
+            cls = compact(cls)
+        return cls(**record)
+
+    def __add(self, key, obj):
+        """
+        Puts obj in __objects and in the indexes under key
+        """
+        name = type(obj).__name__
+        if FileStorage.__fragments.get(key, (obj,))[0] is not obj:
+            del FileStorage.__fragments[key]
+        FileStorage.__objects[key] = obj
+        FileStorage.__classes.setdefault(name, {})[key] = obj
+        FileStorage.__tables.pop(name, None)
+        for index in FileStorage.__indexes.get(name, {}).values():
+            index.add(key, obj)
+        for aggregate in FileStorage.__aggregates.get(name, ()):
+            aggregate.add(key, obj)
+
+    def __discard(self, key):
+        """
+        Removes the instance or record stored under key
+        """
+        name = key.split(".")[0]
+        FileStorage.__raw.get(name, {}).pop(key, None)
+        FileStorage.__objects.pop(key, None)
+        if FileStorage.__classes.get(name, {}).pop(key, None) is None:
+            return
+        FileStorage.__fragments.pop(key, None)
+        FileStorage.__dicts.pop(key, None)
+        FileStorage.__tables.pop(name, None)
+        for index in FileStorage.__indexes.get(name, {}).values():
+            index.remove(key)
+        for aggregate in FileStorage.__aggregates.get(name, ()):
+            aggregate.remove(key)
+
+    def __serialize(self, key, obj):
+        """
+        Returns the JSON text of obj, reusing the cached one when obj
+        hasn't changed since it was serialized
+        """
+        cached = FileStorage.__fragments.get(key)
+        if (cached is None or cached[0] is not obj or
+                key in FileStorage.__pending):
+            record = obj.to_dict()
+            if FileStorage.__datetime_codec == "epoch":
+                record["created_at"] = epoch_micros(obj.created_at)
+                record["updated_at"] = epoch_micros(obj.updated_at)
+            cached = (obj, dumps(record))
+            FileStorage.__fragments[key] = cached
+        return cached[1]
+
+    def __sync(self):
+        """
+        Rebuilds the indexes when __objects has been replaced, and
+        follows the keys deleted from it or added to it directly
+        """
+        if FileStorage.__indexed is FileStorage.__objects:
+            if len(FileStorage.__objects) != sum(
+                    map(len, FileStorage.__classes.values())):
+                self.__follow()
+            return
+        FileStorage.__indexed = FileStorage.__objects
+        FileStorage.__raw = {}
+        FileStorage.__pending = {}
+        FileStorage.__fragments = {}
+        FileStorage.__dicts = {}
+        FileStorage.__classes = {}
+        FileStorage.__tables = {}
+        FileStorage.__indexes = {}
+        for name, attrs in FileStorage.foreign_keys.items():
+            indexes = FileStorage.__indexes.setdefault(name, {})
+            indexes.update((attr, HashIndex(attr)) for attr in attrs)
+        for name, attrs in FileStorage.range_keys.items():
+            indexes = FileStorage.__indexes.setdefault(name, {})
+            indexes.update((attr, SortedIndex(attr)) for attr in attrs)
+        for name, attrs in FileStorage.spatial_keys.items():
+            grid = GridIndex(*attrs)
+            indexes = FileStorage.__indexes.setdefault(name, {})
+            indexes.update((attr, grid) for attr in attrs)
+        for name, attrs in FileStorage.text_keys.items():
+            text = TextIndex(*attrs)
+            indexes = FileStorage.__indexes.setdefault(name, {})
+            indexes.update((attr, text) for attr in attrs)
+        for name, attrs in FileStorage.member_keys.items():
+            indexes = FileStorage.__indexes.setdefault(name, {})
+            indexes.update((attr, BitmapIndex(attr)) for attr in attrs)
+        FileStorage.__aggregates = {
+                name: [Aggregate(group, attr) for group, attr in pairs]
+                for name, pairs in FileStorage.aggregate_keys.items()}
+        FileStorage.__text_versions = {}
+        for key, obj in FileStorage.__objects.items():
+            name = type(obj).__name__
+            FileStorage.__classes.setdefault(name, {})[key] = obj
+            for index in FileStorage.__indexes.get(name, {}).values():
+                index.add(key, obj)
+            for aggregate in FileStorage.__aggregates.get(name, ()):
+                aggregate.add(key, obj)
+
+    def __follow(self):
+        """
+        Drops from the class dictionaries, indexes and caches the keys
+        deleted from __objects, like del storage.all()[key] does, and
+        adds the instances put in it directly, as pending changes
+        """
+        objects = FileStorage.__objects
+        for name, instances in list(FileStorage.__classes.items()):
+            for key in [key for key in instances if key not in objects]:
+                self.__discard(key)
+                FileStorage.__pending[key] = None
+        for key, obj in list(objects.items()):
+            if key not in FileStorage.__classes.get(type(obj).__name__, {}):
+                FileStorage.__raw.get(type(obj).__name__, {}).pop(key, None)
+                self.__add(key, obj)
+                FileStorage.__pending[key] = obj
+
+    @staticmethod
+    def __name(cls):
+        """
+        Returns the class name of cls, which is a class or a class name
         """
-        if exists(FileStorage.__file_path):
-            with open(FileStorage.__file_path) as fs:
-                dict_object = load(fs)
-                for obj in dict_object.values():
-                    name = obj["__class__"]
-                    del obj["__class__"]
-                    self.new(eval(name)(**obj))
+        return cls if type(cls) is str else cls.__name__
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+This module contains the distance computations of the geospatial
+queries of the storage engines. Distances are great-circle distances in
+kilometers, computed with the haversine formula. When numpy is
+installed, the distances from a point to many candidates are computed
+at once on arrays; otherwise they are computed one at a time.
+"""
+from math import asin
+from math import cos
+from math import degrees
+from math import radians
+from math import sin
+from math import sqrt
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EARTH_RADIUS = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS * radians(1)
+
+
+def distances(latitude, longitude, latitudes, longitudes):
+    """
+    This function returns the list of the distances in km between the
+    point (latitude, longitude) and each point of the latitudes and
+    longitudes sequences
+    """
+    if numpy is not None:
+        lat = numpy.radians(numpy.asarray(latitudes, dtype=float))
+        lon = numpy.radians(numpy.asarray(longitudes, dtype=float))
+        a = (numpy.sin((lat - radians(latitude)) / 2) ** 2 +
+             cos(radians(latitude)) * numpy.cos(lat) *
+             numpy.sin((lon - radians(longitude)) / 2) ** 2)
+        return (2 * EARTH_RADIUS *
+                numpy.arcsin(numpy.sqrt(numpy.minimum(a, 1)))).tolist()
+    lat0, lon0 = radians(latitude), radians(longitude)
+    cos0 = cos(lat0)
+    found = []
+    for lat, lon in zip(latitudes, longitudes):
+        lat, lon = radians(lat), radians(lon)
+        a = (sin((lat - lat0) / 2) ** 2 +
+             cos0 * cos(lat) * sin((lon - lon0) / 2) ** 2)
+        found.append(2 * EARTH_RADIUS * asin(sqrt(min(a, 1))))
+    return found
+
+
+def bounding_box(latitude, longitude, radius):
+    """
+    This function returns the (min latitude, max latitude, min longitude,
+    max longitude) of a box holding every point within radius km of the
+    point (latitude, longitude). The longitudes are None when the box
+    goes around the Earth, near the poles, and may be beyond -180 or 180
+    otherwise.
+    """
+    delta = radius / KM_PER_DEGREE
+    low, high = latitude - delta, latitude + delta
+    if low <= -90 or high >= 90:
+        return max(low, -90), min(high, 90), None, None
+    delta = degrees(asin(sin(radians(delta)) / cos(radians(latitude))))
+    return low, high, longitude - delta, longitude + delta
+
+
+def within(latitude, longitude, radius, points):
+    """
+    This function returns the list of (instance, distance) pairs of the
+    (instance, latitude, longitude) points within radius km of the point
+    (latitude, longitude), nearest first
+    """
+    if not points:
+        return []
+    found = distances(latitude, longitude, [point[1] for point in points],
+                      [point[2] for point in points])
+    pairs = [(point[0], distance) for point, distance in zip(points, found)
+             if distance <= radius]
+    pairs.sort(key=lambda pair: pair[1])
+    return pairs
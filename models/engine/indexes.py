@@ -0,0 +1,739 @@
+#!/usr/bin/python3
+"""
+This module contains the secondary indexes kept up to date by the
+storage engines of the AirBnB project.
+
+A HashIndex finds the instances holding one value of an attribute, a
+SortedIndex the instances whose numeric attribute is in a range, in
+order, a GridIndex the instances whose coordinates are near a point,
+a TextIndex the instances whose text matches words, and a BitmapIndex
+the instances whose list attribute holds a combination of values.
+"""
+import re
+from bisect import bisect_left
+from bisect import bisect_right
+from bisect import insort
+from collections import Counter
+from heapq import nlargest
+from itertools import chain
+from itertools import compress
+from math import floor
+from math import log
+from operator import itemgetter
+from zlib import crc32
+from models.engine.geo import bounding_box
+from models.engine.geo import within
+
+_word = re.compile(r"\w+")
+_nonzero = re.compile(b"[^\x00]")
+_bits = [tuple(bit for bit in range(8) if byte >> bit & 1)
+         for byte in range(256)]
+_selectors = bytes.maketrans(b"01", b"\x00\x01")
+
+
+class HashIndex:
+    """
+    This class maps each value of one attribute of one class to the
+    instances holding that value
+    """
+
+    def __init__(self, attr):
+        """
+        This method instantiates an empty index on the attribute attr
+        """
+        self.attr = attr
+        self.__buckets = {}
+        self.__values = {}
+
+    def add(self, key, obj):
+        """
+        Indexes obj under key with the value of its attribute
+        """
+        self.update(key, obj, getattr(obj, self.attr, None))
+
+    def update(self, key, obj, value):
+        """
+        Indexes obj under key with value, the value its attribute is
+        about to be set to
+        """
+        self.remove(key)
+        try:
+            self.__buckets.setdefault(value, {})[key] = obj
+        except TypeError:
+            return
+        self.__values[key] = value
+
+    def remove(self, key):
+        """
+        Removes the instance indexed under key
+        """
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        bucket = self.__buckets[value]
+        del bucket[key]
+        if not bucket:
+            del self.__buckets[value]
+
+    def get(self, value):
+        """
+        Returns a dictionary of the instances holding value
+        """
+        try:
+            return self.__buckets.get(value, {})
+        except TypeError:
+            return {}
+
+    def lookup(self, op, value):
+        """
+        Returns a dictionary of the instances whose attribute compares
+        to value with the operator op, or None if the index can't tell
+        """
+        if op != "==":
+            return None
+        return self.get(value)
+
+    def scan(self, conditions=()):
+        """
+        Returns the number of keys holding the value asked for by the
+        first == condition on the attribute, and an iterator over these
+        keys, or None if there's no such condition
+        """
+        for attr, op, value in conditions:
+            if attr == self.attr and op == "==":
+                keys = list(self.get(value))
+                return len(keys), iter(keys)
+        return None
+
+
+def is_number(value):
+    """
+    This function returns True if value is an int or a float that can
+    be ordered (not NaN)
+    """
+    return type(value) in (int, float) and value == value
+
+
+class SortedIndex:
+    """
+    This class keeps the instances of one class ordered by the value of
+    one numeric attribute, for range queries and top-k. The (value,
+    key) entries are kept in sorted lists of at most 2 * load entries,
+    like the leaves of a B-tree, so that an update only shifts one list.
+    The lists are only built when the index is first queried, so loading
+    many instances doesn't sort them one at a time.
+    """
+
+    load = 1000
+
+    def __init__(self, attr):
+        """
+        This method instantiates an empty index on the attribute attr
+        """
+        self.attr = attr
+        self.__entries = {}
+        self.__others = {}
+        self.__lists = None
+        self.__maxes = None
+
+    def add(self, key, obj):
+        """
+        Indexes obj under key with the value of its attribute
+        """
+        self.update(key, obj, getattr(obj, self.attr, None))
+
+    def update(self, key, obj, value):
+        """
+        Indexes obj under key with value, the value its attribute is
+        about to be set to. Values that aren't numbers aren't ordered.
+        """
+        self.remove(key)
+        if not is_number(value):
+            value = None
+            self.__others[key] = obj
+        self.__entries[key] = (obj, value)
+        if value is not None and self.__lists is not None:
+            self.__insert((value, key))
+
+    def remove(self, key):
+        """
+        Removes the instance indexed under key
+        """
+        obj, value = self.__entries.pop(key, (None, None))
+        if value is None:
+            self.__others.pop(key, None)
+        elif self.__lists is not None:
+            self.__delete((value, key))
+
+    def lookup(self, op, value):
+        """
+        Returns a dictionary of the instances whose attribute compares
+        to value with the operator op, or None if the index can't tell
+        """
+        if op == "!=":
+            return None
+        found = self.scan([(self.attr, op, value)])
+        if found is None:
+            return None
+        return {key: self.__entries[key][0] for key in found[1]}
+
+    def ordered(self, descending=False):
+        """
+        Yields the instances in the order of their value, those that
+        have no number last
+        """
+        for key in self.scan(descending=descending)[1]:
+            if key in self.__entries:
+                yield self.__entries[key][0]
+
+    def scan(self, conditions=(), descending=False):
+        """
+        Returns the number of keys whose value is in the range set by
+        the conditions on the attribute, and an iterator over these keys
+        in order, or None if a condition isn't on a number. Without
+        conditions, the keys of the values that aren't numbers come
+        last.
+        """
+        low = high = None
+        low_inclusive = high_inclusive = True
+        for attr, op, value in conditions:
+            if attr != self.attr or op == "!=":
+                continue
+            if not is_number(value):
+                return None
+            if op in ("==", ">", ">=") and (
+                    low is None or value > low or
+                    (value == low and op == ">")):
+                low, low_inclusive = value, op != ">"
+            if op in ("==", "<", "<=") and (
+                    high is None or value < high or
+                    (value == high and op == "<")):
+                high, high_inclusive = value, op != "<"
+        self.__build()
+        start = self.__position(low, not low_inclusive, (0, 0))
+        stop = self.__position(high, high_inclusive, self.__end())
+        if stop < start:
+            stop = start
+        count = sum(len(entries) for entries in
+                    self.__lists[start[0]:stop[0] + 1])
+        if self.__lists:
+            count -= start[1] + len(self.__lists[stop[0]]) - stop[1]
+        keys = self.__keys(start, stop, descending)
+        if low is None and high is None:
+            keys = chain(keys, list(self.__others))
+            count = len(self.__entries)
+        return count, keys
+
+    def __build(self):
+        """
+        Sorts the entries into lists if it wasn't done yet
+        """
+        if self.__lists is not None:
+            return
+        entries = sorted((value, key) for key, (obj, value)
+                         in self.__entries.items() if value is not None)
+        self.__lists = [entries[i:i + self.load]
+                        for i in range(0, len(entries), self.load)]
+        self.__maxes = [entries[-1] for entries in self.__lists]
+
+    def __end(self):
+        """
+        Returns the position after the last entry
+        """
+        if not self.__lists:
+            return (0, 0)
+        return (len(self.__lists) - 1, len(self.__lists[-1]))
+
+    def __position(self, value, after, default):
+        """
+        Returns the (list, index) position of the first entry whose
+        value is greater than value when after is True, or greater or
+        equal otherwise, or default when value is None
+        """
+        if value is None:
+            return default
+        find = bisect_right if after else bisect_left
+        i = find(self.__maxes, value, key=itemgetter(0))
+        if i == len(self.__lists):
+            return self.__end()
+        return (i, find(self.__lists[i], value, key=itemgetter(0)))
+
+    def __keys(self, start, stop, descending):
+        """
+        Yields the keys of the entries between the positions start and
+        stop, in descending order if descending is True
+        """
+        lists = self.__lists
+        if not lists:
+            return
+        if descending:
+            for i in range(stop[0], start[0] - 1, -1):
+                begin = start[1] if i == start[0] else 0
+                end = stop[1] if i == stop[0] else len(lists[i])
+                for value, key in reversed(lists[i][begin:end]):
+                    yield key
+        else:
+            for i in range(start[0], stop[0] + 1):
+                begin = start[1] if i == start[0] else 0
+                end = stop[1] if i == stop[0] else len(lists[i])
+                for value, key in lists[i][begin:end]:
+                    yield key
+
+    def __insert(self, entry):
+        """
+        Inserts entry in the sorted lists, splitting the list it goes
+        to when it grows too long
+        """
+        if not self.__lists:
+            self.__lists.append([entry])
+            self.__maxes.append(entry)
+            return
+        i = min(bisect_left(self.__maxes, entry), len(self.__lists) - 1)
+        entries = self.__lists[i]
+        insort(entries, entry)
+        if len(entries) > 2 * self.load:
+            self.__lists.insert(i + 1, entries[self.load:])
+            del entries[self.load:]
+            self.__maxes.insert(i + 1, self.__lists[i + 1][-1])
+        self.__maxes[i] = entries[-1]
+
+    def __delete(self, entry):
+        """
+        Deletes entry from the sorted lists
+        """
+        i = bisect_left(self.__maxes, entry)
+        entries = self.__lists[i]
+        del entries[bisect_left(entries, entry)]
+        if not entries:
+            del self.__lists[i]
+            del self.__maxes[i]
+        else:
+            self.__maxes[i] = entries[-1]
+
+
+class GridIndex:
+    """
+    This class puts the instances of one class in the cells of a grid of
+    cell by cell degrees, by their latitude and longitude attributes, so
+    that finding the ones near a point only computes the distances to
+    the instances of the nearby cells. It's registered under both
+    attributes; as the new value of a coordinate is only known once it's
+    set, changed instances are placed again when the grid is queried.
+    """
+
+    def __init__(self, latitude="latitude", longitude="longitude",
+                 cell=0.1):
+        """
+        This method instantiates an empty grid on the attributes
+        latitude and longitude
+        """
+        self.latitude = latitude
+        self.longitude = longitude
+        self.cell = cell
+        self.__cells = {}
+        self.__places = {}
+        self.__stale = {}
+
+    def add(self, key, obj):
+        """
+        Indexes obj under key, once the grid is queried
+        """
+        self.__stale[key] = obj
+
+    def update(self, key, obj, value):
+        """
+        Indexes obj under key again, once the grid is queried
+        """
+        self.__stale[key] = obj
+
+    def remove(self, key):
+        """
+        Removes the instance indexed under key
+        """
+        self.__stale.pop(key, None)
+        place = self.__places.pop(key, None)
+        if place is not None:
+            points = self.__cells[place]
+            del points[key]
+            if not points:
+                del self.__cells[place]
+
+    def lookup(self, op, value):
+        """
+        Returns None, the grid doesn't answer conditions on one attribute
+        """
+        return None
+
+    def scan(self, conditions=()):
+        """
+        Returns None, the grid doesn't answer conditions on one attribute
+        """
+        return None
+
+    def near(self, latitude, longitude, radius):
+        """
+        Returns the list of (instance, distance) pairs of the instances
+        within radius km of the point (latitude, longitude), nearest
+        first
+        """
+        self.__refresh()
+        low, high, west, east = bounding_box(latitude, longitude, radius)
+        rows = range(floor(low / self.cell), floor(high / self.cell) + 1)
+        columns = round(360 / self.cell)
+        if west is None or east - west >= 360:
+            cols = set(range(columns))
+        else:
+            cols = {col % columns for col in range(
+                    floor((west + 180) / self.cell),
+                    floor((east + 180) / self.cell) + 1)}
+        if len(rows) * len(cols) <= len(self.__cells):
+            places = [(row, col) for row in rows for col in cols]
+        else:
+            places = [place for place in self.__cells
+                      if place[0] in rows and place[1] in cols]
+        points = []
+        for place in places:
+            points.extend(self.__cells.get(place, {}).values())
+        return within(latitude, longitude, radius, points)
+
+    def __refresh(self):
+        """
+        Places the instances that changed in their cells
+        """
+        for key, obj in self.__stale.items():
+            place = self.__places.pop(key, None)
+            if place is not None:
+                del self.__cells[place][key]
+                if not self.__cells[place]:
+                    del self.__cells[place]
+            lat = getattr(obj, self.latitude, None)
+            lon = getattr(obj, self.longitude, None)
+            if not (is_number(lat) and is_number(lon) and
+                    -90 <= lat <= 90 and abs(lon) != float("inf")):
+                continue
+            place = (floor(lat / self.cell),
+                     floor(((lon + 180) % 360) / self.cell) %
+                     round(360 / self.cell))
+            self.__cells.setdefault(place, {})[key] = (obj, lat, lon)
+            self.__places[key] = place
+        self.__stale.clear()
+
+
+def tokenize(text):
+    """
+    This function returns the list of the lowercase words of text
+    """
+    return _word.findall(text.lower()) if type(text) is str else []
+
+
+class TextIndex:
+    """
+    This class maps each word of the text attributes of one class to the
+    instances using it, to rank the instances matching a search with
+    BM25. It's registered under each attribute; changed instances are
+    tokenized again when the index is next searched, skipping those
+    whose text has the checksum recorded in a restored state.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, *attrs):
+        """
+        This method instantiates an empty index on the attributes attrs
+        """
+        self.attrs = attrs
+        self.version = 0
+        self.built = False
+        self.__postings = {}
+        self.__documents = {}
+        self.__total = 0
+        self.__stale = {}
+        self.__restored = {}
+
+    def add(self, key, obj):
+        """
+        Indexes obj under key, once the index is searched
+        """
+        self.__stale[key] = obj
+        self.version += 1
+
+    def update(self, key, obj, value):
+        """
+        Indexes obj under key again, once the index is searched
+        """
+        self.__stale[key] = obj
+        self.version += 1
+
+    def remove(self, key):
+        """
+        Removes the instance indexed under key
+        """
+        self.__stale.pop(key, None)
+        if self.__drop(key):
+            self.version += 1
+
+    def __drop(self, key):
+        """
+        Removes the words of the instance indexed under key and returns
+        True if it was indexed
+        """
+        document = self.__documents.pop(key, None)
+        if document is None:
+            return False
+        for word, count in document[1].items():
+            postings = self.__postings[word]
+            del postings[key]
+            if not postings:
+                del self.__postings[word]
+            self.__total -= count
+        return True
+
+    def lookup(self, op, value):
+        """
+        Returns None, the index doesn't answer conditions
+        """
+        return None
+
+    def scan(self, conditions=()):
+        """
+        Returns None, the index doesn't answer conditions
+        """
+        return None
+
+    def search(self, text, limit=None):
+        """
+        Returns the list of (key, score) pairs of the instances using
+        words of text, best first, cut to limit pairs if given
+        """
+        self.__refresh()
+        if not self.__documents:
+            return []
+        average = self.__total / len(self.__documents)
+        scores = {}
+        for word in set(tokenize(text)):
+            postings = self.__postings.get(word, {})
+            if not postings:
+                continue
+            idf = log(1 + (len(self.__documents) - len(postings) + 0.5) /
+                      (len(postings) + 0.5))
+            for key, count in postings.items():
+                length = self.__documents[key][2]
+                norm = self.k1 * (1 - self.b + self.b * length / average)
+                scores[key] = (scores.get(key, 0) + idf * count *
+                               (self.k1 + 1) / (count + norm))
+        if limit is not None:
+            return nlargest(limit, scores.items(), key=itemgetter(1))
+        return sorted(scores.items(), key=itemgetter(1), reverse=True)
+
+    def state(self):
+        """
+        Returns the words of every indexed instance with the checksum of
+        its text, as a dictionary that can be saved as JSON
+        """
+        self.__refresh()
+        return {key: [document[0], document[1]]
+                for key, document in self.__documents.items()}
+
+    def restore(self, state):
+        """
+        Records the words of a state returned by state(), to reuse them
+        for the instances whose text hasn't changed since
+        """
+        self.__restored = state
+
+    def __text(self, obj):
+        """
+        Returns the text of the attributes of obj
+        """
+        return "\n".join(value for value in (
+            getattr(obj, attr, None) for attr in self.attrs)
+            if type(value) is str)
+
+    def __refresh(self):
+        """
+        Tokenizes the text of the instances that changed
+        """
+        postings = self.__postings
+        for key, obj in self.__stale.items():
+            if key in self.__documents:
+                self.__drop(key)
+            text = self.__text(obj)
+            checksum = crc32(text.encode("utf8"))
+            restored = self.__restored.get(key)
+            if restored is not None and restored[0] == checksum:
+                counts = restored[1]
+            else:
+                counts = Counter(tokenize(text))
+            length = sum(counts.values())
+            self.__documents[key] = (checksum, counts, length)
+            self.__total += length
+            for word, count in counts.items():
+                if word in postings:
+                    postings[word][key] = count
+                else:
+                    postings[word] = {key: count}
+        self.__stale.clear()
+        self.__restored = {}
+        self.built = True
+
+
+def _mask(ordinals):
+    """
+    This function returns the int whose set bits are ordinals
+    """
+    data = bytearray(max(ordinals) // 8 + 1)
+    for ordinal in ordinals:
+        data[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(data, "little")
+
+
+class BitmapIndex:
+    """
+    This class gives each instance of one class an ordinal, and maps each
+    value held in one list attribute, like the amenity_ids of Place, to
+    an int whose bits are the ordinals of the instances holding it. An
+    expression combining values with and, or and not is then answered
+    with a few operations on whole ints. As lists can be changed in
+    place, changed instances are read again when the index is queried.
+    """
+
+    def __init__(self, attr):
+        """
+        This method instantiates an empty index on the attribute attr
+        """
+        self.attr = attr
+        self.__bitmaps = {}
+        self.__everything = 0
+        self.__ordinals = {}
+        self.__keys = []
+        self.__objects = []
+        self.__free = []
+        self.__values = {}
+        self.__stale = {}
+
+    def add(self, key, obj):
+        """
+        Indexes obj under key, once the index is queried
+        """
+        self.__stale[key] = obj
+
+    def update(self, key, obj, value):
+        """
+        Indexes obj under key again, once the index is queried
+        """
+        self.__stale[key] = obj
+
+    def remove(self, key):
+        """
+        Removes the instance indexed under key
+        """
+        self.__stale.pop(key, None)
+        ordinal = self.__ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        bit = 1 << ordinal
+        for value in self.__values.pop(key):
+            self.__bitmaps[value] &= ~bit
+            if not self.__bitmaps[value]:
+                del self.__bitmaps[value]
+        self.__everything &= ~bit
+        self.__keys[ordinal] = None
+        self.__objects[ordinal] = None
+        self.__free.append(ordinal)
+
+    def lookup(self, op, value):
+        """
+        Returns None, the index doesn't answer conditions
+        """
+        return None
+
+    def scan(self, conditions=()):
+        """
+        Returns None, the index doesn't answer conditions
+        """
+        return None
+
+    def having(self, tree, objects=False):
+        """
+        Returns the list of the keys of the instances whose values
+        fulfill the expression tree returned by
+        models.engine.query.parse_members, in ordinal order, or of the
+        instances themselves when objects is True
+        """
+        self.__refresh()
+        found = self.__objects if objects else self.__keys
+        mask = self.__evaluate(tree)
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        if (len(data) - data.count(0)) * 4 >= len(data):
+            # dense: one selector byte per bit, lowest bit first
+            selectors = bin(mask)[:1:-1].encode().translate(_selectors)
+            return list(compress(found, selectors))
+        picked = []
+        for match in _nonzero.finditer(data):
+            start = match.start() * 8
+            picked.extend(found[start + bit]
+                          for bit in _bits[data[match.start()]])
+        return picked
+
+    def __evaluate(self, tree):
+        """
+        Returns the bitmap of the instances fulfilling tree
+        """
+        if type(tree) is not tuple:
+            return self.__bitmaps.get(tree, 0)
+        if tree[0] == "not":
+            return self.__everything & ~self.__evaluate(tree[1])
+        if tree[0] == "and":
+            return self.__evaluate(tree[1]) & self.__evaluate(tree[2])
+        return self.__evaluate(tree[1]) | self.__evaluate(tree[2])
+
+    def __refresh(self):
+        """
+        Reads the values of the instances that changed, setting and
+        clearing their bits value by value
+        """
+        if not self.__stale:
+            return
+        added, cleared, new = {}, {}, []
+        for key, obj in self.__stale.items():
+            values = getattr(obj, self.attr, None)
+            if type(values) is not list:
+                values = ()
+            values = frozenset(value for value in values
+                               if type(value) in (str, int))
+            ordinal = self.__ordinals.get(key)
+            if ordinal is None:
+                if self.__free:
+                    ordinal = self.__free.pop()
+                    self.__keys[ordinal] = key
+                else:
+                    ordinal = len(self.__keys)
+                    self.__keys.append(key)
+                    self.__objects.append(None)
+                self.__ordinals[key] = ordinal
+                new.append(ordinal)
+            self.__objects[ordinal] = obj
+            old = self.__values.get(key)
+            if old is not None:
+                for value in old - values:
+                    cleared.setdefault(value, []).append(ordinal)
+                gained = values - old
+            else:
+                gained = values
+            for value in gained:
+                if value in added:
+                    added[value].append(ordinal)
+                else:
+                    added[value] = [ordinal]
+            self.__values[key] = values
+        self.__stale.clear()
+        for value, ordinals in cleared.items():
+            self.__bitmaps[value] &= ~_mask(ordinals)
+            if not self.__bitmaps[value]:
+                del self.__bitmaps[value]
+        for value, ordinals in added.items():
+            self.__bitmaps[value] = (self.__bitmaps.get(value, 0) |
+                                     _mask(ordinals))
+        if new:
+            self.__everything |= _mask(new)
@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+This module contains an incremental reader for the JSON file of the
+storage, so that it can be loaded one object at a time instead of
+being parsed whole in memory.
+"""
+from json import JSONDecoder
+import re
+
+_decoder = JSONDecoder()
+_delimiter = re.compile(r"[\s,:\]}]")
+
+
+class _Reader:
+    """
+    This class buffers a text file and decodes JSON values from it
+    """
+
+    def __init__(self, fs, size):
+        """
+        This method instantiates a reader of fs reading size
+        characters at a time
+        """
+        self.fs = fs
+        self.size = size
+        self.buf = ""
+        self.pos = 0
+
+    def more(self):
+        """
+        Reads the next chunk of the file, returns False at its end
+        """
+        chunk = self.fs.read(self.size)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def char(self):
+        """
+        Skips whitespaces and returns the next character without
+        consuming it, or an empty string at the end of the file
+        """
+        while True:
+            while (self.pos < len(self.buf) and
+                    self.buf[self.pos] in " \t\n\r"):
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        """
+        Consumes and returns the next character, which must be in chars
+        """
+        ch = self.char()
+        if not ch or ch not in chars:
+            raise ValueError("Expecting one of {!r} at {!r}".format(
+                chars, self.buf[self.pos:self.pos + 20]))
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """
+        Decodes and returns the next JSON value
+        """
+        if self.char() not in ('"', "{", "["):
+            # a number is only complete once what follows it is read
+            while (not _delimiter.search(self.buf, self.pos) and
+                    self.more()):
+                pass
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if not self.more():
+                    raise
+                self.size *= 2
+                continue
+            self.pos = end
+            return value
+
+
+def iter_items(fs, size=1 << 16):
+    """
+    Yields the (key, value) pairs of the JSON object stored in the text
+    file fs, reading it size characters at a time
+    """
+    reader = _Reader(fs, size)
+    reader.expect("{")
+    if reader.char() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        yield key, reader.value()
+        if reader.expect(",}") == "}":
+            return
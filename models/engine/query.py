@@ -0,0 +1,288 @@
+#!/usr/bin/python3
+"""
+This module contains the queries run by the console's where command,
+written like Place.where(price_by_night<100, max_guest>=4)
+.order_by(-price_by_night).limit(20). Values holding commas or
+parentheses are quoted, as in Place.where(name="Loft, (quiet)").
+
+A query is parsed into a Query: conditions on attributes, sort keys,
+an offset, a limit and the attributes to print. The storage engine
+finds the instances matching the conditions with select(), using its
+indexes when it has some, and the query sorts and slices them.
+
+The console's having command filters instances by the values held in a
+list attribute, like the amenity_ids of Place, with an expression such
+as wifi and (pool or spa) and not smoking. It's parsed into a tree of
+("and", left, right), ("or", left, right) and ("not", operand) tuples
+whose leaves are the values.
+"""
+import re
+from ast import literal_eval
+from heapq import nlargest
+from heapq import nsmallest
+from operator import eq
+from operator import ge
+from operator import gt
+from operator import le
+from operator import lt
+from operator import ne
+
+OPERATORS = {"==": eq, "!=": ne, "<": lt, "<=": le, ">": gt, ">=": ge}
+
+_call = re.compile(r"""\.?(\w+)\(((?:"[^"]*"|'[^']*'|[^()"'])*)\)""")
+_unquoted = re.compile(r"[\s<>=!]")
+_part = re.compile(r""""[^"]*"|'[^']*'|[^,"']+|,""")
+_condition = re.compile(r"\s*(\w+)\s*(==|!=|<=|>=|=|<|>)\s*(.*?)\s*")
+_token = re.compile(r'\s*("[^"]*"|\(|\)|[^\s()"]+)')
+
+
+def compare(left, op, right):
+    """
+    This function returns the result of comparing left to right with
+    the operator op. A comparison that can't be made, like a number
+    with None, is false.
+    """
+    try:
+        return bool(OPERATORS[op](left, right))
+    except TypeError:
+        return False
+
+
+def matches(obj, conditions):
+    """
+    This function returns True if obj fulfills every (attribute,
+    operator, value) condition
+    """
+    return all(compare(getattr(obj, attr, None), op, value)
+               for attr, op, value in conditions)
+
+
+def split_parts(text):
+    """
+    This function returns the comma separated parts of text, leaving
+    the commas of quoted strings in their part, and raises ValueError
+    if a quote isn't closed
+    """
+    parts = [""]
+    pos = 0
+    while pos < len(text):
+        match = _part.match(text, pos)
+        if match is None:
+            raise ValueError("Unclosed quote: {}".format(text[pos:]))
+        if match.group() == ",":
+            parts.append("")
+        else:
+            parts[-1] += match.group()
+        pos = match.end()
+    return parts
+
+
+def parse_value(text):
+    """
+    This function returns the Python literal written in text, or text
+    itself when it isn't a literal
+    """
+    try:
+        return literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+class Query:
+    """
+    This class defines a query on the instances of one class
+    """
+
+    def __init__(self, cls):
+        """
+        This method instantiates a query returning every instance of cls
+        """
+        self.cls = cls
+        self.conditions = []
+        self.order = []
+        self.offset = 0
+        self.limit = None
+        self.fields = None
+
+    def where(self, text):
+        """
+        Adds the comma separated conditions written in text
+        """
+        for part in split_parts(text):
+            if not part.strip():
+                continue
+            match = _condition.fullmatch(part)
+            if match is None or not match.group(3):
+                raise ValueError("Invalid condition: {}".format(part))
+            # conditions missing their comma, like a<1 b>2, end up here
+            if (match.group(3)[0] not in "\"'" and
+                    _unquoted.search(match.group(3))):
+                raise ValueError("Unquoted value: {}".format(part))
+            op = "==" if match.group(2) == "=" else match.group(2)
+            self.conditions.append(
+                    (match.group(1), op, parse_value(match.group(3))))
+
+    def order_by(self, text):
+        """
+        Adds the comma separated sort keys written in text, a key
+        starting with - sorting in descending order
+        """
+        for part in text.split(","):
+            attr = part.strip()
+            descending = attr.startswith("-")
+            attr = attr.lstrip("-").strip()
+            if not attr.isidentifier():
+                raise ValueError("Invalid sort key: {}".format(part))
+            self.order.append((attr, descending))
+
+    def select(self, text):
+        """
+        Sets the comma separated attributes written in text as the ones
+        to return instead of the instances
+        """
+        self.fields = [part.strip() for part in text.split(",")]
+        if not all(field.isidentifier() for field in self.fields):
+            raise ValueError("Invalid attributes: {}".format(text))
+
+    def run(self, storage):
+        """
+        Returns the list of instances matching the query in storage, or
+        of dictionaries of their selected attributes
+        """
+        stop = None if self.limit is None else self.offset + self.limit
+        if len(self.order) == 1 and stop is not None:
+            attr, descending = self.order[0]
+            found = storage.select(self.cls, self.conditions,
+                                   self.order[0], stop)
+            pick = nlargest if descending else nsmallest
+            found = pick(stop, found, key=self.__key(attr, descending))
+        else:
+            found = storage.select(self.cls, self.conditions)
+            for attr, descending in reversed(self.order):
+                found = sorted(found, key=self.__key(attr, descending),
+                               reverse=descending)
+        found = list(found)[self.offset:stop]
+        if self.fields is None:
+            return found
+        return [{field: getattr(obj, field, None) for field in self.fields}
+                for obj in found]
+
+    @staticmethod
+    def __key(attr, descending=False):
+        """
+        Returns the sort key function of the attribute attr, which
+        puts the instances lacking attr last in either order
+        """
+        missing = (-1,) if descending else (1,)
+
+        def key(obj):
+            value = getattr(obj, attr, None)
+            return missing if value is None else (0, value)
+        return key
+
+
+def parse_query(cls, text):
+    """
+    This function returns the Query on cls written in text, a chain of
+    where(...), order_by(...), limit(n), offset(n) and select(...)
+    calls separated by dots, and raises ValueError if it's invalid
+    """
+    query = Query(cls)
+    text = text.strip()
+    pos = 0
+    for match in _call.finditer(text):
+        if match.start() != pos:
+            break
+        pos = match.end()
+        name, args = match.group(1), match.group(2)
+        if name in ("where", "order_by", "select"):
+            getattr(query, name)(args)
+        elif name in ("limit", "offset"):
+            number = int(args)
+            if number < 0:
+                raise ValueError("Negative {}: {}".format(name, args))
+            setattr(query, name, number)
+        else:
+            raise ValueError("Unknown method: {}".format(name))
+    if pos != len(text):
+        raise ValueError("Invalid query: {}".format(text))
+    return query
+
+
+def parse_members(text):
+    """
+    This function returns the tree of the expression on the values of a
+    list attribute written in text, made of values (quoted when they
+    hold spaces), parentheses and the and, or and not operators, and
+    raises ValueError if it's invalid
+    """
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _token.match(text, pos)
+        if match is None:
+            raise ValueError("Invalid expression: {}".format(text))
+        tokens.append(match.group(1))
+        pos = match.end()
+    tokens.reverse()
+    tree = _members_or(tokens)
+    if tokens:
+        raise ValueError("Unexpected {}".format(tokens[-1]))
+    return tree
+
+
+def _members_or(tokens):
+    """
+    This function parses values joined by or from the reversed tokens
+    """
+    tree = _members_and(tokens)
+    while tokens and tokens[-1].lower() == "or":
+        tokens.pop()
+        tree = ("or", tree, _members_and(tokens))
+    return tree
+
+
+def _members_and(tokens):
+    """
+    This function parses values joined by and from the reversed tokens
+    """
+    tree = _members_not(tokens)
+    while tokens and tokens[-1].lower() == "and":
+        tokens.pop()
+        tree = ("and", tree, _members_not(tokens))
+    return tree
+
+
+def _members_not(tokens):
+    """
+    This function parses a value, a negation or a parenthesized
+    expression from the reversed tokens
+    """
+    if not tokens:
+        raise ValueError("Missing value")
+    token = tokens.pop()
+    if token.lower() == "not":
+        return ("not", _members_not(tokens))
+    if token == "(":
+        tree = _members_or(tokens)
+        if not tokens or tokens.pop() != ")":
+            raise ValueError("Missing )")
+        return tree
+    if token == ")" or token.lower() in ("and", "or"):
+        raise ValueError("Unexpected {}".format(token))
+    return token[1:-1] if token.startswith('"') else token
+
+
+def holds(tree, values):
+    """
+    This function returns True if the collection values fulfills the
+    expression tree returned by parse_members
+    """
+    if type(tree) is not tuple:
+        return tree in values
+    if tree[0] == "not":
+        return not holds(tree[1], values)
+    if tree[0] == "and":
+        return holds(tree[1], values) and holds(tree[2], values)
+    return holds(tree[1], values) or holds(tree[2], values)
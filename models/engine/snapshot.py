@@ -0,0 +1,217 @@
+#!/usr/bin/python3
+"""
+This module contains the binary snapshot format of the storage, used
+instead of JSON when the file of FileStorage ends with .hbnb. It is
+smaller than the JSON file and faster to read and write.
+
+The records are stored per class, one column per attribute, after a
+header holding the layout of the columns:
+
+    magic b"HBNB\\x01", header size (4 bytes), JSON header, strings,
+    then for each class and each of its columns: presence, values
+
+Integers and floats are packed as 8 byte little-endian numbers, and the
+dates as integer microseconds since the epoch. Strings are interned in
+a single table, joined by NUL characters, and string columns hold
+4 byte indexes into it, so that the many ids repeated in the foreign
+keys are only stored once. Other values, like lists or columns of mixed
+types, are stored as interned JSON texts. A column that some records of
+the class don't have has a presence byte per record.
+
+Snapshots are converted between the JSON and binary formats, chosen by
+the extensions of the files, with convert(), or from the root of the
+repository with:
+
+    ./convert_snapshot.py <source> <destination>
+"""
+from array import array
+from itertools import chain
+from itertools import compress
+from itertools import count
+from itertools import repeat
+from json import dump
+from json import dumps
+from json import loads
+from operator import itemgetter
+from os import replace
+import struct
+import sys
+from models.base_model import epoch_micros
+from models.base_model import parse_datetime
+from models.engine.json_stream import iter_items
+
+MAGIC = b"HBNB\x01"
+EXTENSION = ".hbnb"
+DATES = ("created_at", "updated_at")
+_index = next(code for code in "IL" if array(code).itemsize == 4)
+_swap = sys.byteorder != "little"
+_int64 = (-2 ** 63, 2 ** 63 - 1)
+# marks the attributes a record doesn't have
+_missing = object()
+
+
+def is_binary(path):
+    """
+    This function returns True if the snapshot at path uses the binary
+    format, which its extension tells
+    """
+    return path.endswith(EXTENSION)
+
+
+def write_snapshot(fs, items):
+    """
+    This function writes the (key, record) pairs of items to the binary
+    file fs. The dates of the records are integer microseconds.
+    """
+    classes = {}
+    for key, record in items:
+        classes.setdefault(record["__class__"], []).append(record)
+    strings = {}
+    header = {"classes": []}
+    blobs = []
+    for name, records in classes.items():
+        attrs = dict.fromkeys(chain.from_iterable(records))
+        del attrs["__class__"]
+        columns = []
+        for attr in attrs:
+            present = b""
+            try:
+                values = list(map(itemgetter(attr), records))
+            except KeyError:
+                present = bytes(attr in record for record in records)
+                values = [record[attr]
+                          for record in compress(records, present)]
+            kind, blob = _encode(values, strings)
+            columns.append([attr, kind, len(present), len(blob)])
+            blobs += [present, blob]
+        header["classes"].append(
+                {"name": name, "count": len(records), "columns": columns})
+    table = "\x00".join(strings).encode("utf8")
+    header["strings"] = [len(strings), len(table)]
+    head = dumps(header).encode("utf8")
+    fs.write(MAGIC + struct.pack("<I", len(head)) + head + table)
+    for blob in blobs:
+        fs.write(blob)
+
+
+def read_snapshot(fs):
+    """
+    This function yields the (key, record) pairs of the binary file fs.
+    Raises ValueError if fs isn't a binary snapshot.
+    """
+    data = fs.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary snapshot")
+    pos = len(MAGIC) + 4
+    size = struct.unpack_from("<I", data, len(MAGIC))[0]
+    header = loads(data[pos:pos + size].decode("utf8"))
+    pos += size
+    number, size = header["strings"]
+    strings = data[pos:pos + size].decode("utf8").split("\x00")
+    if not number:
+        strings = []
+    pos += size
+    for entry in header["classes"]:
+        names, columns, partial = ["__class__"], [], False
+        columns.append(repeat(entry["name"], entry["count"]))
+        for attr, kind, present, size in entry["columns"]:
+            flags = data[pos:pos + present]
+            pos += present
+            values = _decode(kind, data[pos:pos + size], strings)
+            pos += size
+            if present:
+                values = iter(values)
+                values = [next(values) if flag else _missing
+                          for flag in flags]
+                partial = True
+            names.append(attr)
+            columns.append(values)
+        prefix = entry["name"] + "."
+        for row in zip(*columns):
+            record = dict(zip(names, row))
+            if partial:
+                record = {attr: value for attr, value in record.items()
+                          if value is not _missing}
+            yield prefix + record["id"], record
+
+
+def convert(source, destination):
+    """
+    This function writes the snapshot at source to destination, each in
+    the format its extension tells, and returns the number of records
+    """
+    if is_binary(source):
+        with open(source, "rb") as fs:
+            items = list(read_snapshot(fs))
+    else:
+        with open(source, encoding="utf8") as fs:
+            items = list(iter_items(fs))
+    for key, record in items:
+        for attr in DATES:
+            if attr not in record:
+                continue
+            date = parse_datetime(record[attr])
+            if is_binary(destination):
+                record[attr] = epoch_micros(date)
+            else:
+                record[attr] = date.isoformat()
+    tmp_path = destination + ".tmp"
+    if is_binary(destination):
+        with open(tmp_path, "wb") as fs:
+            write_snapshot(fs, items)
+    else:
+        with open(tmp_path, "w", encoding="utf8") as fs:
+            dump(dict(items), fs)
+    replace(tmp_path, destination)
+    return len(items)
+
+
+def _encode(values, strings):
+    """
+    Returns the kind and the packed bytes of the column values, adding
+    the strings it uses to the interned strings
+    """
+    types = set(map(type, values))
+    if types == {int} and _int64[0] <= min(values) and \
+            max(values) <= _int64[1]:
+        kind, packed = "q", array("q", values)
+    elif types == {float}:
+        kind, packed = "d", array("d", values)
+    elif types == {str} and "\x00" not in "".join(values):
+        kind, packed = "s", _intern(values, strings)
+    elif not types:
+        kind, packed = "q", array("q")
+    else:
+        kind, packed = "j", _intern(list(map(dumps, values)), strings)
+    if _swap:
+        packed.byteswap()
+    return kind, packed.tobytes()
+
+
+def _intern(values, strings):
+    """
+    Returns the array of the indexes of the strings values in the
+    interned strings, adding those that weren't interned yet
+    """
+    fresh = dict.fromkeys(values)
+    for value in fresh.keys() & strings.keys():
+        del fresh[value]
+    strings.update(zip(fresh, count(len(strings))))
+    return array(_index, map(strings.__getitem__, values))
+
+
+def _decode(kind, blob, strings):
+    """
+    Returns the list of the values of a column of the given kind packed
+    in blob
+    """
+    packed = array(_index if kind in "sj" else kind)
+    packed.frombytes(blob)
+    if _swap:
+        packed.byteswap()
+    if kind in "qd":
+        return packed.tolist()
+    values = map(strings.__getitem__, packed)
+    if kind == "s":
+        return list(values)
+    return loads("[" + ", ".join(values) + "]")
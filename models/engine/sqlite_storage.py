@@ -0,0 +1,375 @@
+#!/usr/bin/python3
+"""
+This module implements a storage engine keeping the instances of the
+AirBnB project in a SQLite database. It is used instead of FileStorage
+when HBNB_TYPE_STORAGE=sqlite, with the database file given by
+HBNB_SQLITE_PATH (hbnb.db by default).
+
+Every model class has its own table, with a column per declared
+attribute, an index on each foreign key, and an "extra" column holding
+the other attributes as JSON. Instances are only loaded from the
+database when they are asked for, and changes are written inside a
+transaction that save() commits.
+"""
+from json import dumps
+from json import loads
+from os import getenv
+import sqlite3
+from models.engine.storage_engine import StorageEngine
+from models.engine.query import compare
+from models.engine.query import matches
+from models.compact import declared_attributes
+from models.base_model import registry
+from models.user import User
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+
+_types = {str: "TEXT", int: "INTEGER", float: "REAL"}
+
+
+class SQLiteStorage(StorageEngine):
+    """
+    This class stores instances in the tables of a SQLite database
+    """
+
+    def __init__(self, path=None):
+        """
+        This method instantiates a storage using the database at path
+        """
+        self.__path = path or getenv("HBNB_SQLITE_PATH", "hbnb.db")
+        self.__db = None
+        self.__columns = {}
+        self.__objects = {}
+        self.__dirty = {}
+
+    def all(self, cls=None):
+        """
+        Returns a dictionary of the instances of cls (a class or a class
+        name), or of all instances, loading them from the database
+        """
+        self.__flush()
+        if cls is None:
+            for name in list(registry):
+                self.all(name)
+            return self.__objects
+        name = self.__name(cls)
+        if name not in registry:
+            return {}
+        self.__table(name)
+        found = {}
+        for row in self.__db.execute('SELECT * FROM "{}"'.format(name)):
+            obj = self.__load(name, row)
+            found[name + "." + obj.id] = obj
+        return found
+
+    def iterate(self, cls=None, after=None):
+        """
+        Yields the instances of cls, or all instances, one at a time, in
+        the order of their rows, starting after the one stored under the
+        key after if given. Those that weren't loaded yet are built but
+        not kept. Raises KeyError if there's no instance under after.
+        """
+        if cls is None:
+            names = list(registry)
+            if after is not None:
+                start = after.split(".")[0]
+                if start not in names:
+                    raise KeyError(after)
+                names = names[names.index(start):]
+            for name in names:
+                yield from self.iterate(
+                        name, after if after is not None and
+                        after.startswith(name + ".") else None)
+            return
+        name = self.__name(cls)
+        if name not in registry:
+            if after is not None:
+                raise KeyError(after)
+            return
+        self.__flush()
+        self.__table(name)
+        query = 'SELECT * FROM "{}"'.format(name)
+        params = []
+        if after is not None:
+            row = self.__db.execute(
+                    'SELECT rowid FROM "{}" WHERE id = ?'.format(name),
+                    (after[len(name) + 1:],)).fetchone()
+            if row is None or not after.startswith(name + "."):
+                raise KeyError(after)
+            query += " WHERE rowid > ?"
+            params.append(row[0])
+        for row in self.__db.execute(query + " ORDER BY rowid", params):
+            yield self.__load(name, row, keep=False)
+
+    def count(self, cls=None):
+        """
+        Returns the number of instances of cls, or of all instances
+        """
+        if cls is None:
+            return sum(self.count(name) for name in list(registry))
+        name = self.__name(cls)
+        if name not in registry:
+            return 0
+        self.__flush()
+        self.__table(name)
+        query = 'SELECT COUNT(*) FROM "{}"'.format(name)
+        return self.__db.execute(query).fetchone()[0]
+
+    def get(self, cls, id):
+        """
+        Returns the instance of cls with the given id, or None
+        """
+        name = self.__name(cls)
+        key = name + "." + str(id)
+        if key in self.__objects:
+            return self.__objects[key]
+        if name not in registry:
+            return None
+        self.__table(name)
+        query = 'SELECT * FROM "{}" WHERE id = ?'.format(name)
+        row = self.__db.execute(query, (str(id),)).fetchone()
+        return None if row is None else self.__load(name, row)
+
+    def find(self, cls, **kwargs):
+        """
+        Returns the list of instances of cls whose attributes have the
+        values given in kwargs
+        """
+        return self.select(cls, [(attr, "==", value)
+                                 for attr, value in kwargs.items()])
+
+    def find_in(self, cls, attr, values):
+        """
+        Returns a dictionary mapping each of values to the list of
+        instances of cls whose attribute attr holds it, leaving out the
+        values no instance holds, reading them with IN queries on the
+        column of attr
+        """
+        name = self.__name(cls)
+        if name not in registry:
+            return {}
+        self.__flush()
+        columns = self.__table(name)
+        if attr != "id" and attr not in columns:
+            return super().find_in(cls, attr, values)
+        values = set(values)
+        kind = str if attr == "id" else type(columns[attr])
+        if any(type(value) is not kind for value in values):
+            return super().find_in(cls, attr, values)
+        wanted = values
+        values = list(values)
+        found = {}
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            query = 'SELECT * FROM "{}" WHERE "{}" IN ({})'.format(
+                name, attr, ", ".join("?" * len(chunk)))
+            if attr != "id":
+                # a value of another type is kept in extra
+                query += ' OR ("{}" IS NULL AND extra IS NOT NULL)'.format(
+                    attr)
+            for row in self.__db.execute(query, chunk):
+                obj = self.__load(name, row)
+                value = getattr(obj, attr, None)
+                try:
+                    if value not in wanted:
+                        continue
+                except TypeError:
+                    continue
+                found.setdefault(value, []).append(obj)
+        return found
+
+    def select(self, cls, conditions, order=None, limit=None):
+        """
+        Returns the list of instances of cls fulfilling every (attribute,
+        operator, value) condition, filtering on the columns in the
+        database when the value is a number or a string
+        """
+        name = self.__name(cls)
+        if name not in registry:
+            return []
+        self.__flush()
+        columns = self.__table(name)
+        where, params = [], []
+        for attr, op, value in conditions:
+            if (op == "!=" or type(value) not in _types or
+                    (attr != "id" and attr not in columns)):
+                continue
+            test = '"{}" {} ?'.format(attr, "=" if op == "==" else op)
+            # an attribute left to its default is stored as NULL, and a
+            # value of another type than the default is kept in extra
+            if attr != "id" and compare(columns[attr], op, value):
+                test = '({} OR "{}" IS NULL)'.format(test, attr)
+            elif attr != "id":
+                test = '({} OR ("{}" IS NULL AND extra IS NOT NULL))'.format(
+                    test, attr)
+            where.append(test)
+            params.append(value)
+        query = 'SELECT * FROM "{}"'.format(name)
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        found = (self.__load(name, row)
+                 for row in self.__db.execute(query, params))
+        return [obj for obj in found if matches(obj, conditions)]
+
+    def new(self, obj):
+        """
+        Adds obj to the storage, it is written to the database on save
+        """
+        key = type(obj).__name__ + "." + obj.id
+        self.__objects[key] = obj
+        self.__dirty[key] = obj
+
+    def touch(self, obj, name=None, value=None):
+        """
+        Marks obj as changed if it's inside the storage
+        """
+        key = type(obj).__name__ + "." + str(getattr(obj, "id", None))
+        if self.__objects.get(key) is obj:
+            self.__dirty[key] = obj
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from the storage, for good on save
+        """
+        if obj is None:
+            return
+        name = type(obj).__name__
+        key = name + "." + obj.id
+        self.__objects.pop(key, None)
+        self.__dirty.pop(key, None)
+        self.__table(name)
+        query = 'DELETE FROM "{}" WHERE id = ?'.format(name)
+        self.__db.execute(query, (obj.id,))
+
+    def save(self):
+        """
+        Writes the changed instances and commits the transaction
+        """
+        if self.defer_save():
+            return
+        self.__flush()
+        self.__db.commit()
+
+    def reload(self):
+        """
+        Connects to the database, creating the tables of the model
+        classes, and forgets the instances that weren't saved
+        """
+        if self.__db is None:
+            self.__db = sqlite3.connect(self.__path)
+            self.__db.row_factory = sqlite3.Row
+        else:
+            self.__db.rollback()
+        self.__columns = {}
+        self.__objects = {}
+        self.__dirty = {}
+        for name in list(registry):
+            self.__table(name)
+        self.__db.commit()
+
+    def close(self):
+        """
+        Closes the database, discarding the changes that weren't saved
+        """
+        if self.__db is not None:
+            self.__db.close()
+            self.__db = None
+
+    def __table(self, name):
+        """
+        Creates the table of the class name if needed and returns the
+        declared attributes of the class with their defaults
+        """
+        if name in self.__columns:
+            return self.__columns[name]
+        columns = declared_attributes(registry[name])
+        self.__db.execute(
+            'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+            'created_at TEXT, updated_at TEXT, extra TEXT)'.format(name))
+        existing = {row[1] for row in self.__db.execute(
+            'PRAGMA table_info("{}")'.format(name))}
+        for attr, default in columns.items():
+            if attr not in existing:
+                self.__db.execute('ALTER TABLE "{}" ADD COLUMN "{}" {}'.format(
+                    name, attr, _types.get(type(default), "TEXT")))
+        for attr in (self.foreign_keys.get(name, ()) +
+                     self.range_keys.get(name, ()) +
+                     self.spatial_keys.get(name, ())[:1]):
+            self.__db.execute(
+                'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ("{1}")'.format(
+                    name, attr))
+        self.__columns[name] = columns
+        return columns
+
+    def __flush(self):
+        """
+        Writes the changed instances to the database
+        """
+        for key, obj in self.__dirty.items():
+            name = type(obj).__name__
+            row = self.__row(name, obj)
+            self.__db.execute(
+                'INSERT OR REPLACE INTO "{}" ({}) VALUES ({})'.format(
+                    name, ", ".join('"{}"'.format(col) for col in row),
+                    ", ".join("?" * len(row))),
+                list(row.values()))
+        self.__dirty.clear()
+
+    def __row(self, name, obj):
+        """
+        Returns the column values of obj, an instance of the class name
+        """
+        columns = self.__table(name)
+        row = dict.fromkeys(columns)
+        extra = {}
+        for attr, value in obj.to_dict().items():
+            default = columns.get(attr)
+            if attr in ("id", "created_at", "updated_at"):
+                row[attr] = value
+            elif attr == "__class__":
+                continue
+            elif (attr in columns and type(default) in (list, dict) and
+                    type(value) is type(default)):
+                row[attr] = dumps(value)
+            elif (attr in columns and type(value) in _types and
+                    type(value) is type(default)):
+                row[attr] = value
+            else:
+                extra[attr] = value
+        row["extra"] = dumps(extra) if extra else None
+        return row
+
+    def __load(self, name, row, keep=True):
+        """
+        Returns the instance of the class name stored in row, the one
+        already loaded if any. A new instance is only kept in the
+        identity map when keep is True.
+        """
+        key = name + "." + row["id"]
+        if key in self.__objects:
+            return self.__objects[key]
+        columns = self.__columns[name]
+        record = {}
+        for attr in row.keys():
+            value = row[attr]
+            if value is None or attr == "extra":
+                continue
+            if type(columns.get(attr)) in (list, dict):
+                value = loads(value)
+            record[attr] = value
+        if row["extra"]:
+            record.update(loads(row["extra"]))
+        obj = registry[name](**record)
+        if keep:
+            self.__objects[key] = obj
+        return obj
+
+    @staticmethod
+    def __name(cls):
+        """
+        Returns the class name of cls, which is a class or a class name
+        """
+        return cls if type(cls) is str else cls.__name__
@@ -0,0 +1,320 @@
+#!/usr/bin/python3
+"""
+This module defines the interface shared by the storage engines of the
+AirBnB project. models.storage is an instance of one of its subclasses,
+chosen with the HBNB_TYPE_STORAGE environment variable.
+
+Between begin() and commit(), saves are batched: a save only writes
+once HBNB_BATCH_SIZE saves have piled up since the last write, or when
+HBNB_BATCH_INTERVAL seconds have passed since it. The interval is only
+checked by the saves, nothing is written while none comes, and commit()
+writes whatever is left.
+
+The relationships of the models, like State.cities, read the related
+instances with find_in(), which engines answer from their indexes, and
+prefetch() reads a relationship of many instances with one find_in().
+
+columns() returns the declared attributes of the instances of a class
+as a models.engine.columns.Table, whose filters and aggregates work on
+whole columns instead of one instance at a time.
+"""
+from itertools import dropwhile
+from os import getenv
+from time import monotonic
+from models.engine.aggregates import Aggregate
+from models.engine.columns import Table
+from models.engine.geo import bounding_box
+from models.engine.geo import within
+from models.engine.indexes import is_number
+from models.engine.indexes import TextIndex
+from models.engine.query import holds
+from models.engine.query import matches
+from models.relationships import Relationship
+from models.base_model import registry
+
+
+class StorageEngine:
+    """
+    This class defines the methods a storage engine implements. all,
+    new, delete, save and reload must be overridden, and save must
+    return early when defer_save() is True; the other methods have
+    working, if slow, defaults built on all().
+    """
+
+    foreign_keys = {
+            "City": ("state_id",),
+            "Place": ("city_id", "user_id"),
+            "Review": ("place_id", "user_id"),
+            }
+    range_keys = {
+            "Place": ("price_by_night", "number_rooms", "max_guest"),
+            }
+    spatial_keys = {
+            "Place": ("latitude", "longitude"),
+            }
+    text_keys = {
+            "Place": ("description",),
+            "Review": ("text",),
+            }
+    member_keys = {
+            "Place": ("amenity_ids",),
+            }
+    aggregate_keys = {
+            "Place": (("city_id", "price_by_night"),),
+            "Review": (("place_id", None),),
+            }
+    batch_size = int(getenv("HBNB_BATCH_SIZE", "1000"))
+    batch_interval = float(getenv("HBNB_BATCH_INTERVAL", "1.0"))
+    __batch = False
+    __deferred = 0
+    __written_at = 0.0
+
+    def all(self, cls=None):
+        """
+        Returns a dictionary of the instances of cls (a class or a class
+        name), or of all instances, keyed by <class name>.<id>
+        """
+        raise NotImplementedError
+
+    def new(self, obj):
+        """
+        Adds obj to the storage, or marks it as changed
+        """
+        raise NotImplementedError
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from the storage if it's inside
+        """
+        raise NotImplementedError
+
+    def save(self):
+        """
+        Makes the changes done since the last save durable
+        """
+        raise NotImplementedError
+
+    def reload(self):
+        """
+        Loads the storage, discarding the changes that weren't saved
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Waits until the saves done so far are written
+        """
+        pass
+
+    def touch(self, obj, name=None, value=None):
+        """
+        Tells the storage that obj changed. When name is given, the
+        attribute name of obj is about to be set to value.
+        """
+        pass
+
+    def iterate(self, cls=None, after=None):
+        """
+        Yields the instances of cls, or all instances, one at a time,
+        starting after the one stored under the key after if given. The
+        instances may not be kept by the storage, so they are only read:
+        the methods returning instances get them from all().
+        Raises KeyError if there's no instance under after.
+        """
+        objects = self.all(cls)
+        if after is None:
+            yield from objects.values()
+            return
+        if after not in objects:
+            raise KeyError(after)
+        keys = dropwhile(after.__ne__, objects)
+        next(keys)
+        for key in keys:
+            yield objects[key]
+
+    def count(self, cls=None):
+        """
+        Returns the number of instances of cls, or of all instances
+        """
+        return len(self.all(cls))
+
+    def get(self, cls, id):
+        """
+        Returns the instance of cls with the given id, or None
+        """
+        name = cls if type(cls) is str else cls.__name__
+        return self.all(cls).get(name + "." + str(id))
+
+    def find(self, cls, **kwargs):
+        """
+        Returns the list of instances of cls whose attributes have the
+        values given in kwargs
+        """
+        return [obj for obj in self.all(cls).values()
+                if all(getattr(obj, attr, None) == value
+                       for attr, value in kwargs.items())]
+
+    def find_in(self, cls, attr, values):
+        """
+        Returns a dictionary mapping each of values to the list of
+        instances of cls whose attribute attr holds it, leaving out the
+        values no instance holds
+        """
+        values = set(values)
+        found = {}
+        for obj in self.all(cls).values():
+            value = getattr(obj, attr, None)
+            try:
+                if value not in values:
+                    continue
+            except TypeError:
+                continue
+            found.setdefault(value, []).append(obj)
+        return found
+
+    def prefetch(self, objs, name):
+        """
+        Returns a dictionary mapping the id of each instance of objs to
+        its relationship name, like the reviews of Places, read for all
+        of them at once. Raises ValueError if name isn't a relationship.
+        """
+        classes = {}
+        for obj in objs:
+            classes.setdefault(type(obj), []).append(obj)
+        found = {}
+        for cls, group in classes.items():
+            relationship = getattr(cls, name, None)
+            if not isinstance(relationship, Relationship):
+                raise ValueError("{} has no relationship {}".format(
+                    cls.__name__, name))
+            found.update(relationship.prefetch(self, group))
+        return found
+
+    def select(self, cls, conditions, order=None, limit=None):
+        """
+        Returns the list of instances of cls fulfilling every (attribute,
+        operator, value) condition, the operators being those of
+        models.engine.query.OPERATORS. When the (attribute, descending)
+        order and limit are given, the list may be cut to the first
+        limit instances in that order, but isn't necessarily sorted.
+        """
+        return [obj for obj in self.all(cls).values()
+                if matches(obj, conditions)]
+
+    def near(self, cls, latitude, longitude, radius):
+        """
+        Returns the list of (instance, distance) pairs of the instances
+        of cls within radius km of the point (latitude, longitude),
+        nearest first. Raises ValueError if cls has no coordinates.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        if name not in self.spatial_keys:
+            raise ValueError("{} has no coordinates".format(name))
+        lat, lon = self.spatial_keys[name]
+        low, high, west, east = bounding_box(latitude, longitude, radius)
+        conditions = [(lat, ">=", low), (lat, "<=", high)]
+        if west is not None and west >= -180 and east <= 180:
+            conditions += [(lon, ">=", west), (lon, "<=", east)]
+        points = []
+        for obj in self.select(cls, conditions):
+            point = (obj, getattr(obj, lat, None), getattr(obj, lon, None))
+            if is_number(point[1]) and is_number(point[2]):
+                points.append(point)
+        return within(latitude, longitude, radius, points)
+
+    def search(self, cls, text, limit=None):
+        """
+        Returns the list of (instance, score) pairs of the instances of
+        cls whose text attributes use words of text, best first, cut to
+        limit pairs if given. Raises ValueError if cls has no text
+        attributes.
+        """
+        name = cls if type(cls) is str else cls.__name__
+        if name not in self.text_keys:
+            raise ValueError("{} has no text".format(name))
+        index = TextIndex(*self.text_keys[name])
+        found = {}
+        for obj in self.all(cls).values():
+            found[obj.id] = obj
+            index.add(obj.id, obj)
+        return [(found[key], score)
+                for key, score in index.search(text, limit)]
+
+    def having(self, cls, attr, tree):
+        """
+        Returns the list of instances of cls whose list attribute attr
+        holds values fulfilling the expression tree returned by
+        models.engine.query.parse_members
+        """
+        found = []
+        for obj in self.all(cls).values():
+            values = getattr(obj, attr, None)
+            if holds(tree, values if type(values) is list else ()):
+                found.append(obj)
+        return found
+
+    def aggregate(self, cls, group, attr=None):
+        """
+        Returns a dictionary of the statistics of the instances of cls
+        grouped by their attribute group: for each value of group, the
+        number of instances and, when attr is given, the min, max and
+        avg of their numeric values of attr
+        """
+        return self.__aggregate(cls, group, attr).groups()
+
+    def group_stats(self, cls, group, value, attr=None):
+        """
+        Returns the statistics of the instances of cls whose attribute
+        group is value, as aggregate() does for each group
+        """
+        return self.__aggregate(cls, group, attr).get(value)
+
+    def __aggregate(self, cls, group, attr):
+        """
+        Returns an Aggregate of the instances of cls
+        """
+        found = Aggregate(group, attr)
+        for obj in self.iterate(cls):
+            found.add(obj.id, obj)
+        return found
+
+    def columns(self, cls):
+        """
+        Returns a Table holding the declared attributes of the instances
+        of cls as columns, its rows being the instances
+        """
+        name = cls if type(cls) is str else cls.__name__
+        return Table(registry.get(name), self.all(cls).values())
+
+    def begin(self):
+        """
+        Starts batching the saves
+        """
+        self.__batch = True
+        self.__deferred = 0
+        self.__written_at = monotonic()
+
+    def commit(self):
+        """
+        Stops batching the saves and writes the batched changes
+        """
+        if not self.__batch:
+            return
+        self.__batch = False
+        self.save()
+
+    def defer_save(self):
+        """
+        Returns True if the save being done must be skipped because it
+        is batched, False if it must write because batch_size saves
+        piled up or batch_interval seconds passed since the last write
+        """
+        if not self.__batch:
+            return False
+        self.__deferred += 1
+        if (self.__deferred < self.batch_size and
+                monotonic() - self.__written_at < self.batch_interval):
+            return True
+        self.__deferred = 0
+        self.__written_at = monotonic()
+        return False
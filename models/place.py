@@ -4,6 +4,9 @@ This module defines a class called Place that inherits
 from the BaseModel class
 """
 from models.base_model import BaseModel
+from models.relationships import BelongsTo
+from models.relationships import HasMany
+from models.relationships import HasManyIds
 
 
 class Place(BaseModel):
@@ -22,3 +25,7 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+    city = BelongsTo("City", "city_id")
+    user = BelongsTo("User", "user_id")
+    reviews = HasMany("Review", "place_id")
+    amenities = HasManyIds("Amenity", "amenity_ids")
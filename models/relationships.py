@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+This module contains the relationships between the model classes of the
+AirBnB project, like the Cities of a State or the Reviews of a Place.
+
+A relationship is a read-only attribute of a model class. Reading it on
+an instance asks models.storage for the related instances, which the
+storage engines answer from their foreign key indexes. To read the same
+relationship of many instances, storage.prefetch(instances, name)
+resolves it for all of them at once with a single find_in() call
+instead of one lookup per instance.
+"""
+import models
+
+
+class Relationship:
+    """
+    This class defines the behaviour shared by all relationships
+    """
+
+    def __init__(self, cls, key):
+        """
+        This method instantiates a relationship with the class named cls
+        through the attribute key
+        """
+        self.cls = cls
+        self.key = key
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        """
+        This method records the name of the relationship in its class
+        """
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        """
+        This method returns the related instances of obj, or the
+        relationship itself when read on the class
+        """
+        if obj is None:
+            return self
+        return self.prefetch(models.storage, [obj])[obj.id]
+
+    def prefetch(self, storage, objs):
+        """
+        Returns a dictionary mapping the id of each instance of objs to
+        its related instances, read from storage
+        """
+        raise NotImplementedError
+
+
+class HasMany(Relationship):
+    """
+    This class defines the relationship with the instances of cls whose
+    attribute key holds the id of the instance, like the Cities of a
+    State, as a list
+    """
+
+    def prefetch(self, storage, objs):
+        """
+        Returns a dictionary mapping the id of each instance of objs to
+        the list of the instances of cls referencing it
+        """
+        found = storage.find_in(self.cls, self.key, {obj.id for obj in objs})
+        return {obj.id: found.get(obj.id, []) for obj in objs}
+
+
+class BelongsTo(Relationship):
+    """
+    This class defines the relationship with the instance of cls whose
+    id is held by the attribute key, like the State of a City, as that
+    instance or None
+    """
+
+    def prefetch(self, storage, objs):
+        """
+        Returns a dictionary mapping the id of each instance of objs to
+        the instance of cls it references, or None
+        """
+        ids = {getattr(obj, self.key, None) for obj in objs}
+        ids.discard(None)
+        found = storage.find_in(self.cls, "id", ids)
+        return {obj.id: found.get(getattr(obj, self.key, None), [None])[0]
+                for obj in objs}
+
+
+class HasManyIds(Relationship):
+    """
+    This class defines the relationship with the instances of cls whose
+    ids are held in the list attribute key, like the Amenities of a
+    Place, as a list
+    """
+
+    def prefetch(self, storage, objs):
+        """
+        Returns a dictionary mapping the id of each instance of objs to
+        the list of the instances of cls it references, in the order of
+        their ids
+        """
+        lists = {obj.id: self.__ids(obj) for obj in objs}
+        found = storage.find_in(self.cls, "id", {
+                id for ids in lists.values() for id in ids})
+        return {obj.id: [found[id][0] for id in lists[obj.id] if id in found]
+                for obj in objs}
+
+    def __ids(self, obj):
+        """
+        Returns the ids held in the attribute key of obj
+        """
+        ids = getattr(obj, self.key, None)
+        if type(ids) is not list:
+            return []
+        return [id for id in ids if type(id) is str]
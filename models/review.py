@@ -4,6 +4,7 @@ This module defines a class called Review that inherits
 from the BaseModel class
 """
 from models.base_model import BaseModel
+from models.relationships import BelongsTo
 
 
 class Review(BaseModel):
@@ -14,3 +15,5 @@ class Review(BaseModel):
     place_id = ""
     user_id = ""
     text = ""
+    place = BelongsTo("Place", "place_id")
+    user = BelongsTo("User", "user_id")
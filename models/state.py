@@ -4,6 +4,7 @@ This module defines a class called State that inherits
 from the BaseModel class
 """
 from models.base_model import BaseModel
+from models.relationships import HasMany
 
 
 class State(BaseModel):
@@ -12,3 +13,4 @@ class State(BaseModel):
     a BaseModel class.
     """
     name = ""
+    cities = HasMany("City", "state_id")
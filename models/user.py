@@ -3,6 +3,7 @@
 This module defines a User class that inherits from BaseModel.
 """
 from models.base_model import BaseModel
+from models.relationships import HasMany
 
 
 class User(BaseModel):
@@ -15,3 +16,5 @@ class User(BaseModel):
     password = ""
     first_name = ""
     last_name = ""
+    places = HasMany("Place", "user_id")
+    reviews = HasMany("Review", "user_id")
@@ -8,6 +8,9 @@ Desc: This module contains all possible testcases for the base_model.py
 import unittest
 import models
 from models.base_model import BaseModel
+from models.base_model import registry
+from models.base_model import epoch_micros
+from models.base_model import parse_datetime
 from datetime import datetime as dt
 from time import sleep as sp
 import os
@@ -203,6 +206,22 @@ class TestBaseModelSaveMethod(unittest.TestCase):
         with self.assertRaises(TypeError):
             b.save(None)
 
+    def test_save_after_delete(self):
+        b = BaseModel()
+        b.save()
+        models.storage.delete(b)
+        models.storage.save()
+        b.save()
+        self.assertIsNone(models.storage.get(BaseModel, b.id))
+        with open("file.json", "r") as f:
+            self.assertNotIn(b.id, f.read())
+
+    def test_save_unregistered(self):
+        b = BaseModel(id="unregistered", created_at="2024-01-01T00:00:00",
+                      updated_at="2024-01-01T00:00:00")
+        b.save()
+        self.assertIsNone(models.storage.get(BaseModel, b.id))
+
     def test_save_updates_file(self):
         b = BaseModel()
         b.save()
@@ -211,5 +230,68 @@ class TestBaseModelSaveMethod(unittest.TestCase):
             self.assertIn(bid, f.read())
 
 
+class TestBaseModelRegistry(unittest.TestCase):
+    """
+    This class provides all possible test cases for the registry of
+    model classes.
+    """
+
+    def test_models_are_registered(self):
+        for name in ("BaseModel", "User", "State", "City", "Amenity",
+                     "Place", "Review"):
+            self.assertIn(name, registry)
+            self.assertEqual(registry[name].__name__, name)
+
+    def test_registered_class_is_the_model(self):
+        self.assertIs(registry["BaseModel"], BaseModel)
+
+    def test_subclass_is_registered(self):
+        class Booking(BaseModel):
+            pass
+        try:
+            self.assertIs(registry["Booking"], Booking)
+        finally:
+            del registry["Booking"]
+
+    def test_subclass_not_registered(self):
+        class Draft(BaseModel, register=False):
+            pass
+        self.assertNotIn("Draft", registry)
+
+
+class TestBaseModelDatetimeCodec(unittest.TestCase):
+    """
+    This class provides all possible test cases for the functions
+    reading and writing the dates of BaseModel.
+    """
+
+    def test_parse_iso(self):
+        ts = dt.now()
+        self.assertEqual(parse_datetime(ts.isoformat()), ts)
+
+    def test_parse_iso_without_microseconds(self):
+        ts = dt(2017, 9, 28, 21, 5, 54)
+        self.assertEqual(parse_datetime(ts.isoformat()), ts)
+
+    def test_parse_epoch_micros(self):
+        self.assertEqual(parse_datetime(0), dt(1970, 1, 1))
+        ts = dt.now()
+        self.assertEqual(parse_datetime(epoch_micros(ts)), ts)
+
+    def test_epoch_micros(self):
+        self.assertEqual(epoch_micros(dt(1970, 1, 1, 0, 0, 1, 5)), 1000005)
+
+    def test_parse_None(self):
+        with self.assertRaises(TypeError):
+            parse_datetime(None)
+
+    def test_creation_with_epoch_micros(self):
+        ts = dt.now()
+        b = BaseModel(id="1", created_at=epoch_micros(ts),
+                      updated_at=ts.isoformat())
+        self.assertEqual(b.created_at, ts)
+        self.assertEqual(b.updated_at, ts)
+
+
 if __name__ == "__main__":
     unittest.main()
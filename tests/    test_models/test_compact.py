@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+
+"""
+File: test_compact.py
+Desc: This module contains all possible testcases for the compact.py
+      modlue in the models package. It uses the standard unittest
+"""
+import unittest
+import os
+import pickle
+import models
+from models.compact import compact
+from models.compact import declared_attributes
+from models.engine.file_storage import FileStorage
+from models.base_model import BaseModel
+from models.place import Place
+from models.user import User
+from datetime import datetime as dt
+
+
+class TestDeclaredAttributes(unittest.TestCase):
+    """
+    This class provides all possible test cases for function
+    declared_attributes.
+    """
+
+    def test_base_model(self):
+        self.assertEqual(declared_attributes(BaseModel), {})
+
+    def test_user(self):
+        self.assertEqual(declared_attributes(User), {
+            "email": "", "password": "", "first_name": "", "last_name": ""})
+
+    def test_place_keeps_order(self):
+        self.assertEqual(list(declared_attributes(Place))[:3],
+                         ["city_id", "user_id", "name"])
+
+
+class TestCompactClass(unittest.TestCase):
+    """
+    This class provides all possible test cases for the classes made
+    by function compact.
+    """
+
+    def setUp(self):
+        self.ts = dt.now()
+        self.place = compact(Place)(
+            id="1", created_at=self.ts.isoformat(),
+            updated_at=self.ts.isoformat(), name="Loft", max_guest=4,
+            __class__="Place")
+
+    def test_same_class_twice(self):
+        self.assertIs(compact(Place), compact(Place))
+
+    def test_class_name(self):
+        self.assertEqual(type(self.place).__name__, "Place")
+        self.assertEqual(type(self.place).__qualname__, "Place.Compact")
+        self.assertIs(Place.Compact, compact(Place))
+
+    def test_pickle(self):
+        self.place.nickname = "loft"
+        copy = pickle.loads(pickle.dumps(self.place))
+        self.assertIs(type(copy), compact(Place))
+        self.assertEqual(copy.to_dict(), self.place.to_dict())
+
+    def test_no_instance_dictionary(self):
+        self.assertEqual(type(self.place).__dictoffset__, 0)
+        self.assertNotEqual(Place.__dictoffset__, 0)
+
+    def test_attributes(self):
+        self.assertEqual(self.place.id, "1")
+        self.assertEqual(self.place.created_at, self.ts)
+        self.assertEqual(self.place.name, "Loft")
+        self.assertEqual(self.place.max_guest, 4)
+
+    def test_defaults(self):
+        self.assertEqual(self.place.city_id, "")
+        self.assertEqual(self.place.latitude, 0.0)
+        self.assertEqual(self.place.amenity_ids, [])
+
+    def test_overflow_attributes(self):
+        self.assertIsNone(self.place._extra)
+        self.place.nickname = "nest"
+        self.assertEqual(self.place.nickname, "nest")
+        self.assertEqual(self.place._extra, {"nickname": "nest"})
+        del self.place.nickname
+        with self.assertRaises(AttributeError):
+            self.place.nickname
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            self.place.nickname
+
+    def test_dict(self):
+        self.place.nickname = "nest"
+        self.assertEqual(self.place.__dict__, {
+            "id": "1", "created_at": self.ts, "updated_at": self.ts,
+            "name": "Loft", "max_guest": 4, "nickname": "nest"})
+
+    def test_to_dict_same_as_model(self):
+        place = Place(**self.place.to_dict())
+        self.assertEqual(self.place.to_dict(), place.to_dict())
+
+    def test_str_same_as_model(self):
+        place = Place(**self.place.to_dict())
+        self.assertEqual(str(self.place), str(place))
+
+    def test_creation_without_kwargs(self):
+        place = compact(Place)()
+        self.assertEqual(type(place.created_at), dt)
+        self.assertIs(models.storage.get(Place, place.id), place)
+        models.storage.delete(place)
+
+    def test_smaller_than_model(self):
+        import sys
+        place = Place(**self.place.to_dict())
+        self.assertLess(sys.getsizeof(self.place),
+                        sys.getsizeof(place) + sys.getsizeof(place.__dict__))
+
+
+class TestCompactStorage(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the compact
+    classes in class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__compact = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_compact_instances(self):
+        pl = Place()
+        pl.city_id = "c1"
+        pl.rating = 5
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__compact = True
+        models.storage.reload()
+        reloaded = models.storage.get(Place, pl.id)
+        self.assertIs(type(reloaded), compact(Place))
+        self.assertEqual(reloaded.to_dict(), pl.to_dict())
+        self.assertEqual(models.storage.find(Place, city_id="c1"),
+                         [reloaded])
+
+    def test_compact_instance_changes_are_saved(self):
+        pl = Place()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__compact = True
+        models.storage.reload()
+        reloaded = models.storage.get(Place, pl.id)
+        reloaded.city_id = "c2"
+        reloaded.save()
+        FileStorage._FileStorage__compact = False
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(models.storage.get(Place, pl.id).city_id, "c2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+"""
+File: test_aggregates.py
+Desc: This module contains all possible testcases for the aggregates.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+from models.engine.aggregates import Aggregate
+from models.place import Place
+from models.review import Review
+
+
+class TestAggregate(unittest.TestCase):
+    """
+    This class provides all possible test cases for class Aggregate.
+    """
+
+    def setUp(self):
+        self.aggregate = Aggregate("city_id", "price_by_night")
+        self.places = {}
+        for id, city, price in (("p1", "c1", 100), ("p2", "c1", 50),
+                                ("p3", "c1", 100), ("p4", "c2", 80),
+                                ("p5", "c2", "free")):
+            pl = Place(id=id, city_id=city, price_by_night=price)
+            self.places[id] = pl
+            self.aggregate.add("Place." + id, pl)
+
+    def test_get(self):
+        self.assertEqual(self.aggregate.get("c1"),
+                         {"count": 3, "min": 50, "max": 100,
+                          "avg": 250 / 3})
+        self.assertEqual(self.aggregate.get("c2"),
+                         {"count": 2, "min": 80, "max": 80, "avg": 80})
+        self.assertEqual(self.aggregate.get("c3"),
+                         {"count": 0, "min": None, "max": None,
+                          "avg": None})
+
+    def test_groups(self):
+        self.assertEqual(sorted(self.aggregate.groups()), ["c1", "c2"])
+        self.assertEqual(self.aggregate.groups()["c2"]["count"], 2)
+
+    def test_count_only(self):
+        aggregate = Aggregate("place_id")
+        aggregate.add("Review.r1", Review(id="r1", place_id="p1"))
+        aggregate.add("Review.r2", Review(id="r2", place_id="p1"))
+        self.assertEqual(aggregate.groups(), {"p1": {"count": 2}})
+
+    def test_update(self):
+        self.aggregate.get("c1")
+        pl = self.places["p2"]
+        self.aggregate.update("Place.p2", pl, "c2")
+        pl.city_id = "c2"
+        self.assertEqual(self.aggregate.get("c1"),
+                         {"count": 2, "min": 100, "max": 100, "avg": 100})
+        self.assertEqual(self.aggregate.get("c2")["min"], 50)
+        pl.price_by_night = 90
+        self.aggregate.update("Place.p2", pl, 90)
+        self.assertEqual(self.aggregate.get("c2")["min"], 80)
+        self.assertEqual(self.aggregate.get("c2")["avg"], 85)
+
+    def test_remove(self):
+        self.aggregate.remove("Place.p2")
+        self.assertEqual(self.aggregate.get("c1")["min"], 100)
+        self.aggregate.remove("Place.p4")
+        self.assertEqual(self.aggregate.get("c2"),
+                         {"count": 1, "min": None, "max": None,
+                          "avg": None})
+        self.aggregate.remove("Place.p5")
+        self.assertNotIn("c2", self.aggregate.groups())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+
+"""
+File: test_columns.py
+Desc: This module contains all possible testcases for the columns.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+from unittest.mock import patch
+from models.engine import columns
+from models.engine.aggregates import Aggregate
+from models.engine.columns import Table
+from models.engine.query import matches
+from models.place import Place
+
+
+class TestTable(unittest.TestCase):
+    """
+    This class provides all possible test cases for class Table.
+    """
+
+    def setUp(self):
+        self.places = []
+        for i in range(12):
+            pl = Place(id="p{}".format(i), city_id="c{}".format(i % 3),
+                       price_by_night=i * 10, latitude=i / 2,
+                       max_guest=i % 4)
+            self.places.append(pl)
+        self.places[3].price_by_night = "free"
+        self.places[4].city_id = None
+        self.places[5].nickname = "loft"
+        self.table = Table(Place, self.places)
+
+    def ids(self, objects):
+        return [obj.id for obj in objects]
+
+    def test_rows_are_instances(self):
+        self.assertEqual(len(self.table), 12)
+        self.assertIs(self.table[2], self.places[2])
+
+    def test_columns(self):
+        self.assertIn("price_by_night", self.table.columns)
+        self.assertIn("city_id", self.table.columns)
+        self.assertIn("id", self.table.columns)
+        self.assertNotIn("amenity_ids", self.table.columns)
+
+    def test_select_matches_objects(self):
+        for conditions in ([("price_by_night", ">=", 40)],
+                           [("price_by_night", "!=", 50),
+                            ("city_id", "==", "c1")],
+                           [("city_id", "<", "c2"), ("max_guest", ">", 0)],
+                           [("city_id", "==", "c9")],
+                           [("price_by_night", "==", "free")],
+                           [("nickname", "==", "loft")],
+                           [("latitude", "<=", 2.5), ("id", ">", "p1")],
+                           []):
+            self.assertEqual(
+                    self.ids(self.table.select(conditions)),
+                    self.ids(pl for pl in self.places
+                             if matches(pl, conditions)))
+
+    def test_count(self):
+        self.assertEqual(self.table.count(), 12)
+        self.assertEqual(self.table.count([("max_guest", "==", 0)]), 3)
+
+    def test_stats(self):
+        self.assertEqual(self.table.stats("price_by_night",
+                                          [("max_guest", ">", 0)]),
+                         {"count": 9, "min": 10, "max": 110,
+                          "avg": 510 / 8})
+        self.assertEqual(self.table.stats("price_by_night",
+                                          [("city_id", "==", "c9")]),
+                         {"count": 0, "min": None, "max": None,
+                          "avg": None})
+        self.assertEqual(self.table.stats("name")["count"], 12)
+        self.assertIsNone(self.table.stats("name")["avg"])
+
+    def test_groups_match_aggregate(self):
+        for conditions in ([], [("id", "!=", "p3"), ("id", "!=", "p4")]):
+            for attr in ("price_by_night", "latitude", None):
+                aggregate = Aggregate("city_id", attr)
+                for pl in self.places:
+                    if matches(pl, conditions):
+                        aggregate.add(pl.id, pl)
+                found = aggregate.groups()
+                if attr is None:
+                    found = {key: {"count": stats["count"]}
+                             for key, stats in found.items()}
+                self.assertEqual(
+                        self.table.groups("city_id", attr, conditions),
+                        found)
+
+    def test_groups_conditions(self):
+        self.assertEqual(
+                self.table.groups("city_id", "price_by_night",
+                                  [("price_by_night", "<", 60)]),
+                {"c0": {"count": 1, "min": 0, "max": 0, "avg": 0},
+                 "c1": {"count": 1, "min": 10, "max": 10, "avg": 10},
+                 "c2": {"count": 2, "min": 20, "max": 50, "avg": 35},
+                 None: {"count": 1, "min": 40, "max": 40, "avg": 40}})
+
+    def test_without_numpy(self):
+        conditions = [("city_id", ">=", "c1"), ("price_by_night", "<", 100)]
+        expected = (self.ids(self.table.select(conditions)),
+                    self.table.stats("latitude", conditions),
+                    self.table.groups("city_id", "price_by_night"))
+        with patch.object(columns, "numpy", None):
+            table = Table(Place, self.places)
+            self.assertEqual((self.ids(table.select(conditions)),
+                              table.stats("latitude", conditions),
+                              table.groups("city_id", "price_by_night")),
+                             expected)
+
+    def test_empty(self):
+        table = Table(Place, [])
+        self.assertEqual(table.select([("max_guest", ">", 1)]), [])
+        self.assertEqual(table.groups("city_id"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
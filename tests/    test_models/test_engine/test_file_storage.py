@@ -15,7 +15,9 @@ from models.review import Review
 from models.user import User
 from models.state import State
 import os
+import json
 from datetime import datetime
+from unittest.mock import patch
 import models
 
 
@@ -81,9 +83,238 @@ class TestFileStorageMethods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
+    def test_all_with_None(self):
+        self.assertIs(models.storage.all(None), models.storage.all())
+
+    def test_all_with_two_args(self):
         with self.assertRaises(TypeError):
-            models.storage.all(None)
+            models.storage.all(None, 1)
+
+    def test_all_with_class(self):
+        us = User()
+        st = State()
+        self.assertEqual(models.storage.all(User), {"User." + us.id: us})
+        self.assertEqual(models.storage.all("State"), {"State." + st.id: st})
+        self.assertEqual(models.storage.all(Review), {})
+
+    def test_all_with_class_is_a_copy(self):
+        us = User()
+        models.storage.all(User).clear()
+        self.assertIn("User." + us.id, models.storage.all(User))
+
+    def test_count(self):
+        User()
+        User()
+        City()
+        self.assertEqual(models.storage.count(User), 2)
+        self.assertEqual(models.storage.count("City"), 1)
+        self.assertEqual(models.storage.count(Place), 0)
+        self.assertEqual(models.storage.count(), 3)
+
+    def test_find(self):
+        cy = City()
+        cy.state_id = "CA"
+        rv1 = Review()
+        rv1.place_id = "p1"
+        rv1.user_id = "u1"
+        rv2 = Review()
+        rv2.place_id = "p1"
+        rv2.user_id = "u2"
+        self.assertEqual(models.storage.find(City, state_id="CA"), [cy])
+        self.assertCountEqual(models.storage.find(Review, place_id="p1"),
+                              [rv1, rv2])
+        self.assertEqual(models.storage.find("Review", place_id="p1",
+                                             user_id="u2"), [rv2])
+        self.assertEqual(models.storage.find(Review, place_id="p2"), [])
+
+    def test_find_follows_updates(self):
+        pl = Place()
+        pl.city_id = "c1"
+        pl.city_id = "c2"
+        self.assertEqual(models.storage.find(Place, city_id="c1"), [])
+        self.assertEqual(models.storage.find(Place, city_id="c2"), [pl])
+
+    def test_find_after_delete(self):
+        cy = City()
+        cy.state_id = "CA"
+        models.storage.delete(cy)
+        self.assertEqual(models.storage.find(City, state_id="CA"), [])
+
+    def test_find_unindexed_attribute(self):
+        st = State()
+        st.name = "Nevada"
+        State()
+        self.assertEqual(models.storage.find(State, name="Nevada"), [st])
+
+    def test_near(self):
+        paris = Place()
+        paris.latitude = 48.8566
+        paris.longitude = 2.3522
+        london = Place()
+        london.latitude = 51.5074
+        london.longitude = -0.1278
+        Place()
+        found = models.storage.near(Place, 48.85, 2.35, 400)
+        self.assertEqual([pl for pl, distance in found], [paris, london])
+        self.assertAlmostEqual(found[1][1], 344, places=0)
+        london.latitude = 48.86
+        london.longitude = 2.35
+        found = models.storage.near("Place", 48.85, 2.35, 5)
+        self.assertEqual(len(found), 2)
+        models.storage.delete(paris)
+        found = models.storage.near(Place, 48.85, 2.35, 5)
+        self.assertEqual([pl for pl, distance in found], [london])
+        with self.assertRaises(ValueError):
+            models.storage.near(User, 0, 0, 5)
+
+    def test_having(self):
+        pl1 = Place()
+        pl1.amenity_ids = ["wifi", "pool"]
+        pl2 = Place()
+        pl2.amenity_ids = ["wifi"]
+        Place()
+        tree = ("and", "wifi", ("not", "pool"))
+        self.assertEqual(models.storage.having(Place, "amenity_ids", tree),
+                         [pl2])
+        pl2.amenity_ids = ["wifi", "pool"]
+        self.assertEqual(models.storage.having("Place", "amenity_ids",
+                                               tree), [])
+        models.storage.delete(pl1)
+        self.assertEqual(models.storage.having(Place, "amenity_ids", "pool"),
+                         [pl2])
+        pl2.amenity_ids.append("spa")
+        pl2.save()
+        self.assertEqual(models.storage.having(Place, "amenity_ids", "spa"),
+                         [pl2])
+        st = State()
+        st.tags = ["west"]
+        self.assertEqual(models.storage.having(State, "tags", "west"), [st])
+
+    def test_aggregate(self):
+        pl1 = Place()
+        pl1.city_id = "c1"
+        pl1.price_by_night = 100
+        pl2 = Place()
+        pl2.city_id = "c1"
+        pl2.price_by_night = 60
+        rv = Review()
+        rv.place_id = pl1.id
+        self.assertEqual(models.storage.group_stats(Place, "city_id", "c1",
+                                                    "price_by_night"),
+                         {"count": 2, "min": 60, "max": 100, "avg": 80})
+        self.assertEqual(models.storage.aggregate(Review, "place_id"),
+                         {pl1.id: {"count": 1}})
+        pl2.price_by_night = 20
+        models.storage.delete(pl1)
+        self.assertEqual(models.storage.group_stats(Place, "city_id", "c1",
+                                                    "price_by_night"),
+                         {"count": 1, "min": 20, "max": 20, "avg": 20})
+        self.assertEqual(models.storage.aggregate("Place", "city_id"),
+                         {"c1": {"count": 1}})
+        self.assertEqual(models.storage.aggregate(Place, "user_id",
+                                                  "max_guest"),
+                         {"": {"count": 1, "min": 0, "max": 0, "avg": 0}})
+
+    def test_aggregate_reads_no_instance(self):
+        for price in (10, 20, 30):
+            pl = Place()
+            pl.city_id = "c1"
+            pl.price_by_night = price
+        models.storage.aggregate(Place, "city_id", "price_by_night")
+        with patch("models.engine.aggregates.is_number") as is_number:
+            stats = models.storage.group_stats(Place, "city_id", "c1",
+                                               "price_by_night")
+        self.assertEqual(stats["avg"], 20)
+        is_number.assert_not_called()
+
+    def test_find_in(self):
+        cy1 = City()
+        cy1.state_id = "CA"
+        cy2 = City()
+        cy2.state_id = "NV"
+        City()
+        found = models.storage.find_in(City, "state_id", ["CA", "NV", "TX"])
+        self.assertEqual(found, {"CA": [cy1], "NV": [cy2]})
+        found = models.storage.find_in("City", "id", [cy1.id, "missing"])
+        self.assertEqual(found, {cy1.id: [cy1]})
+        cy2.name = "Reno"
+        self.assertEqual(models.storage.find_in(City, "name", ["Reno"]),
+                         {"Reno": [cy2]})
+
+    def test_columns(self):
+        pl1 = Place()
+        pl1.price_by_night = 100
+        pl2 = Place()
+        pl2.price_by_night = 60
+        table = models.storage.columns(Place)
+        self.assertIs(models.storage.columns("Place"), table)
+        self.assertEqual(table.select([("price_by_night", ">", 80)]), [pl1])
+        pl2.price_by_night = 200
+        table = models.storage.columns(Place)
+        self.assertEqual(table.stats("price_by_night")["max"], 200)
+        models.storage.delete(pl1)
+        pl3 = Place()
+        self.assertEqual(models.storage.columns(Place).select([]),
+                         [pl2, pl3])
+        self.assertEqual(len(models.storage.columns(City)), 0)
+
+    def test_find_after_reload(self):
+        cy = City()
+        cy.state_id = "CA"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.find(City, state_id="CA")
+        self.assertEqual([c.id for c in found], [cy.id])
+
+    def test_get(self):
+        us = User()
+        self.assertIs(models.storage.get(User, us.id), us)
+        self.assertIs(models.storage.get("User", us.id), us)
+        self.assertIsNone(models.storage.get(State, us.id))
+        self.assertIsNone(models.storage.get(User, "missing"))
+
+    def test_delete_updates_class_index(self):
+        us = User()
+        models.storage.delete(us)
+        self.assertEqual(models.storage.count(User), 0)
+        self.assertNotIn(us, models.storage.all().values())
+
+    def test_class_index_follows_deleted_keys(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        del models.storage.all()["User." + us.id]
+        self.assertEqual(models.storage.count(User), 0)
+        self.assertEqual(models.storage.all(User), {})
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(list(json.load(f)), ["State." + st.id])
+
+    def test_class_index_follows_added_keys(self):
+        us = User(id="42", created_at=datetime.now().isoformat(),
+                  updated_at=datetime.now().isoformat())
+        models.storage.all()["User.42"] = us
+        self.assertEqual(models.storage.all(User), {"User.42": us})
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertIn("User.42", json.load(f))
+
+    def test_class_index_follows_replaced_objects(self):
+        User()
+        FileStorage._FileStorage__objects = {}
+        self.assertEqual(models.storage.count(User), 0)
+        us = User()
+        self.assertEqual(models.storage.all(User), {"User." + us.id: us})
+
+    def test_reload_builds_class_index(self):
+        us = User()
+        pl = Place()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(list(models.storage.all(Place)), ["Place." + pl.id])
+        self.assertEqual(models.storage.count(User), 1)
 
     def test_new(self):
         bm = BaseModel()
@@ -185,5 +416,731 @@ class TestFileStorageMethods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorageJournal(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the journaled
+    save mode of class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__journal = True
+
+    def tearDown(self):
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_size = 0
+        FileStorage._FileStorage__pending.clear()
+        for path in ("file.json", "file.json.journal"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def journal_lines(self):
+        with open("file.json.journal", "r") as f:
+            return f.readlines()
+
+    def test_first_save_writes_snapshot(self):
+        bm = BaseModel()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.journal"))
+        with open("file.json", "r") as f:
+            self.assertIn("BaseModel." + bm.id, f.read())
+
+    def test_save_appends_only_changes(self):
+        BaseModel()
+        models.storage.save()
+        us = User()
+        models.storage.save()
+        lines = self.journal_lines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn("User." + us.id, lines[0])
+        with open("file.json", "r") as f:
+            self.assertNotIn("User." + us.id, f.read())
+
+    def test_update_and_delete_are_journaled(self):
+        st = State()
+        models.storage.save()
+        st.name = "California"
+        st.save()
+        models.storage.delete(st)
+        models.storage.save()
+        lines = self.journal_lines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("California", lines[0])
+        self.assertIn("null", lines[1])
+
+    def test_reload_replays_journal(self):
+        st = State()
+        cy = City()
+        models.storage.save()
+        st.name = "Nevada"
+        st.save()
+        models.storage.delete(cy)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = models.storage.all()
+        self.assertEqual(objs["State." + st.id].name, "Nevada")
+        self.assertNotIn("City." + cy.id, objs)
+
+    def test_reload_ignores_torn_record(self):
+        st = State()
+        models.storage.save()
+        am = Amenity()
+        models.storage.save()
+        with open("file.json.journal", "a") as f:
+            f.write('{"key": "User.1", "obj": {"__cla')
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("State." + st.id, models.storage.all())
+        self.assertIn("Amenity." + am.id, models.storage.all())
+        self.assertNotIn("User.1", models.storage.all())
+
+    def test_compaction_folds_journal_into_snapshot(self):
+        FileStorage._FileStorage__compact_after = 2
+        try:
+            BaseModel()
+            models.storage.save()
+            for i in range(3):
+                Review()
+                models.storage.save()
+        finally:
+            FileStorage._FileStorage__compact_after = 1000
+        self.assertFalse(os.path.exists("file.json.journal"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(len(models.storage.all()), 4)
+
+    def test_delete_with_None(self):
+        BaseModel()
+        models.storage.delete(None)
+        self.assertEqual(len(models.storage.all()), 1)
+
+
+class TestFileStorageDirtyTracking(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the tracking
+    of changed instances by class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_attribute_write_marks_dirty(self):
+        us = User()
+        models.storage.save()
+        us.first_name = "Betty"
+        self.assertIn("User." + us.id, FileStorage._FileStorage__pending)
+
+    def test_unregistered_instance_is_not_tracked(self):
+        us = User(id="42", created_at=datetime.now().isoformat(),
+                  updated_at=datetime.now().isoformat())
+        models.storage.save()
+        us.first_name = "Betty"
+        self.assertNotIn("User.42", FileStorage._FileStorage__pending)
+
+    def test_save_serializes_only_dirty_instances(self):
+        bm = BaseModel()
+        us = User()
+        models.storage.save()
+        us.email = "betty@hbnb.io"
+        with patch.object(BaseModel, "to_dict",
+                          autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            models.storage.save()
+        self.assertEqual(to_dict.call_count, 1)
+        self.assertIs(to_dict.call_args[0][0], us)
+
+    def test_saved_file_matches_instances(self):
+        bm = BaseModel()
+        pl = Place()
+        models.storage.save()
+        pl.name = "Lovely loft"
+        pl.number_rooms = 3
+        models.storage.delete(bm)
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved, {"Place." + pl.id: pl.to_dict()})
+
+    def test_epoch_datetime_codec(self):
+        us = User()
+        FileStorage._FileStorage__datetime_codec = "epoch"
+        try:
+            models.storage.save()
+        finally:
+            FileStorage._FileStorage__datetime_codec = "iso"
+        with open("file.json", "r") as f:
+            saved = json.load(f)["User." + us.id]
+        self.assertEqual(type(saved["created_at"]), int)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        reloaded = models.storage.get(User, us.id)
+        self.assertEqual(reloaded.created_at, us.created_at)
+        self.assertEqual(reloaded.updated_at, us.updated_at)
+
+    def test_changed_id_is_serialized(self):
+        bm = BaseModel()
+        models.storage.save()
+        old_key = "BaseModel." + bm.id
+        bm.id = "123456"
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(saved[old_key]["id"], "123456")
+
+
+class TestFileStorageLazyReload(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the lazy
+    reload mode of class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.pl = Place()
+        self.pl.city_id = "c1"
+        self.st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+
+    def tearDown(self):
+        FileStorage._FileStorage__lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_builds_no_instance(self):
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+
+    def test_count_without_building(self):
+        self.assertEqual(models.storage.count(), 3)
+        self.assertEqual(models.storage.count(User), 1)
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+
+    def test_get_builds_one_instance(self):
+        us = models.storage.get(User, self.us.id)
+        self.assertEqual(us.first_name, "Betty")
+        self.assertEqual(type(us.created_at), datetime)
+        self.assertEqual(list(FileStorage._FileStorage__objects),
+                         ["User." + self.us.id])
+        self.assertIs(models.storage.get(User, self.us.id), us)
+
+    def test_all_with_class_builds_its_instances(self):
+        self.assertEqual(list(models.storage.all(Place)),
+                         ["Place." + self.pl.id])
+        self.assertEqual(len(FileStorage._FileStorage__objects), 1)
+
+    def test_find_builds_its_instances(self):
+        found = models.storage.find(Place, city_id="c1")
+        self.assertEqual([pl.id for pl in found], [self.pl.id])
+
+    def test_all_builds_every_instance(self):
+        self.assertEqual(len(models.storage.all()), 3)
+        self.assertEqual(models.storage.count(), 3)
+
+    def test_iterate_builds_without_keeping(self):
+        found = list(models.storage.iterate(Place))
+        self.assertEqual([pl.id for pl in found], [self.pl.id])
+        self.assertEqual(type(found[0]), Place)
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        us = models.storage.get(User, self.us.id)
+        found = list(models.storage.iterate())
+        self.assertEqual(len(found), 3)
+        self.assertIn(us, found)
+        self.assertEqual(models.storage.count(), 3)
+
+    def test_iterate_after(self):
+        keys = list(models.storage.all())
+        found = list(models.storage.iterate(after=keys[0]))
+        self.assertEqual(["{}.{}".format(type(obj).__name__, obj.id)
+                          for obj in found], keys[1:])
+        self.assertEqual(list(models.storage.iterate(after=keys[-1])), [])
+        with self.assertRaises(KeyError):
+            list(models.storage.iterate(Place, after="Place.nothing"))
+
+    def test_save_keeps_unbuilt_records(self):
+        models.storage.get(User, self.us.id).last_name = "Holberton"
+        am = Amenity()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual(len(saved), 4)
+        self.assertEqual(saved["User." + self.us.id]["last_name"],
+                         "Holberton")
+        self.assertIn("State." + self.st.id, saved)
+        self.assertIn("Amenity." + am.id, saved)
+
+    def test_new_replaces_record(self):
+        st = State(**models.storage.get(State, self.st.id).to_dict())
+        models.storage.new(st)
+        self.assertEqual(models.storage.count(State), 1)
+        self.assertIs(models.storage.get(State, self.st.id), st)
+
+    def test_delete_record(self):
+        models.storage.delete(models.storage.get(State, self.st.id))
+        self.assertEqual(models.storage.count(State), 0)
+        self.assertEqual(models.storage.count(), 2)
+
+
+class TestFileStorageSearch(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the text
+    search of class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.rv1 = Review()
+        self.rv1.text = "Quiet flat, quiet street"
+        self.rv2 = Review()
+        self.rv2.text = "Loud street near the station"
+        Review()
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.text"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def search(self, cls, text):
+        return [obj.id for obj, score in models.storage.search(cls, text)]
+
+    def test_search(self):
+        self.assertEqual(self.search(Review, "quiet"), [self.rv1.id])
+        self.assertEqual(self.search(Review, "STREET station"),
+                         [self.rv2.id, self.rv1.id])
+        self.assertEqual(self.search("Review", "garden"), [])
+        self.assertEqual(self.search(Place, "quiet"), [])
+        with self.assertRaises(ValueError):
+            models.storage.search(User, "quiet")
+
+    def test_search_follows_changes(self):
+        self.search(Review, "quiet")
+        self.rv2.text = "Quiet garden"
+        self.assertEqual(self.search(Review, "garden"), [self.rv2.id])
+        models.storage.delete(self.rv1)
+        self.assertEqual(self.search(Review, "quiet"), [self.rv2.id])
+
+    def test_index_is_saved_once_searched(self):
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.text"))
+        self.search(Review, "quiet")
+        models.storage.save()
+        self.assertTrue(os.path.exists("file.json.text"))
+
+    def test_reload_reuses_saved_index(self):
+        self.search(Review, "quiet")
+        models.storage.save()
+        with open("file.json", "r") as f:
+            records = json.load(f)
+        records["Review." + self.rv2.id]["text"] = "Quiet garden"
+        with open("file.json", "w") as f:
+            json.dump(records, f)
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        with patch("models.engine.indexes.tokenize",
+                   wraps=models.engine.indexes.tokenize) as tokenize:
+            self.assertEqual(self.search(Review, "quiet"),
+                             [self.rv1.id, self.rv2.id])
+        # the search words and the changed review only
+        self.assertEqual(tokenize.call_count, 2)
+
+
+class TestFileStorageDurability(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the atomic
+    and durable writes of class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__durability = "none"
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_size = 0
+        FileStorage._FileStorage__pending.clear()
+        for path in ("file.json", "file.json.journal", "file.json.tmp"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_no_temporary_file_left(self):
+        BaseModel()
+        models.storage.save()
+        self.assertTrue(os.path.exists("file.json"))
+        self.assertFalse(os.path.exists("file.json.tmp"))
+
+    def test_failed_save_keeps_file(self):
+        us = User()
+        models.storage.save()
+        with open("file.json", "r") as f:
+            before = f.read()
+        State()
+        with patch.object(State, "to_dict", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(os.path.exists("file.json.tmp"))
+
+    def fsyncs(self, durability):
+        FileStorage._FileStorage__durability = durability
+        with patch("models.engine.file_storage.fsync") as fsync:
+            BaseModel()
+            models.storage.save()
+        return fsync.call_count
+
+    def test_durability_none(self):
+        self.assertEqual(self.fsyncs("none"), 0)
+
+    def test_durability_file(self):
+        self.assertEqual(self.fsyncs("file"), 1)
+
+    def test_durability_dir(self):
+        self.assertEqual(self.fsyncs("dir"), 2)
+
+    def test_unknown_durability(self):
+        FileStorage._FileStorage__durability = "always"
+        with self.assertRaises(ValueError):
+            models.storage.reload()
+
+    def test_failed_open_is_raised(self):
+        BaseModel()
+        with patch("models.engine.file_storage.open", create=True,
+                   side_effect=PermissionError):
+            with self.assertRaises(PermissionError):
+                models.storage.save()
+        self.assertFalse(os.path.exists("file.json.tmp"))
+
+    def test_journal_append_is_flushed(self):
+        FileStorage._FileStorage__journal = True
+        BaseModel()
+        models.storage.save()
+        self.assertEqual(self.fsyncs("file"), 1)
+        self.assertTrue(os.path.exists("file.json.journal"))
+
+    def test_journal_left_by_crash_is_harmless(self):
+        FileStorage._FileStorage__journal = True
+        st = State()
+        models.storage.save()
+        st.name = "Nevada"
+        models.storage.save()
+        st.name = "Texas"
+        with patch("models.engine.file_storage.remove"):
+            models.storage.compact()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(models.storage.get(State, st.id).name, "Texas")
+
+
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestFileStorageBatch(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the batched
+    saves of class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        models.storage.commit()
+        for name in ("batch_size", "batch_interval"):
+            models.storage.__dict__.pop(name, None)
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def saved_keys(self):
+        if not os.path.exists("file.json"):
+            return set()
+        with open("file.json", "r") as f:
+            return set(json.load(f))
+
+    def test_saves_deferred_until_commit(self):
+        models.storage.begin()
+        us = User()
+        us.save()
+        self.assertEqual(self.saved_keys(), set())
+        models.storage.commit()
+        self.assertEqual(self.saved_keys(), {"User." + us.id})
+
+    def test_commit_without_begin(self):
+        BaseModel()
+        models.storage.commit()
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_save_after_commit_writes(self):
+        models.storage.begin()
+        models.storage.commit()
+        us = User()
+        us.save()
+        self.assertEqual(self.saved_keys(), {"User." + us.id})
+
+    def test_batch_size_flushes(self):
+        models.storage.batch_size = 2
+        models.storage.begin()
+        first = User()
+        first.save()
+        self.assertEqual(self.saved_keys(), set())
+        second = User()
+        second.save()
+        self.assertEqual(self.saved_keys(),
+                         {"User." + first.id, "User." + second.id})
+        third = User()
+        third.save()
+        self.assertEqual(len(self.saved_keys()), 2)
+
+    def test_batch_interval_flushes(self):
+        models.storage.batch_interval = 0
+        models.storage.begin()
+        us = User()
+        us.save()
+        self.assertEqual(self.saved_keys(), {"User." + us.id})
+
+
+class TestFileStorageAsyncSave(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the saves
+    written in the background by class FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__async = True
+
+    def tearDown(self):
+        models.storage.flush()
+        FileStorage._FileStorage__async = False
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_size = 0
+        FileStorage._FileStorage__pending.clear()
+        for path in ("file.json", "file.json.journal", "file.json.tmp"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def saved_keys(self):
+        with open("file.json", "r") as f:
+            return set(json.load(f))
+
+    def test_flush_waits_for_save(self):
+        us = User()
+        us.save()
+        models.storage.flush()
+        self.assertEqual(self.saved_keys(), {"User." + us.id})
+        self.assertIsNone(FileStorage._FileStorage__writer)
+
+    def test_snapshot_is_consistent(self):
+        us = User()
+        us.first_name = "Betty"
+        us.save()
+        us.first_name = "Holberton"
+        models.storage.flush()
+        with open("file.json", "r") as f:
+            saved = json.load(f)["User." + us.id]
+        self.assertEqual(saved["first_name"], "Betty")
+
+    def test_many_saves(self):
+        users = [User() for i in range(20)]
+        for us in users:
+            us.save()
+        models.storage.flush()
+        self.assertEqual(self.saved_keys(),
+                         {"User." + us.id for us in users})
+
+    def test_journal_saves(self):
+        FileStorage._FileStorage__journal = True
+        us = User()
+        models.storage.save()
+        st = State()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        models.storage.flush()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(set(models.storage.all()), {"State." + st.id})
+
+    def test_flush_raises_write_error(self):
+        BaseModel()
+        with patch("models.engine.file_storage.replace",
+                   side_effect=OSError("disk full")):
+            models.storage.save()
+            with self.assertRaises(OSError):
+                models.storage.flush()
+        models.storage.flush()
+
+    def test_reload_flushes(self):
+        us = User()
+        us.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertIn("User." + us.id, models.storage.all())
+
+
+class TestFileStorageBinary(unittest.TestCase):
+    """
+    This class provides all possible test cases regarding the binary
+    snapshots of class FileStorage.
+    """
+
+    paths = ("file.hbnb", "file.hbnb.journal", "file.hbnb.tmp",
+             "file.hbnb.text")
+
+    def setUp(self):
+        FileStorage._FileStorage__file_path = "file.hbnb"
+        FileStorage._FileStorage__journal_path = "file.hbnb.journal"
+        FileStorage._FileStorage__text_path = "file.hbnb.text"
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage._FileStorage__file_path = "file.json"
+        FileStorage._FileStorage__journal_path = "file.json.journal"
+        FileStorage._FileStorage__text_path = "file.json.text"
+        FileStorage._FileStorage__journal = False
+        FileStorage._FileStorage__journal_size = 0
+        FileStorage._FileStorage__lazy = False
+        FileStorage._FileStorage__pending.clear()
+        for path in self.paths:
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_reload(self):
+        us = User()
+        us.email = "a@b.c"
+        pl = Place()
+        pl.user_id = us.id
+        pl.price_by_night = 80
+        pl.latitude = 1.5
+        pl.amenity_ids = ["a1"]
+        models.storage.save()
+        with open("file.hbnb", "rb") as f:
+            self.assertEqual(f.read(4), b"HBNB")
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        found = models.storage.get(Place, pl.id)
+        self.assertEqual(found.to_dict(), pl.to_dict())
+        self.assertEqual(found.created_at, pl.created_at)
+        self.assertEqual(models.storage.get(User, us.id).email, "a@b.c")
+
+    def test_save_reload_journal(self):
+        FileStorage._FileStorage__journal = True
+        st = State()
+        st.name = "Nevada"
+        models.storage.save()
+        st.name = "Texas"
+        models.storage.save()
+        self.assertTrue(os.path.exists("file.hbnb.journal"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(models.storage.get(State, st.id).name, "Texas")
+        models.storage.compact()
+        self.assertFalse(os.path.exists("file.hbnb.journal"))
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(models.storage.get(State, st.id).name, "Texas")
+
+    def test_lazy_records_saved(self):
+        for i in range(3):
+            City().name = str(i)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        models.storage.reload()
+        ct = models.storage.get(City, next(iter(
+            FileStorage._FileStorage__raw["City"].values()))["id"])
+        ct.name = "3"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual(sorted(obj.name for obj in
+                                models.storage.all(City).values()),
+                         ["1", "2", "3"])
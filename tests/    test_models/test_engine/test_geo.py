@@ -0,0 +1,56 @@
+#!/usr/bin/python3
+
+"""
+File: test_geo.py
+Desc: This module contains all possible testcases for the geo.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+from unittest.mock import patch
+from models.engine import geo
+from models.engine.geo import bounding_box
+from models.engine.geo import distances
+from models.engine.geo import within
+
+
+class TestGeo(unittest.TestCase):
+    """
+    This class provides all possible test cases for the functions of
+    geo.py.
+    """
+
+    def test_distances(self):
+        found = distances(48.8566, 2.3522, [51.5074, 48.8566, -48.8566],
+                          [-0.1278, 2.3522, -177.6478])
+        self.assertAlmostEqual(found[0], 343.56, places=1)
+        self.assertEqual(found[1], 0)
+        self.assertAlmostEqual(found[2], 20015.1, places=0)
+
+    def test_distances_without_numpy(self):
+        with patch.object(geo, "numpy", None):
+            found = distances(48.8566, 2.3522, [51.5074], [-0.1278])
+        self.assertAlmostEqual(found[0], 343.56, places=1)
+
+    def test_bounding_box(self):
+        low, high, west, east = bounding_box(0, 179.9, 111.2)
+        self.assertAlmostEqual(low, -1, places=2)
+        self.assertAlmostEqual(high, 1, places=2)
+        self.assertAlmostEqual(west, 178.9, places=2)
+        self.assertAlmostEqual(east, 180.9, places=2)
+        low, high, west, east = bounding_box(60, 0, 111.2)
+        self.assertAlmostEqual(east, 2.0, places=1)
+        low, high, west, east = bounding_box(89.5, 0, 100)
+        self.assertAlmostEqual(low, 88.6, places=2)
+        self.assertEqual((high, west, east), (90, None, None))
+
+    def test_within(self):
+        points = [("far", 10.0, 10.0), ("near", 0.01, 0.0),
+                  ("here", 0.0, 0.0)]
+        found = within(0.0, 0.0, 5, points)
+        self.assertEqual([obj for obj, distance in found], ["here", "near"])
+        self.assertAlmostEqual(found[1][1], 1.11, places=2)
+        self.assertEqual(within(0.0, 0.0, 5, []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
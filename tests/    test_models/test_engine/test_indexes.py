@@ -0,0 +1,314 @@
+#!/usr/bin/python3
+
+"""
+File: test_indexes.py
+Desc: This module contains all possible testcases for the indexes.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+from models.engine.indexes import BitmapIndex
+from models.engine.indexes import GridIndex
+from models.engine.indexes import HashIndex
+from models.engine.indexes import SortedIndex
+from models.engine.indexes import TextIndex
+from models.engine.indexes import is_number
+from models.engine.indexes import tokenize
+from models.engine.query import parse_members
+from models.city import City
+from models.place import Place
+from models.review import Review
+
+
+class TestHashIndex(unittest.TestCase):
+    """
+    This class provides all possible test cases for class HashIndex.
+    """
+
+    def setUp(self):
+        self.index = HashIndex("state_id")
+        self.c1 = City(id="1", state_id="CA")
+        self.c2 = City(id="2", state_id="CA")
+        self.c3 = City(id="3", state_id="NV")
+        self.index.add("City.1", self.c1)
+        self.index.add("City.2", self.c2)
+        self.index.add("City.3", self.c3)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup("==", "NV"), {"City.3": self.c3})
+        self.assertIsNone(self.index.lookup("<", "NV"))
+
+    def test_get(self):
+        self.assertEqual(self.index.get("CA"),
+                         {"City.1": self.c1, "City.2": self.c2})
+        self.assertEqual(self.index.get("NV"), {"City.3": self.c3})
+
+    def test_get_missing_value(self):
+        self.assertEqual(self.index.get("TX"), {})
+
+    def test_get_unhashable_value(self):
+        self.assertEqual(self.index.get(["CA"]), {})
+
+    def test_update(self):
+        self.index.update("City.1", self.c1, "NV")
+        self.assertEqual(self.index.get("CA"), {"City.2": self.c2})
+        self.assertEqual(self.index.get("NV"),
+                         {"City.1": self.c1, "City.3": self.c3})
+
+    def test_remove(self):
+        self.index.remove("City.3")
+        self.index.remove("City.4")
+        self.assertEqual(self.index.get("NV"), {})
+
+    def test_add_twice(self):
+        self.index.add("City.1", self.c1)
+        self.assertEqual(len(self.index.get("CA")), 2)
+
+    def test_unhashable_values_are_skipped(self):
+        c4 = City(id="4", state_id=["CA"])
+        self.index.add("City.4", c4)
+        self.index.remove("City.4")
+        self.assertEqual(len(self.index.get("CA")), 2)
+
+    def test_missing_attribute(self):
+        index = HashIndex("place_id")
+        index.add("City.1", self.c1)
+        self.assertEqual(index.get(None), {"City.1": self.c1})
+
+
+class TestSortedIndex(unittest.TestCase):
+    """
+    This class provides all possible test cases for class SortedIndex.
+    """
+
+    def setUp(self):
+        self.index = SortedIndex("price_by_night")
+        self.index.load = 2
+        self.places = {}
+        for i, price in enumerate((50, 120, 80, 80, 200, 10)):
+            self.add(str(i), price)
+        self.add("free", None)
+
+    def add(self, id, price):
+        pl = Place(id=id, price_by_night=price)
+        self.places[id] = pl
+        self.index.add("Place." + id, pl)
+
+    def ids(self, found):
+        return sorted(key.split(".")[1] for key in found)
+
+    def test_is_number(self):
+        self.assertTrue(is_number(1))
+        self.assertTrue(is_number(1.5))
+        self.assertFalse(is_number(True))
+        self.assertFalse(is_number(float("nan")))
+        self.assertFalse(is_number("1"))
+
+    def test_lookup(self):
+        self.assertEqual(self.ids(self.index.lookup("==", 80)), ["2", "3"])
+        self.assertEqual(self.ids(self.index.lookup("<", 80)), ["0", "5"])
+        self.assertEqual(self.ids(self.index.lookup("<=", 80)),
+                         ["0", "2", "3", "5"])
+        self.assertEqual(self.ids(self.index.lookup(">", 80)), ["1", "4"])
+        self.assertEqual(self.ids(self.index.lookup(">=", 200)), ["4"])
+        self.assertEqual(self.index.lookup(">", 500), {})
+        self.assertIsNone(self.index.lookup("!=", 80))
+        self.assertIsNone(self.index.lookup("<", "80"))
+
+    def test_scan_range(self):
+        count, keys = self.index.scan([("price_by_night", ">", 10),
+                                       ("price_by_night", "<=", 120),
+                                       ("max_guest", "==", 4)])
+        self.assertEqual(count, 4)
+        self.assertEqual(list(keys), ["Place.0", "Place.2", "Place.3",
+                                      "Place.1"])
+        count, keys = self.index.scan([("price_by_night", ">", 100),
+                                       ("price_by_night", "<", 50)])
+        self.assertEqual((count, list(keys)), (0, []))
+        self.assertIsNone(self.index.scan([("price_by_night", "<", None)]))
+
+    def test_ordered(self):
+        prices = [pl.price_by_night for pl in self.index.ordered()]
+        self.assertEqual(prices, [10, 50, 80, 80, 120, 200, None])
+        prices = [pl.price_by_night for pl in self.index.ordered(True)]
+        self.assertEqual(prices, [200, 120, 80, 80, 50, 10, None])
+
+    def test_update_and_remove(self):
+        self.index.lookup("<", 0)
+        pl = self.places["1"]
+        self.index.update("Place.1", pl, 5)
+        self.index.remove("Place.4")
+        self.add("6", 90)
+        self.add("7", 60)
+        self.index.update("Place.free", self.places["free"], 300)
+        prices = [self.index.scan([("price_by_night", "<", 1000)])[1]]
+        self.assertEqual(list(prices[0]),
+                         ["Place.1", "Place.5", "Place.0", "Place.7",
+                          "Place.2", "Place.3", "Place.6", "Place.free"])
+        self.assertEqual(self.ids(self.index.lookup("<", 10)), ["1"])
+
+
+class TestGridIndex(unittest.TestCase):
+    """
+    This class provides all possible test cases for class GridIndex.
+    """
+
+    def setUp(self):
+        self.index = GridIndex()
+        self.places = {}
+        for id, lat, lon in (("paris", 48.8566, 2.3522),
+                             ("versailles", 48.8049, 2.1204),
+                             ("london", 51.5074, -0.1278),
+                             ("fiji", -17.7134, 179.9),
+                             ("samoa", -17.7134, -179.9),
+                             ("nowhere", "north", 0.0)):
+            pl = Place(id=id, latitude=lat, longitude=lon)
+            self.places[id] = pl
+            self.index.add("Place." + id, pl)
+
+    def near(self, lat, lon, radius):
+        return [obj.id for obj, distance in
+                self.index.near(lat, lon, radius)]
+
+    def test_near(self):
+        self.assertEqual(self.near(48.8566, 2.3522, 30),
+                         ["paris", "versailles"])
+        self.assertEqual(self.near(48.8566, 2.3522, 400),
+                         ["paris", "versailles", "london"])
+        self.assertEqual(self.near(0, 0, 100), [])
+
+    def test_near_date_line(self):
+        self.assertEqual(self.near(-17.7134, 179.95, 50), ["fiji", "samoa"])
+
+    def test_near_pole(self):
+        pl = Place(id="pole", latitude=89.99, longitude=120.0)
+        self.index.add("Place.pole", pl)
+        self.assertEqual(self.near(89.99, -60.0, 10), ["pole"])
+
+    def test_update_and_remove(self):
+        london = self.places["london"]
+        self.index.update("Place.london", london, 48.86)
+        london.latitude = 48.86
+        london.longitude = 2.35
+        self.assertEqual(self.near(48.8566, 2.3522, 1), ["paris", "london"])
+        self.index.remove("Place.paris")
+        self.assertEqual(self.near(48.8566, 2.3522, 1), ["london"])
+        self.assertIsNone(self.index.scan([("latitude", "==", 1)]))
+
+
+class TestTextIndex(unittest.TestCase):
+    """
+    This class provides all possible test cases for class TextIndex.
+    """
+
+    def setUp(self):
+        self.index = TextIndex("text")
+        self.reviews = {}
+        for id, text in (("r1", "Great view, great host"),
+                         ("r2", "The view was fine"),
+                         ("r3", "Noisy street"),
+                         ("r4", None)):
+            rv = Review(id=id, text=text)
+            self.reviews[id] = rv
+            self.index.add("Review." + id, rv)
+
+    def search(self, text):
+        return [key for key, score in self.index.search(text)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Great view, l'été!"),
+                         ["great", "view", "l", "été"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_search(self):
+        self.assertEqual(self.search("view"), ["Review.r1", "Review.r2"])
+        self.assertEqual(self.search("noisy VIEW"),
+                         ["Review.r3", "Review.r1", "Review.r2"])
+        self.assertEqual(self.search("pool"), [])
+        found = self.index.search("noisy view", 2)
+        self.assertEqual([key for key, score in found],
+                         ["Review.r3", "Review.r1"])
+        self.assertIsNone(self.index.scan([("text", "==", "view")]))
+
+    def test_update_and_remove(self):
+        rv = self.reviews["r3"]
+        self.index.update("Review.r3", rv, "Great street")
+        rv.text = "Great street"
+        self.assertEqual(self.search("noisy"), [])
+        self.assertEqual(self.search("great"), ["Review.r1", "Review.r3"])
+        self.index.remove("Review.r1")
+        self.assertEqual(self.search("great"), ["Review.r3"])
+
+    def test_restore(self):
+        state = self.index.state()
+        self.assertTrue(self.index.built)
+        index = TextIndex("text")
+        index.restore(state)
+        self.reviews["r2"].text = "Pool"
+        for id, rv in self.reviews.items():
+            index.add("Review." + id, rv)
+        found = [key for key, score in index.search("view pool")]
+        self.assertEqual(found, ["Review.r2", "Review.r1"])
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """
+    This class provides all possible test cases for class BitmapIndex.
+    """
+
+    def setUp(self):
+        self.index = BitmapIndex("amenity_ids")
+        self.places = {}
+        for id, amenities in (("p1", ["wifi", "pool"]),
+                              ("p2", ["wifi"]),
+                              ("p3", ["pool", "spa"]),
+                              ("p4", [])):
+            pl = Place(id=id, amenity_ids=amenities)
+            self.places[id] = pl
+            self.index.add("Place." + id, pl)
+
+    def having(self, text):
+        return self.index.having(parse_members(text))
+
+    def test_having(self):
+        self.assertEqual(self.having("wifi"), ["Place.p1", "Place.p2"])
+        self.assertEqual(self.having("wifi and pool"), ["Place.p1"])
+        self.assertEqual(self.having("wifi or spa"),
+                         ["Place.p1", "Place.p2", "Place.p3"])
+        self.assertEqual(self.having("not wifi"), ["Place.p3", "Place.p4"])
+        self.assertEqual(self.having("pool and not (wifi or parking)"),
+                         ["Place.p3"])
+        self.assertEqual(self.having("parking"), [])
+        self.assertEqual(self.index.having("spa", objects=True),
+                         [self.places["p3"]])
+        self.assertIsNone(self.index.scan([("amenity_ids", "==", [])]))
+
+    def test_changes(self):
+        self.places["p4"].amenity_ids.append("wifi")
+        self.index.update("Place.p4", self.places["p4"], None)
+        self.index.update("Place.p1", self.places["p1"], ["pool"])
+        self.places["p1"].amenity_ids = ["pool"]
+        self.assertEqual(self.having("wifi"), ["Place.p2", "Place.p4"])
+        self.index.remove("Place.p2")
+        self.assertEqual(self.having("wifi"), ["Place.p4"])
+        self.assertEqual(self.having("not pool"), ["Place.p4"])
+
+    def test_ordinals_are_reused(self):
+        self.having("wifi")
+        self.index.remove("Place.p1")
+        pl = Place(id="p5", amenity_ids=["spa"])
+        self.index.add("Place.p5", pl)
+        self.assertEqual(self.having("spa"), ["Place.p5", "Place.p3"])
+
+    def test_many_instances(self):
+        index = BitmapIndex("amenity_ids")
+        for i in range(1000):
+            pl = Place(id=str(i), amenity_ids=["odd" if i % 2 else "even"] +
+                       (["ten"] if i % 10 == 0 else []))
+            index.add(str(i), pl)
+        found = index.having(parse_members("ten and even"))
+        self.assertEqual(found, [str(i) for i in range(0, 1000, 10)])
+        self.assertEqual(len(index.having(parse_members("not odd"))), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+"""
+File: test_json_stream.py
+Desc: This module contains all possible testcases for the json_stream.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+import json
+from io import StringIO
+from models.engine.json_stream import iter_items
+
+
+class TestIterItems(unittest.TestCase):
+    """
+    This class provides all possible test cases for function iter_items.
+    """
+
+    def items(self, text, size=1 << 16):
+        return list(iter_items(StringIO(text), size))
+
+    def test_empty_object(self):
+        self.assertEqual(self.items("{}"), [])
+        self.assertEqual(self.items(" { \n } "), [])
+
+    def test_same_as_json_load(self):
+        data = {
+            "BaseModel.1": {"id": "1", "__class__": "BaseModel"},
+            "Place.2": {"id": "2", "amenity_ids": ["a", "b"],
+                        "latitude": 37.77, "max_guest": 10,
+                        "description": 'a "quoted" {text}, with: ok\\'},
+            "User.3": {"id": "3", "first_name": "Bétty"},
+        }
+        text = json.dumps(data)
+        for size in (1, 2, 3, 7, 64, 1 << 16):
+            self.assertEqual(self.items(text, size), list(data.items()))
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(self.items('{"a": 12345, "b": 1.5e10}', 2),
+                         [("a", 12345), ("b", 1.5e10)])
+
+    def test_is_lazy(self):
+        items = iter_items(StringIO('{"a": {}, "b": '), 4)
+        self.assertEqual(next(items), ("a", {}))
+        with self.assertRaises(ValueError):
+            next(items)
+
+    def test_empty_file(self):
+        with self.assertRaises(ValueError):
+            self.items("")
+
+    def test_not_an_object(self):
+        with self.assertRaises(ValueError):
+            self.items("[1, 2]")
+
+    def test_truncated_file(self):
+        with self.assertRaises(ValueError):
+            self.items('{"a": {"id": "1"}', 3)
+
+    def test_missing_colon(self):
+        with self.assertRaises(ValueError):
+            self.items('{"a" {}}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+
+"""
+File: test_query.py
+Desc: This module contains all possible testcases for the query.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+import os
+from unittest.mock import patch
+from models.engine.file_storage import FileStorage
+from models.engine.indexes import SortedIndex
+from models.engine.query import compare
+from models.engine.query import holds
+from models.engine.query import matches
+from models.engine.query import parse_members
+from models.engine.query import parse_query
+from models.place import Place
+import models
+
+
+class TestQueryParsing(unittest.TestCase):
+    """
+    This class provides all possible test cases for function
+    parse_query.
+    """
+
+    def test_conditions(self):
+        query = parse_query(Place, "where(price_by_night<100, "
+                                   "max_guest >= 4, name='Loft', "
+                                   "city_id=c-1)")
+        self.assertIs(query.cls, Place)
+        self.assertEqual(query.conditions, [("price_by_night", "<", 100),
+                                            ("max_guest", ">=", 4),
+                                            ("name", "==", "Loft"),
+                                            ("city_id", "==", "c-1")])
+
+    def test_quoted_values(self):
+        query = parse_query(Place, 'where(name="a, b", '
+                                   "description='(quiet), sunny')"
+                                   ".limit(1)")
+        self.assertEqual(query.conditions,
+                         [("name", "==", "a, b"),
+                          ("description", "==", "(quiet), sunny")])
+        self.assertEqual(query.limit, 1)
+
+    def test_chain(self):
+        query = parse_query(Place, "where().order_by(-price_by_night, name)"
+                                   ".offset(5).limit(20).select(id, name)")
+        self.assertEqual(query.conditions, [])
+        self.assertEqual(query.order, [("price_by_night", True),
+                                       ("name", False)])
+        self.assertEqual((query.offset, query.limit), (5, 20))
+        self.assertEqual(query.fields, ["id", "name"])
+
+    def test_invalid(self):
+        for text in ("where(price<)", "where(price)", "where(a<1).limit(x)",
+                     "where(a<1).limit(-1)", "where(a<1).group_by(a)",
+                     "where(a<1) junk", "where(a<1).order_by(-)",
+                     'where(name="a, b)', "where(name=(a))",
+                     "where(price<100 max_guest>=4)", "where(name=a b)",
+                     "where(a==b==c)"):
+            with self.assertRaises(ValueError):
+                parse_query(Place, text)
+
+
+class TestQueryMatching(unittest.TestCase):
+    """
+    This class provides all possible test cases for functions compare
+    and matches.
+    """
+
+    def test_compare(self):
+        self.assertTrue(compare(1, "<", 2))
+        self.assertFalse(compare(None, "<", 2))
+        self.assertTrue(compare(None, "!=", 2))
+        self.assertFalse(compare("a", ">=", 2))
+
+    def test_matches(self):
+        pl = Place(id="1", price_by_night=80, max_guest=4)
+        self.assertTrue(matches(pl, [("price_by_night", "<", 100),
+                                     ("max_guest", "==", 4)]))
+        self.assertFalse(matches(pl, [("price_by_night", ">", 100)]))
+        self.assertFalse(matches(pl, [("missing", ">", 1)]))
+        self.assertTrue(matches(pl, []))
+
+
+class TestQueryMembers(unittest.TestCase):
+    """
+    This class provides all possible test cases for functions
+    parse_members and holds.
+    """
+
+    def test_parse_members(self):
+        self.assertEqual(parse_members("wifi"), "wifi")
+        self.assertEqual(parse_members('wifi AND not "hot tub"'),
+                         ("and", "wifi", ("not", "hot tub")))
+        self.assertEqual(parse_members("a or b and c"),
+                         ("or", "a", ("and", "b", "c")))
+        self.assertEqual(parse_members("(a or b) and c"),
+                         ("and", ("or", "a", "b"), "c"))
+
+    def test_parse_members_invalid(self):
+        for text in ("", "a and", "(a or b", "a b", "or a", "a )"):
+            with self.assertRaises(ValueError):
+                parse_members(text)
+
+    def test_holds(self):
+        tree = parse_members("wifi and (pool or spa) and not smoking")
+        self.assertTrue(holds(tree, ["wifi", "spa"]))
+        self.assertFalse(holds(tree, ["wifi", "spa", "smoking"]))
+        self.assertFalse(holds(tree, ["pool", "spa"]))
+        self.assertFalse(holds(tree, []))
+
+
+class TestQueryRun(unittest.TestCase):
+    """
+    This class provides all possible test cases for running queries on
+    FileStorage.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for price, guests in ((120, 2), (80, 4), (60, 6), (95, 4)):
+            pl = Place()
+            pl.price_by_night = price
+            pl.max_guest = guests
+            pl.city_id = "c1" if guests == 4 else "c2"
+            self.places.append(pl)
+        self.nameless = Place()
+        self.nameless.price_by_night = None
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_query(self, text):
+        return parse_query(Place, text).run(models.storage)
+
+    def test_filter(self):
+        found = self.run_query("where(price_by_night<100, max_guest>=4)")
+        self.assertCountEqual(found, self.places[1:])
+
+    def test_order_and_limit(self):
+        found = self.run_query("where().order_by(price_by_night)")
+        self.assertEqual(found, [self.places[2], self.places[1],
+                                 self.places[3], self.places[0],
+                                 self.nameless])
+        found = self.run_query("where().order_by(-price_by_night).limit(2)")
+        self.assertEqual(found, [self.places[0], self.places[3]])
+        found = self.run_query("where().order_by(-price_by_night)")
+        self.assertEqual(found[-1], self.nameless)
+        found = self.run_query(
+                "where().order_by(-max_guest, price_by_night).offset(1)"
+                ".limit(2)")
+        self.assertEqual(found, [self.places[1], self.places[3]])
+
+    def test_filter_quoted(self):
+        self.places[0].name = "Loft, (quiet)"
+        found = self.run_query('where(name="Loft, (quiet)")')
+        self.assertEqual(found, [self.places[0]])
+
+    def test_select(self):
+        found = self.run_query("where(max_guest==6).select(id, max_guest)")
+        self.assertEqual(found, [{"id": self.places[2].id, "max_guest": 6}])
+
+    def checked(self, text):
+        with patch("models.engine.file_storage.matches",
+                   side_effect=matches) as checks:
+            found = self.run_query(text)
+        return found, checks.call_count
+
+    def test_uses_index(self):
+        found, checked = self.checked("where(city_id=c1, max_guest<5)")
+        self.assertCountEqual(found, [self.places[1], self.places[3]])
+        self.assertEqual(checked, 2)
+
+    def test_range_uses_sorted_index(self):
+        found, checked = self.checked("where(price_by_night>=80)")
+        self.assertCountEqual(found, [self.places[0], self.places[1],
+                                      self.places[3]])
+        self.assertEqual(checked, 3)
+        found, checked = self.checked("where(price_by_night>70, "
+                                      "price_by_night<=80)")
+        self.assertEqual(found, [self.places[1]])
+        self.assertEqual(checked, 1)
+
+    def test_top_k_reads_sorted_index(self):
+        with patch.object(SortedIndex, "scan",
+                          autospec=True,
+                          side_effect=SortedIndex.scan) as scan:
+            found = self.run_query("where(max_guest==4)"
+                                   ".order_by(-price_by_night).limit(1)")
+        self.assertEqual(found, [self.places[3]])
+        index, conditions, descending = scan.call_args[0]
+        self.assertEqual(index.attr, "price_by_night")
+        self.assertTrue(descending)
+
+    def test_sorted_index_follows_updates(self):
+        self.places[0].price_by_night = 10
+        found = self.run_query("where(price_by_night<50)")
+        self.assertEqual(found, [self.places[0]])
+        models.storage.delete(self.places[0])
+        self.assertEqual(self.run_query("where(price_by_night<50)"), [])
+        found = self.run_query("where().order_by(price_by_night).limit(1)")
+        self.assertEqual(found, [self.places[2]])
+
+    def test_find_uses_select(self):
+        self.assertCountEqual(models.storage.find(Place, city_id="c1"),
+                              [self.places[1], self.places[3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+
+"""
+File: test_snapshot.py
+Desc: This module contains all possible testcases for the snapshot.py
+ module in the models.engine package. It uses the standard unittest.
+"""
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from models.engine.snapshot import convert
+from models.engine.snapshot import is_binary
+from models.engine.snapshot import read_snapshot
+from models.engine.snapshot import write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    This class provides all possible test cases for the binary snapshot
+    format.
+    """
+
+    items = [
+            ("Place.p1", {"__class__": "Place", "id": "p1",
+                          "created_at": 1700000000000000,
+                          "updated_at": 1700000000000001,
+                          "city_id": "c1", "price_by_night": 100,
+                          "latitude": 37.77, "amenity_ids": ["a1", "a2"],
+                          "description": "Sunny loft"}),
+            ("Place.p2", {"__class__": "Place", "id": "p2",
+                          "created_at": 1700000000000002,
+                          "updated_at": 1700000000000003,
+                          "city_id": "c1", "price_by_night": "free",
+                          "latitude": -1.5, "amenity_ids": [],
+                          "extra": True}),
+            ("City.c1", {"__class__": "City", "id": "c1",
+                         "created_at": 1700000000000004,
+                         "updated_at": 1700000000000005,
+                         "name": "San Francisco", "state_id": "s1"}),
+            ]
+
+    def round_trip(self, items):
+        fs = io.BytesIO()
+        write_snapshot(fs, items)
+        fs.seek(0)
+        return list(read_snapshot(fs))
+
+    def test_round_trip(self):
+        self.assertEqual(dict(self.round_trip(self.items)),
+                         dict(self.items))
+
+    def test_missing_attributes_stay_missing(self):
+        found = dict(self.round_trip(self.items))
+        self.assertNotIn("extra", found["Place.p1"])
+        self.assertNotIn("description", found["Place.p2"])
+
+    def test_types(self):
+        found = dict(self.round_trip(self.items))
+        self.assertIs(type(found["Place.p1"]["price_by_night"]), int)
+        self.assertIs(type(found["Place.p1"]["latitude"]), float)
+        self.assertIs(found["Place.p2"]["extra"], True)
+        self.assertEqual(found["Place.p2"]["price_by_night"], "free")
+
+    def test_lists_are_not_shared(self):
+        items = [("Place." + id, {"__class__": "Place", "id": id,
+                                  "amenity_ids": []}) for id in "ab"]
+        found = self.round_trip(items)
+        self.assertIsNot(found[0][1]["amenity_ids"],
+                         found[1][1]["amenity_ids"])
+
+    def test_special_strings(self):
+        items = [("City.c", {"__class__": "City", "id": "c",
+                             "name": "nul\x00 é", "state_id": ""})]
+        self.assertEqual(self.round_trip(items), items)
+
+    def test_big_integers(self):
+        items = [("City.c", {"__class__": "City", "id": "c",
+                             "size": 2 ** 70})]
+        self.assertEqual(self.round_trip(items), items)
+
+    def test_empty(self):
+        self.assertEqual(self.round_trip([]), [])
+
+    def test_strings_interned(self):
+        items = [("City." + str(i), {"__class__": "City", "id": str(i),
+                                     "state_id": "s" * 100})
+                 for i in range(100)]
+        fs = io.BytesIO()
+        write_snapshot(fs, items)
+        self.assertLess(len(fs.getvalue()), 2000)
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            list(read_snapshot(io.BytesIO(b'{"City.c": {}}')))
+
+    def test_is_binary(self):
+        self.assertTrue(is_binary("file.hbnb"))
+        self.assertFalse(is_binary("file.json"))
+
+    def test_convert(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "file.json")
+            binary = os.path.join(tmp, "file.hbnb")
+            back = os.path.join(tmp, "back.json")
+            records = {"City.c1": {"__class__": "City", "id": "c1",
+                                   "created_at": "2017-09-28T21:05:54.119427",
+                                   "updated_at": "2017-09-28T21:05:54.119572",
+                                   "name": "Akron"}}
+            with open(source, "w") as f:
+                json.dump(records, f)
+            self.assertEqual(convert(source, binary), 1)
+            with open(binary, "rb") as f:
+                found = dict(read_snapshot(f))
+            self.assertIs(type(found["City.c1"]["created_at"]), int)
+            self.assertEqual(convert(binary, back), 1)
+            with open(back) as f:
+                self.assertEqual(json.load(f), records)
+            self.assertFalse(os.path.exists(back + ".tmp"))
+
+    def test_convert_script(self):
+        script = os.path.join(os.path.dirname(__file__), "..", "..", "..",
+                              "convert_snapshot.py")
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "file.json"), "w") as f:
+                json.dump({"State.s": {"__class__": "State", "id": "s"}}, f)
+            env = dict(os.environ, HBNB_DURABILITY="bogus",
+                       PYTHONPATH=os.path.dirname(os.path.abspath(script)))
+            done = subprocess.run(
+                    [sys.executable, os.path.abspath(script), "file.json",
+                     "file.hbnb"], cwd=tmp, env=env, capture_output=True,
+                    text=True)
+            self.assertEqual(done.stdout, "1 records converted\n")
+            self.assertEqual(done.stderr, "")
+            with open(os.path.join(tmp, "file.hbnb"), "rb") as f:
+                self.assertEqual(list(dict(read_snapshot(f))), ["State.s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,387 @@
+#!/usr/bin/python3
+
+"""
+File: test_sqlite_storage.py
+Desc: This module contains all possible testcases for the
+ sqlite_storage.py module in the models.engine package. It uses the
+ standard unittest.
+"""
+import unittest
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+from models.engine.sqlite_storage import SQLiteStorage
+from models.engine.storage_engine import StorageEngine
+from models.base_model import BaseModel
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """
+    This class provides all possible test cases for class SQLiteStorage.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hbnb.db")
+        self.storage = SQLiteStorage(self.path)
+        self.storage.reload()
+        self.patch = patch("models.storage", self.storage)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.storage.close()
+        self.tmp.cleanup()
+
+    def reopen(self):
+        self.storage.close()
+        self.storage = SQLiteStorage(self.path)
+        self.storage.reload()
+        self.patch.stop()
+        self.patch = patch("models.storage", self.storage)
+        self.patch.start()
+
+    def test_is_a_storage_engine(self):
+        self.assertIsInstance(self.storage, StorageEngine)
+
+    def test_one_table_per_class(self):
+        db = sqlite3.connect(self.path)
+        tables = {row[0] for row in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        db.close()
+        self.assertTrue({"BaseModel", "User", "State", "City", "Amenity",
+                         "Place", "Review"} <= tables)
+
+    def test_foreign_keys_are_indexed(self):
+        db = sqlite3.connect(self.path)
+        indexes = {row[0] for row in db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        db.close()
+        self.assertIn("Review_place_id", indexes)
+        self.assertIn("City_state_id", indexes)
+
+    def test_new_and_all(self):
+        us = User()
+        st = State()
+        self.assertEqual(self.storage.all(User), {"User." + us.id: us})
+        self.assertIn("State." + st.id, self.storage.all())
+        self.assertEqual(self.storage.all("Nothing"), {})
+
+    def test_save_and_reload(self):
+        pl = Place()
+        pl.name = "Loft"
+        pl.max_guest = 4
+        pl.latitude = 37.7
+        pl.amenity_ids = ["a1", "a2"]
+        pl.rating = 5
+        self.storage.save()
+        self.reopen()
+        loaded = self.storage.get(Place, pl.id)
+        self.assertIsNot(loaded, pl)
+        self.assertEqual(loaded.to_dict(), pl.to_dict())
+
+    def test_unsaved_changes_are_discarded(self):
+        st = State()
+        self.storage.save()
+        st.name = "Nevada"
+        User()
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, st.id).name, "")
+        self.assertEqual(self.storage.count(User), 0)
+
+    def test_get_loads_one_instance(self):
+        st = State()
+        User()
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(self.storage.get("State", st.id).id, st.id)
+        self.assertIs(self.storage.get(State, st.id),
+                      self.storage.get(State, st.id))
+        self.assertIsNone(self.storage.get(State, "missing"))
+        self.assertIsNone(self.storage.get("Nothing", st.id))
+
+    def test_iterate(self):
+        st = State()
+        us = User()
+        self.storage.save()
+        self.reopen()
+        found = list(self.storage.iterate(State))
+        self.assertEqual([obj.id for obj in found], [st.id])
+        self.assertIsNot(self.storage.get(State, st.id), found[0])
+        loaded = self.storage.get(State, st.id)
+        self.assertIn(loaded, list(self.storage.iterate()))
+        self.assertEqual(len(list(self.storage.iterate())), 2)
+        self.assertEqual(list(self.storage.iterate("Nothing")), [])
+
+    def test_iterate_after(self):
+        states = [State() for i in range(3)]
+        us = User()
+        self.storage.save()
+        self.reopen()
+        found = list(self.storage.iterate(State,
+                                          after="State." + states[0].id))
+        self.assertEqual([obj.id for obj in found],
+                         [st.id for st in states[1:]])
+        found = list(self.storage.iterate(after="User." + us.id))
+        self.assertNotIn(us.id, [obj.id for obj in found])
+        with self.assertRaises(KeyError):
+            list(self.storage.iterate(State, after="State.nothing"))
+        with self.assertRaises(KeyError):
+            list(self.storage.iterate(after="User." + states[0].id))
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        self.assertEqual(self.storage.count(User), 2)
+        self.assertEqual(self.storage.count(), 3)
+
+    def test_find(self):
+        rv1 = Review()
+        rv1.place_id = "p1"
+        rv1.user_id = "u1"
+        rv2 = Review()
+        rv2.place_id = "p1"
+        Review().place_id = "p2"
+        self.assertCountEqual(self.storage.find(Review, place_id="p1"),
+                              [rv1, rv2])
+        self.assertEqual(self.storage.find(Review, place_id="p1",
+                                           user_id="u1"), [rv1])
+
+    def test_select(self):
+        cheap = Place()
+        cheap.price_by_night = 50
+        Place().price_by_night = 150
+        default = Place()
+        self.storage.save()
+        self.reopen()
+        found = self.storage.select(Place, [("price_by_night", "<", 100)])
+        self.assertCountEqual([pl.id for pl in found], [cheap.id, default.id])
+        found = self.storage.select(Place, [("price_by_night", "!=", 50),
+                                            ("price_by_night", ">=", 0)])
+        self.assertEqual(len(found), 2)
+        self.assertEqual(self.storage.select(Place, [("id", "==", cheap.id)]),
+                         [self.storage.get(Place, cheap.id)])
+
+    def test_near(self):
+        paris = Place()
+        paris.latitude = 48.8566
+        paris.longitude = 2.3522
+        london = Place()
+        london.latitude = 51.5074
+        london.longitude = -0.1278
+        Place()
+        self.storage.save()
+        self.reopen()
+        found = self.storage.near(Place, 48.85, 2.35, 400)
+        self.assertEqual([pl.id for pl, distance in found],
+                         [paris.id, london.id])
+        self.assertEqual(len(self.storage.near(Place, 0, 0, 1)), 1)
+
+    def test_search(self):
+        rv1 = Review()
+        rv1.text = "Quiet flat, quiet street"
+        rv2 = Review()
+        rv2.text = "Loud street"
+        self.storage.save()
+        self.reopen()
+        found = self.storage.search(Review, "street quiet")
+        self.assertEqual([rv.id for rv, score in found], [rv1.id, rv2.id])
+        with self.assertRaises(ValueError):
+            self.storage.search(User, "quiet")
+
+    def test_having(self):
+        pl1 = Place()
+        pl1.amenity_ids = ["wifi", "pool"]
+        pl2 = Place()
+        pl2.amenity_ids = ["wifi"]
+        Place()
+        self.storage.save()
+        self.reopen()
+        found = self.storage.having(Place, "amenity_ids",
+                                    ("and", "wifi", ("not", "pool")))
+        self.assertEqual([pl.id for pl in found], [pl2.id])
+
+    def test_results_are_kept(self):
+        pl = Place()
+        pl.amenity_ids = ["wifi"]
+        pl.description = "quiet"
+        self.storage.save()
+        self.reopen()
+        found = self.storage.having(Place, "amenity_ids", "wifi")
+        found[0].name = "Loft"
+        found[0].save()
+        found = self.storage.search(Place, "quiet")
+        found[0][0].max_guest = 3
+        found[0][0].save()
+        self.reopen()
+        pl = self.storage.get(Place, pl.id)
+        self.assertEqual((pl.name, pl.max_guest), ("Loft", 3))
+
+    def test_aggregate(self):
+        for price in (100, 60):
+            pl = Place()
+            pl.city_id = "c1"
+            pl.price_by_night = price
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(self.storage.aggregate(Place, "city_id",
+                                                "price_by_night"),
+                         {"c1": {"count": 2, "min": 60, "max": 100,
+                                 "avg": 80}})
+        self.assertEqual(self.storage.group_stats(Place, "city_id", "c2"),
+                         {"count": 0})
+
+    def test_columns(self):
+        for price in (100, 60):
+            pl = Place()
+            pl.city_id = "c1"
+            pl.price_by_night = price
+        self.storage.save()
+        self.reopen()
+        table = self.storage.columns(Place)
+        self.assertEqual(table.groups("city_id", "price_by_night"),
+                         {"c1": {"count": 2, "min": 60, "max": 100,
+                                 "avg": 80}})
+        self.assertEqual(table.count([("price_by_night", "<", 80)]), 1)
+
+    def test_find_in(self):
+        pl1 = Place()
+        pl1.city_id = "c1"
+        pl2 = Place()
+        pl2.city_id = "c2"
+        pl2.nickname = "loft"
+        self.storage.save()
+        self.reopen()
+        found = self.storage.find_in(Place, "city_id", ["c1", "c2", "c3"])
+        self.assertEqual({city: [pl.id for pl in places]
+                          for city, places in found.items()},
+                         {"c1": [pl1.id], "c2": [pl2.id]})
+        found = self.storage.find_in(Place, "id", [pl1.id])
+        self.assertEqual(list(found), [pl1.id])
+        found = self.storage.find_in(Place, "nickname", ["loft"])
+        self.assertEqual(found["loft"][0].id, pl2.id)
+
+    def test_prefetch(self):
+        pl = Place()
+        rv1 = Review()
+        rv1.place_id = pl.id
+        rv2 = Review()
+        rv2.place_id = pl.id
+        empty = Place()
+        self.storage.save()
+        self.reopen()
+        places = [self.storage.get(Place, pl.id),
+                  self.storage.get(Place, empty.id)]
+        found = self.storage.prefetch(places, "reviews")
+        self.assertCountEqual([rv.id for rv in found[pl.id]],
+                              [rv1.id, rv2.id])
+        self.assertEqual(found[empty.id], [])
+
+    def test_find_extra_attribute(self):
+        us = User()
+        us.nickname = "betty"
+        User()
+        self.assertEqual(self.storage.find(User, nickname="betty"), [us])
+
+    def test_delete(self):
+        us = User()
+        self.storage.save()
+        self.storage.delete(us)
+        self.storage.delete(None)
+        self.storage.save()
+        self.reopen()
+        self.assertIsNone(self.storage.get(User, us.id))
+
+    def test_keeps_value_types(self):
+        bm = BaseModel()
+        bm.flag = True
+        bm.nothing = None
+        bm.number = 3
+        self.storage.save()
+        self.reopen()
+        loaded = self.storage.get(BaseModel, bm.id)
+        self.assertIs(loaded.flag, True)
+        self.assertIsNone(loaded.nothing)
+        self.assertEqual(loaded.number, 3)
+
+    def test_keeps_types_differing_from_defaults(self):
+        pl = Place()
+        pl.name = 5
+        pl.price_by_night = 3.0
+        pl.latitude = 2
+        pl.city_id = "c1"
+        other = Place()
+        other.name = "5"
+        self.storage.save()
+        self.reopen()
+        loaded = self.storage.get(Place, pl.id)
+        self.assertEqual([type(loaded.name), type(loaded.price_by_night),
+                          type(loaded.latitude)], [int, float, int])
+        self.assertEqual([obj.id for obj in self.storage.find(Place, name=5)],
+                         [pl.id])
+        self.assertEqual([obj.id for obj in
+                          self.storage.select(Place, [("latitude", ">", 1)])],
+                         [pl.id])
+        found = self.storage.find_in(Place, "price_by_night", [3])
+        self.assertEqual([obj.id for obj in found[3]], [pl.id])
+        found = self.storage.find_in(Place, "name", [5])
+        self.assertEqual([obj.id for obj in found[5]], [pl.id])
+
+
+class TestStorageEngine(unittest.TestCase):
+    """
+    This class provides all possible test cases for the default methods
+    of class StorageEngine.
+    """
+
+    class DictStorage(StorageEngine):
+        def __init__(self):
+            self.objects = {}
+
+        def all(self, cls=None):
+            if cls is None:
+                return self.objects
+            name = cls if type(cls) is str else cls.__name__
+            return {k: v for k, v in self.objects.items()
+                    if k.startswith(name + ".")}
+
+        def new(self, obj):
+            self.objects[type(obj).__name__ + "." + obj.id] = obj
+
+    def test_abstract_methods(self):
+        engine = StorageEngine()
+        for method in (engine.all, engine.save, engine.reload):
+            with self.assertRaises(NotImplementedError):
+                method()
+        with self.assertRaises(NotImplementedError):
+            engine.new(None)
+
+    def test_defaults(self):
+        engine = self.DictStorage()
+        us = User(id="1")
+        st = State(id="2", name="CA")
+        engine.new(us)
+        engine.new(st)
+        self.assertEqual(engine.count(), 2)
+        self.assertEqual(engine.count(User), 1)
+        self.assertIs(engine.get(User, "1"), us)
+        self.assertIsNone(engine.get(User, "2"))
+        self.assertEqual(engine.find(State, name="CA"), [st])
+        self.assertEqual(list(engine.iterate(User)), [us])
+        self.assertEqual(list(engine.iterate()), [us, st])
+        self.assertEqual(engine.select(State, [("name", "!=", "NV")]), [st])
+        pl = Place(id="3", latitude=0.0, longitude=179.99)
+        engine.new(pl)
+        self.assertEqual(engine.near(Place, 0, -179.99, 5)[0][0], pl)
+        with self.assertRaises(ValueError):
+            engine.near(State, 0, 0, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
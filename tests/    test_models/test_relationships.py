@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+
+"""
+File: test_relationships.py
+Desc: This module contains all possible testcases for the
+      relationships.py module in the models package. It uses the
+      standard unittest
+"""
+import unittest
+import os
+from unittest.mock import patch
+import models
+from models.compact import compact
+from models.engine.file_storage import FileStorage
+from models.relationships import HasMany
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+class TestRelationships(unittest.TestCase):
+    """
+    This class provides all possible test cases for the relationships
+    of the model classes.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.st = State()
+        self.cy = City()
+        self.cy.state_id = self.st.id
+        self.us = User()
+        self.pl = Place()
+        self.pl.city_id = self.cy.id
+        self.pl.user_id = self.us.id
+        self.rv = Review()
+        self.rv.place_id = self.pl.id
+        self.rv.user_id = self.us.id
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_has_many(self):
+        self.assertEqual(self.st.cities, [self.cy])
+        self.assertEqual(self.cy.places, [self.pl])
+        self.assertEqual(self.us.places, [self.pl])
+        self.assertEqual(self.us.reviews, [self.rv])
+        self.assertEqual(self.pl.reviews, [self.rv])
+        self.assertEqual(State().cities, [])
+
+    def test_belongs_to(self):
+        self.assertIs(self.cy.state, self.st)
+        self.assertIs(self.pl.city, self.cy)
+        self.assertIs(self.rv.place, self.pl)
+        self.assertIs(self.rv.user, self.us)
+        self.assertIsNone(City().state)
+
+    def test_has_many_ids(self):
+        wifi = Amenity()
+        pool = Amenity()
+        self.pl.amenity_ids = [pool.id, "missing", wifi.id]
+        self.assertEqual(self.pl.amenities, [pool, wifi])
+        self.assertEqual(Place().amenities, [])
+
+    def test_follows_changes(self):
+        cy = City()
+        cy.state_id = self.st.id
+        self.assertCountEqual(self.st.cities, [self.cy, cy])
+        models.storage.delete(self.cy)
+        self.assertEqual(self.st.cities, [cy])
+
+    def test_not_saved(self):
+        self.assertIsInstance(State.cities, HasMany)
+        self.assertNotIn("cities", self.st.to_dict())
+        self.assertEqual(State.cities.name, "cities")
+
+    def test_compact(self):
+        pl = compact(Place)(id="p1", city_id=self.cy.id)
+        self.assertIs(pl.city, self.cy)
+
+    def test_prefetch(self):
+        pl = Place()
+        rv = Review()
+        rv.place_id = pl.id
+        empty = Place()
+        with patch.object(models.storage, "find_in",
+                          wraps=models.storage.find_in) as find_in:
+            found = models.storage.prefetch([self.pl, pl, empty],
+                                            "reviews")
+        self.assertEqual(find_in.call_count, 1)
+        self.assertEqual(found, {self.pl.id: [self.rv], pl.id: [rv],
+                                 empty.id: []})
+        found = models.storage.prefetch([self.rv, rv], "place")
+        self.assertEqual(found, {self.rv.id: self.pl, rv.id: pl})
+
+    def test_prefetch_mixed_classes(self):
+        found = models.storage.prefetch([self.pl, self.rv], "user")
+        self.assertEqual(found, {self.pl.id: self.us, self.rv.id: self.us})
+        self.assertEqual(models.storage.prefetch([], "user"), {})
+        with self.assertRaises(ValueError):
+            models.storage.prefetch([self.pl], "name")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,16 @@
 import unittest
 from console import HBNBCommand
 from unittest.mock import patch
-import sys
+import os
+import csv
+import json
 from io import StringIO
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.amenity import Amenity
+from models.place import Place
+from models.user import User
+from models.state import State
 
 
 class TestConsolePrompt(unittest.TestCase):
@@ -17,3 +25,780 @@ class TestConsolePrompt(unittest.TestCase):
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd(""))
             self.assertEqual("", output.getvalue().strip())
+
+
+class TestConsoleAllAndCount(unittest.TestCase):
+    """
+    This class provides test cases for the all and count commands
+    of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_all_with_class(self):
+        us = User()
+        st = State()
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("all User")
+            self.assertIn(us.id, output.getvalue())
+            self.assertNotIn(st.id, output.getvalue())
+
+    def test_all_without_class(self):
+        us = User()
+        st = State()
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("all")
+            self.assertIn(us.id, output.getvalue())
+            self.assertIn(st.id, output.getvalue())
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("User.count()")
+            self.assertEqual("2", output.getvalue().strip())
+
+    def run_all(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_all_format(self):
+        us = User()
+        st = State()
+        self.assertEqual(self.run_all("all"),
+                         str([str(us), str(st)]) + "\n")
+        self.assertEqual(self.run_all("all Place"), "[]\n")
+
+    def test_all_limit_and_offset(self):
+        users = [User() for i in range(5)]
+        self.assertEqual(self.run_all("all User limit=2"),
+                         str([str(us) for us in users[:2]]) + "\n")
+        self.assertEqual(self.run_all("all User limit=2 offset=4"),
+                         str([str(users[4])]) + "\n")
+        self.assertEqual(self.run_all("User.all(offset=3)"),
+                         str([str(us) for us in users[3:]]) + "\n")
+
+    def test_all_after(self):
+        users = [User() for i in range(5)]
+        line = 'User.all(limit=2, after="{}")'.format(users[1].id)
+        self.assertEqual(self.run_all(line),
+                         str([str(us) for us in users[2:4]]) + "\n")
+        line = "all User after={}".format(users[4].id)
+        self.assertEqual(self.run_all(line), "[]\n")
+        line = "all limit=1 after={}".format(users[2].id)
+        self.assertEqual(self.run_all(line), str([str(users[3])]) + "\n")
+
+    def test_all_after_missing(self):
+        users = [User() for i in range(3)]
+        storage.delete(users[1])
+        for line in ("all User after={}".format(users[1].id),
+                     "all User after=1234-1234",
+                     "all Place after={}".format(users[0].id),
+                     "all after=1234-1234"):
+            self.assertEqual(self.run_all(line),
+                             "** no instance found **\n")
+
+    def test_all_invalid_arguments(self):
+        for line in ("all User limit=many", "all User offset=-1",
+                     "all User page=2", "User.all(limit=)"):
+            self.assertEqual(self.run_all(line).strip(),
+                             "** invalid argument **")
+
+
+class TestConsoleCreateAndUpdate(unittest.TestCase):
+    """
+    This class provides test cases for the create and update commands
+    of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_create(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create User")
+            uid = output.getvalue().strip()
+        self.assertEqual(type(storage.get(User, uid)), User)
+
+    def test_create_unknown_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create __import__('os')")
+            self.assertEqual(output.getvalue().strip(),
+                             "** class doesn't exist **")
+
+    def test_update_value_missing(self):
+        us = User()
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("update User {} first_name".format(us.id))
+            self.assertEqual(output.getvalue().strip(),
+                             "** value missing **")
+
+    def test_update_casts_declared_attribute(self):
+        pl = Place()
+        HBNBCommand().onecmd("update Place {} max_guest 4".format(pl.id))
+        self.assertEqual(pl.max_guest, 4)
+
+    def test_update_with_dictionary(self):
+        us = User()
+        HBNBCommand().onecmd('User.update("{}", {{"first_name": "Betty", '
+                             '"age": 89}})'.format(us.id))
+        self.assertEqual(us.first_name, "Betty")
+        self.assertEqual(us.age, "89")
+
+    def test_update_relationship(self):
+        pl = Place()
+        for line in ("update Place {} city Paris",
+                     'Place.update("{}", "reviews", "3")',
+                     'Place.update("{}", {{"amenities": "wifi"}})'):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd(line.format(pl.id))
+            self.assertEqual(output.getvalue().strip(),
+                             "** attribute can't be set **")
+        self.assertNotIn("city", pl.__dict__)
+        self.assertEqual(pl.reviews, [])
+
+
+class TestConsoleBatch(unittest.TestCase):
+    """
+    This class provides test cases for the begin and commit commands
+    of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        storage.commit()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_begin_and_commit(self):
+        HBNBCommand().onecmd("begin")
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("create User")
+            HBNBCommand().onecmd("create State")
+        self.assertFalse(os.path.exists("file.json"))
+        HBNBCommand().onecmd("commit")
+        self.assertTrue(os.path.exists("file.json"))
+
+    def test_quit_commits(self):
+        HBNBCommand().onecmd("begin")
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("create User")
+        self.assertTrue(HBNBCommand().onecmd("quit"))
+        self.assertTrue(os.path.exists("file.json"))
+
+
+class TestConsoleImport(unittest.TestCase):
+    """
+    This class provides test cases for the import command of
+    HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        for path in ("file.json", "rows.jsonl", "rows.csv"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_import(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue().strip().splitlines()
+
+    def test_import_jsonl(self):
+        with open("rows.jsonl", "w") as f:
+            f.write('{"id": "p1", "name": "Loft", "max_guest": "4"}\n')
+            f.write('\n')
+            f.write('{"name": "Cabin", "price_by_night": 120}\n')
+        output = self.run_import("import Place rows.jsonl")
+        self.assertTrue(output[-1].startswith("2 Place imported in "))
+        self.assertTrue(output[-1].endswith(" rows/s)"))
+        loft = storage.get(Place, "p1")
+        self.assertEqual(loft.name, "Loft")
+        self.assertEqual(loft.max_guest, 4)
+        self.assertEqual(storage.find(Place, name="Cabin")[0].price_by_night,
+                         120)
+        self.assertTrue(os.path.exists("file.json"))
+
+    def test_import_csv(self):
+        with open("rows.csv", "w") as f:
+            f.write("first_name,email,password\n")
+            f.write("Betty,betty@hbnb.io,\n")
+            f.write("Bob,bob@hbnb.io,secret\n")
+        output = self.run_import("import User rows.csv")
+        self.assertTrue(output[-1].startswith("2 User imported in "))
+        betty = storage.find(User, first_name="Betty")[0]
+        self.assertEqual(betty.email, "betty@hbnb.io")
+        self.assertEqual(betty.password, "")
+        self.assertEqual(storage.find(User, first_name="Bob")[0].password,
+                         "secret")
+
+    def test_import_csv_lists(self):
+        with open("rows.csv", "w") as f:
+            f.write("name,amenity_ids\n")
+            f.write('Loft,"[""a1"", ""a2""]"\n')
+            f.write("Cabin,['a1']\n")
+            f.write('Barn,"{""a1"": 1}"\n')
+        output = self.run_import("import Place rows.csv")
+        self.assertEqual(output[:2], ["** invalid row 3 **",
+                                      "** invalid row 4 **"])
+        self.assertEqual(storage.find(Place, name="Loft")[0].amenity_ids,
+                         ["a1", "a2"])
+        self.assertEqual(storage.count(Place), 1)
+
+    def test_import_saves_once(self):
+        with open("rows.jsonl", "w") as f:
+            for i in range(10):
+                f.write('{"name": "State ' + str(i) + '"}\n')
+        with patch.object(storage, "save") as save:
+            self.run_import("import State rows.jsonl")
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(storage.count(State), 10)
+
+    def test_import_invalid_rows(self):
+        with open("rows.jsonl", "w") as f:
+            f.write('{"max_guest": "many"}\n')
+            f.write('not json\n')
+            f.write('[1, 2]\n')
+            f.write('{"name": "Loft"}\n')
+        output = self.run_import("import Place rows.jsonl")
+        self.assertEqual(output[:3], ["** invalid row 1 **",
+                                      "** invalid row 2 **",
+                                      "** invalid row 3 **"])
+        self.assertTrue(output[3].startswith("1 Place imported in "))
+        self.assertEqual(storage.count(Place), 1)
+
+    def test_import_errors(self):
+        self.assertEqual(self.run_import("import"),
+                         ["** class name missing **"])
+        self.assertEqual(self.run_import("import Foo rows.jsonl"),
+                         ["** class doesn't exist **"])
+        self.assertEqual(self.run_import("import Place"),
+                         ["** file name missing **"])
+        self.assertEqual(self.run_import("import Place rows.jsonl"),
+                         ["** file doesn't exist **"])
+
+
+class TestConsoleExport(unittest.TestCase):
+    """
+    This class provides test cases for the export command of
+    HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.pl = Place()
+        self.pl.name = "Loft"
+        self.pl.max_guest = 4
+        self.us = User()
+
+    def tearDown(self):
+        for path in ("file.json", "rows.jsonl", "rows.csv", "Plce"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_export(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_export_all_to_stdout(self):
+        lines = self.run_export("export").splitlines()
+        self.assertEqual([json.loads(text) for text in lines],
+                         [self.pl.to_dict(), self.us.to_dict()])
+
+    def test_export_class_to_file(self):
+        output = self.run_export("export Place rows.jsonl")
+        self.assertEqual(output.strip(), "1 exported")
+        with open("rows.jsonl") as f:
+            self.assertEqual([json.loads(text) for text in f],
+                             [self.pl.to_dict()])
+
+    def test_export_csv(self):
+        self.run_export("export Place --format csv rows.csv")
+        with open("rows.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], self.pl.id)
+        self.assertEqual(rows[0]["name"], "Loft")
+        self.assertEqual(rows[0]["max_guest"], "4")
+        self.assertEqual(rows[0]["description"], "")
+
+    def test_export_then_import(self):
+        self.pl.amenity_ids = ["a1", "a2"]
+        self.run_export("export Place --format csv rows.csv")
+        FileStorage._FileStorage__objects = {}
+        with patch("sys.stdout", new=StringIO()):
+            HBNBCommand().onecmd("import Place rows.csv")
+        pl = storage.get(Place, self.pl.id)
+        self.assertEqual(pl.max_guest, 4)
+        self.assertEqual(pl.amenity_ids, ["a1", "a2"])
+        self.assertEqual(pl.created_at, self.pl.created_at)
+
+    def test_export_errors(self):
+        self.assertEqual(self.run_export("export --format xml").strip(),
+                         "** format doesn't exist **")
+        self.assertEqual(self.run_export("export --format csv").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_export("export Foo rows.csv").strip(),
+                         "** class doesn't exist **")
+        self.assertEqual(self.run_export("export Plce").strip(),
+                         "** class doesn't exist **")
+        self.assertFalse(os.path.exists("Plce"))
+        self.assertEqual(self.run_export("export ./Plce").strip(),
+                         "2 exported")
+
+
+class TestConsoleWhere(unittest.TestCase):
+    """
+    This class provides test cases for the where command of
+    HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for price in (120, 80, 60):
+            pl = Place()
+            pl.price_by_night = price
+            pl.max_guest = 4
+            self.places.append(pl)
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_where(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_where_command(self):
+        output = self.run_where("where Place price_by_night<100, "
+                                "max_guest>=4")
+        self.assertIn(str(self.places[1]), output)
+        self.assertIn(str(self.places[2]), output)
+        self.assertNotIn(self.places[0].id, output)
+
+    def test_where_dot_syntax(self):
+        line = ("Place.where(price_by_night<100, max_guest>=4)"
+                ".order_by(price_by_night).limit(1)")
+        self.assertEqual(self.run_where(line),
+                         str([str(self.places[2])]) + "\n")
+
+    def test_where_quoted(self):
+        self.places[0].description = "(quiet), sunny"
+        line = 'Place.where(description="(quiet), sunny", max_guest=4)'
+        self.assertEqual(self.run_where(line),
+                         str([str(self.places[0])]) + "\n")
+
+    def test_where_select(self):
+        line = "Place.where(price_by_night>100).select(id, price_by_night)"
+        self.assertEqual(self.run_where(line), str(
+            [{"id": self.places[0].id, "price_by_night": 120}]) + "\n")
+
+    def test_where_errors(self):
+        self.assertEqual(self.run_where("where").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_where("where Foo a<1").strip(),
+                         "** class doesn't exist **")
+        self.assertEqual(self.run_where("Place.where(a<)").strip(),
+                         "** invalid query **")
+        self.assertEqual(self.run_where("where Place price_by_night<100 "
+                                        "max_guest>=4").strip(),
+                         "** invalid query **")
+
+
+class TestConsoleNear(unittest.TestCase):
+    """
+    This class provides test cases for the near command of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.paris = Place()
+        self.paris.latitude = 48.8566
+        self.paris.longitude = 2.3522
+        self.london = Place()
+        self.london.latitude = 51.5074
+        self.london.longitude = -0.1278
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_near(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_near_dot_syntax(self):
+        self.assertEqual(self.run_near("Place.near(51.5, -0.12, 400)"),
+                         str([str(self.london), str(self.paris)]) + "\n")
+
+    def test_near_command(self):
+        self.assertEqual(self.run_near("near Place 48.85 2.35 10"),
+                         str([str(self.paris)]) + "\n")
+
+    def test_near_errors(self):
+        self.assertEqual(self.run_near("near").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_near("near Foo 1 2 3").strip(),
+                         "** class doesn't exist **")
+        for line in ("near Place 1 2", "near Place a 2 3",
+                     "near Place 91 2 3", "near Place 1 2 -3"):
+            self.assertEqual(self.run_near(line).strip(),
+                             "** invalid argument **")
+        self.assertEqual(self.run_near("User.near(1, 2, 3)").strip(),
+                         "** class has no coordinates **")
+
+
+class TestConsoleSearch(unittest.TestCase):
+    """
+    This class provides test cases for the search command of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.quiet = Place()
+        self.quiet.description = "Quiet flat with a garden"
+        self.loud = Place()
+        self.loud.description = "Flat above a bar"
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.text"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_search(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_search_command(self):
+        self.assertEqual(self.run_search("search Place garden flat"),
+                         str([self.quiet.id, self.loud.id]) + "\n")
+        self.assertEqual(self.run_search("search Place pool"), "[]\n")
+
+    def test_search_dot_syntax(self):
+        self.assertEqual(self.run_search('Place.search("bar")'),
+                         str([self.loud.id]) + "\n")
+
+    def test_search_errors(self):
+        self.assertEqual(self.run_search("search").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_search("search Foo bar").strip(),
+                         "** class doesn't exist **")
+        self.assertEqual(self.run_search("search Place").strip(),
+                         "** words missing **")
+        self.assertEqual(self.run_search("search User bar").strip(),
+                         "** class has no text **")
+
+
+class TestConsoleHaving(unittest.TestCase):
+    """
+    This class provides test cases for the having command of HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.wifi = Amenity()
+        self.wifi.name = "Wifi"
+        self.tub = Amenity()
+        self.tub.name = "Hot tub"
+        self.both = Place()
+        self.both.amenity_ids = [self.wifi.id, self.tub.id]
+        self.online = Place()
+        self.online.amenity_ids = [self.wifi.id]
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_having(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_having_command(self):
+        self.assertEqual(self.run_having("having Place " + self.tub.id),
+                         str([str(self.both)]) + "\n")
+        self.assertEqual(
+                self.run_having('having Place Wifi and not "Hot tub"'),
+                str([str(self.online)]) + "\n")
+
+    def test_having_dot_syntax(self):
+        self.assertEqual(self.run_having('Place.having("Wifi")'),
+                         str([str(self.both), str(self.online)]) + "\n")
+
+    def test_having_errors(self):
+        self.assertEqual(self.run_having("having").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_having("having Foo wifi").strip(),
+                         "** class doesn't exist **")
+        self.assertEqual(self.run_having("having User wifi").strip(),
+                         "** class has no list attribute **")
+        self.assertEqual(self.run_having("having Place").strip(),
+                         "** expression missing **")
+        self.assertEqual(self.run_having("having Place wifi and").strip(),
+                         "** invalid expression **")
+
+
+class TestConsoleAggregate(unittest.TestCase):
+    """
+    This class provides test cases for the aggregate command of
+    HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        for price in (100, 60):
+            pl = Place()
+            pl.city_id = "c1"
+            pl.price_by_night = price
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_aggregate(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_aggregate_command(self):
+        stats = {"count": 2, "min": 60, "max": 100, "avg": 80.0}
+        self.assertEqual(
+                self.run_aggregate("aggregate Place by=city_id "
+                                   "of=price_by_night"),
+                str({"c1": stats}) + "\n")
+        self.assertEqual(
+                self.run_aggregate("aggregate Place by=city_id for=c1"),
+                str({"count": 2}) + "\n")
+
+    def test_aggregate_dot_syntax(self):
+        self.assertEqual(
+                self.run_aggregate("Place.aggregate(by=city_id, "
+                                   "of=price_by_night, for=c2)"),
+                str({"count": 0, "min": None, "max": None,
+                     "avg": None}) + "\n")
+
+    def test_aggregate_numeric_group(self):
+        for pl in storage.all(Place).values():
+            pl.max_guest = 4
+        self.assertEqual(
+                self.run_aggregate("aggregate Place by=max_guest "
+                                   "of=price_by_night for=4"),
+                str({"count": 2, "min": 60, "max": 100, "avg": 80.0}) + "\n")
+        self.assertEqual(
+                self.run_aggregate('aggregate Place by=city_id for="c1"'),
+                str({"count": 2}) + "\n")
+
+    def test_aggregate_errors(self):
+        self.assertEqual(self.run_aggregate("aggregate").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_aggregate("aggregate Foo by=a").strip(),
+                         "** class doesn't exist **")
+        for line in ("aggregate Place", "aggregate Place city_id",
+                     "aggregate Place by=city_id to=1"):
+            self.assertEqual(self.run_aggregate(line).strip(),
+                             "** invalid argument **")
+
+
+class TestConsoleStats(unittest.TestCase):
+    """
+    This class provides test cases for the stats command of
+    HBNBCommand.
+    """
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        for city, price, guests in (("c1", 100, 4), ("c1", 60, 2),
+                                    ("c2", 80, 6)):
+            pl = Place()
+            pl.city_id = city
+            pl.price_by_night = price
+            pl.max_guest = guests
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_stats(self, line):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd(line)
+        return output.getvalue()
+
+    def test_stats_command(self):
+        self.assertEqual(
+                self.run_stats("stats Place price_by_night"),
+                str({"count": 3, "min": 60, "max": 100, "avg": 80.0}) + "\n")
+        self.assertEqual(
+                self.run_stats("stats Place price_by_night max_guest>=4"),
+                str({"count": 2, "min": 80, "max": 100, "avg": 90.0}) + "\n")
+
+    def test_stats_by(self):
+        self.assertEqual(
+                self.run_stats("stats Place max_guest by=city_id "
+                               "price_by_night<90"),
+                str({"c1": {"count": 1, "min": 2, "max": 2, "avg": 2.0},
+                     "c2": {"count": 1, "min": 6, "max": 6,
+                            "avg": 6.0}}) + "\n")
+
+    def test_stats_dot_syntax(self):
+        self.assertEqual(
+                self.run_stats("Place.stats(price_by_night, by=city_id, "
+                               "city_id=c2)"),
+                str({"c2": {"count": 1, "min": 80, "max": 80,
+                            "avg": 80.0}}) + "\n")
+
+    def test_stats_errors(self):
+        self.assertEqual(self.run_stats("stats").strip(),
+                         "** class name missing **")
+        self.assertEqual(self.run_stats("stats Foo price").strip(),
+                         "** class doesn't exist **")
+        self.assertEqual(self.run_stats("stats Place").strip(),
+                         "** attribute name missing **")
+        self.assertEqual(self.run_stats("stats Place price_by_night "
+                                        "max_guest").strip(),
+                         "** invalid query **")
+        for line in ("stats Place price", "stats Place nickname",
+                     "stats Place price_by_night by=town",
+                     "Place.stats(max_guest, by=price)"):
+            self.assertEqual(self.run_stats(line).strip(),
+                             "** attribute doesn't exist **")